@@ -7,6 +7,7 @@ import logging
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
+from typing import Iterator
 
 # related third party imports
 import pandas as pd
@@ -16,6 +17,9 @@ import pandas as pd
 
 logger = logging.getLogger("FileHandler")
 
+# number of rows per chunk of read_file_chunks
+DEFAULT_CHUNK_SIZE = 100_000
+
 
 class FileExtensions(Enum):
     """Enum class that has all valid file extension names and suffixes."""
@@ -74,6 +78,39 @@ def read_file(file_path: str) -> pd.DataFrame:
     return data_frame
 
 
+def read_file_chunks(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list[list[float | int]]]:
+    """Read a `.csv` or `.xlsx` file from the given path in chunks of rows, each converted like
+    `dataframe_tolist`, so that files too large to hold in memory as lists can be processed.
+
+    CSV files are parsed incrementally. Excel files can't be, so they are read as a whole by
+    `read_file` and only the conversion to lists is done in chunks.
+
+    :param file_path: Path to the file to be read.
+    :type file_path: str
+    :param chunk_size: Maximum number of rows per chunk, defaults to `DEFAULT_CHUNK_SIZE`.
+    :type chunk_size: int, optional
+    :raises FileNotFoundError: If no file exists at `file_path`.
+    :raises ValueError: If `chunk_size` isn't positive or a chunk can't be converted.
+    :raises TypeError: If the file is not either an Excel table or CSV file.
+    :return: Iterator over the chunks, each a list of lists containing the columns' values.
+    :rtype: Iterator[list[list[float | int]]]
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size needs to be positive.")
+    if not Path(file_path).is_file():
+        raise FileNotFoundError("Invalid Path; no file at destination.")
+
+    if Path(file_path).suffix.split(".")[-1].upper() == FileExtensions.CSV.value:
+        with pd.read_csv(file_path, chunksize=chunk_size) as reader:
+            for data_frame in reader:
+                yield dataframe_tolist(data_frame)
+        return
+
+    data_frame = read_file(file_path)
+    for start in range(0, len(data_frame), chunk_size):
+        yield dataframe_tolist(data_frame.iloc[start:start + chunk_size])
+
+
 def dataframe_tolist(data_frame: pd.DataFrame) -> list[list[float | int]]:
     """Convert a `pd.DataFrame` to a list of lists containing its values.
 
@@ -105,6 +142,31 @@ def dataframe_tolist(data_frame: pd.DataFrame) -> list[list[float | int]]:
     return data_list
 
 
+def column_scales(data: list[list[float | int]]) -> list[float]:
+    """Determine the magnitude of each data column as its largest absolute value. The scales can
+    be used to normalise columns of different units, e.g. residuals of several model components.
+
+    :param data: List of lists containing the data columns, as returned by `dataframe_tolist`.
+    :type data: list[list[float | int]]
+    :return: List with the scale of each column, 1.0 for columns that are all zero.
+    :rtype: list[float]
+    """
+    return [float(max((abs(x) for x in column), default=0)) or 1.0 for column in data]
+
+
+def average_replicates(data: list[list[float | int]]) -> list[list[float]]:
+    """Sort the rows of the data by their first column, e.g. the time, and average the rows that
+    share the same value in it, such as replicate measurements of several samples.
+
+    :param data: List of lists containing the data columns, as returned by `dataframe_tolist`.
+    :type data: list[list[float | int]]
+    :return: The data columns with one row per unique value of the first column, in ascending order.
+    :rtype: list[list[float]]
+    """
+    averaged = pd.DataFrame(list(zip(*data))).groupby(0, sort=True).mean()
+    return [averaged.index.astype(float).tolist(), *[averaged[name].astype(float).tolist() for name in averaged.columns]]
+
+
 def get_valid_filename() -> str:
     """Create a valid, hopefully non-duplicate, string to use as a file name.
 
@@ -0,0 +1,317 @@
+"""
+This module provides functions to derive initial guesses for the constants of a model from data.
+
+The guesses are based on the same assumptions about the model and data as the fitting routines
+in ModelFitter. Regression models that can be log-linearised, like ``a*exp(-k*t)`` or
+``a*x**b``, are estimated by a linear fit of the logarithm of the data. All other models are
+estimated by a coarse scan over the orders of magnitude of their nonlinear constants, evaluated
+in one vectorised pass, with the linear constants, e.g. slopes and intercepts, solved exactly for
+every point of the scan. ODE models are scanned by matching their right-hand side to the
+derivatives of the data.
+"""
+# standard library imports
+import logging
+from typing import Any, Callable
+
+# related third party imports
+import numpy as np
+import numpy.typing as npt
+
+# local imports
+from src import FileHandler
+from src.VPCModel import VPCModel
+
+
+logger = logging.getLogger("InitialGuess")
+
+# candidate values for every nonlinear constant in the scan
+SCAN_VALUES = tuple(sign * 10.0**exponent for sign in (-1, 1) for exponent in range(-3, 4))
+# factors around the best point of the scan for a second, finer scan
+REFINE_FACTORS = tuple(10.0**exponent for exponent in np.linspace(-0.5, 0.5, 7))
+# sums of squared residuals within this fraction of the data's sum of squares count as equal
+SCAN_TIE_TOLERANCE = 1e-9
+# upper limit of points of a full grid, constants of larger grids are scanned one at a time
+MAX_SCAN_POINTS = 4096
+# upper limit of data points the scan is evaluated at, larger data sets are thinned out evenly
+MAX_SCAN_ROWS = 200
+
+
+def initial_guess(model: VPCModel, data: list[list[int | float]]) -> list[float]:
+    """Derive initial values of the model's constants from the provided data.
+
+    :param model: The model whose constants are estimated.
+    :type model: VPCModel
+    :param data: The data the model is going to be fitted to, in the layout expected by\
+    ``ModelFitter.fit``.
+    :type data: list[list[int  |  float]]
+    :return: The estimated constants in the order of ``model.constants``, all ones if no\
+    estimate could be derived.
+    :rtype: list[float]
+    """
+    fallback = [1.0] * len(model.constants)
+    try:
+        with np.errstate(all="ignore"):
+            if model.is_ode():
+                guess = _ode_guess(model, data)
+            else:
+                guess = _regression_guess(model, data)
+    except (ValueError, TypeError, ArithmeticError, np.linalg.LinAlgError) as e:
+        logger.warning(f"Could not derive an initial guess from the data: {e}")
+        return fallback
+    if guess is None or not np.all(np.isfinite(guess)):
+        logger.debug("No initial guess derived from the data, starting from ones.")
+        return fallback
+    logger.debug(f"Initial guess derived from the data: {guess}")
+    return guess
+
+
+def _regression_guess(model: VPCModel, data: list[list[int | float]]) -> list[float] | None:
+    """Estimate the constants of a regression model.
+
+    :param model: The model whose constants are estimated.
+    :type model: VPCModel
+    :param data: The independent variables followed by one column per component.
+    :type data: list[list[int  |  float]]
+    :return: The estimated constants, or None if the data doesn't fit the model.
+    :rtype: list[float] | None
+    """
+    num_indep_vars = len(model.independent_var)
+    if len(data) != num_indep_vars + model.components:
+        return None
+    indep = [np.asarray(column, dtype=float) for column in data[:num_indep_vars]]
+    target = np.asarray(data[num_indep_vars:], dtype=float)
+
+    if model.log_linear_form is not None:
+        guess = _log_linear_guess(model, indep, target[0])
+        if guess is not None:
+            return guess
+
+    rows = _scan_rows(target.shape[1])
+    indep = [x[rows][np.newaxis, :] for x in indep]
+    return _scan(
+        lambda consts: model.model_function(*indep, *consts),
+        lambda consts: model.constants_jacobian(*indep, *consts),
+        target[:, rows],
+        model.constants,
+        model.linear_constants
+    )
+
+
+def _log_linear_guess(model: VPCModel, indep: list[npt.NDArray], target: npt.NDArray) -> list[float] | None:
+    """Estimate the constants of a log-linear model by a linear fit of the logarithm of the
+    positive data points, see ``VPCModel.log_linear_form``.
+
+    :param model: The model whose constants are estimated.
+    :type model: VPCModel
+    :param indep: Values of the independent variables.
+    :type indep: list[npt.NDArray]
+    :param target: The data of the model's single component.
+    :type target: npt.NDArray
+    :return: The estimated constants, or None if there are too few positive data points.
+    :rtype: list[float] | None
+    """
+    func, log_constants = model.log_linear_form
+    offset, *columns = (np.broadcast_to(np.asarray(g, dtype=float), target.shape) for g in func(*indep))
+    design = np.column_stack(columns)
+    rows = (target > 0) & np.isfinite(offset) & np.all(np.isfinite(design), axis=1)
+    if np.count_nonzero(rows) < len(model.constants):
+        return None
+    thetas = np.linalg.lstsq(design[rows], np.log(target[rows]) - offset[rows], rcond=None)[0]
+    return [
+        float(np.exp(theta)) if const in log_constants else float(theta)
+        for const, theta in zip(model.constants, thetas)
+    ]
+
+
+def _ode_guess(model: VPCModel, data: list[list[int | float]]) -> list[float] | None:
+    """Estimate the constants of an ODE system by matching its right-hand side to the
+    derivatives of the data, which are estimated by finite differences.
+
+    :param model: The model whose constants are estimated.
+    :type model: VPCModel
+    :param data: The time followed by one column per state.
+    :type data: list[list[int  |  float]]
+    :return: The estimated constants, or None if the model is no explicit ODE system or the\
+    data doesn't fit it.
+    :rtype: list[float] | None
+    """
+    if not model.has_ode_system() or len(data) != len(model.ode_state_vars) + 1 or len(data[0]) < 3:
+        return None
+    # finite differences need distinct, increasing time points
+    data = FileHandler.average_replicates(data)
+    if len(data[0]) < 3:
+        return None
+    t_data = np.asarray(data[0], dtype=float)
+    states = [np.asarray(column, dtype=float) for column in data[1:]]
+    derivatives = [np.gradient(y, t_data, edge_order=2) for y in states]
+    # second-order states additionally need their velocity as state and its derivative as target
+    velocities = [dy for dy, order in zip(derivatives, model.ode_orders) if order == 2]
+    accelerations = [np.gradient(v, t_data, edge_order=2) for v in velocities]
+
+    rows = _scan_rows(len(t_data))
+    system_states = [x[rows][np.newaxis, :] for x in (*states, *velocities)]
+    t_scan = t_data[rows][np.newaxis, :]
+    return _scan(
+        lambda consts: model.ode_function(t_scan, system_states, *consts),
+        lambda consts: model.ode_constants_jacobian(t_scan, system_states, *consts),
+        np.array([*derivatives, *accelerations])[:, rows],
+        model.constants,
+        model.linear_constants
+    )
+
+
+def _scan(
+    predict: Callable[[list[npt.NDArray]], Any],
+    jacobian: Callable[[list[npt.NDArray]], Any],
+    target: npt.NDArray,
+    constants: list[str],
+    linear_constants: list[str]
+) -> list[float]:
+    """Scan the orders of magnitude of the nonlinear constants and pick the point with the
+    smallest sum of squared residuals, then refine it by a second scan over ``REFINE_FACTORS``
+    around it. The linear constants are the batched linear least-squares solution for every
+    point of the scans.
+
+    If the full grid of a scan exceeds ``MAX_SCAN_POINTS``, the constants are scanned one at a
+    time with the others fixed at the best point so far, which suits models with many constants
+    that each only affect a few components.
+
+    :param predict: Function of a list with one ``(G, 1)`` array per constant returning the model\
+    components, each broadcastable to ``(G, N)``.
+    :type predict: Callable[[list[npt.NDArray]], Any]
+    :param jacobian: Function of the same arguments returning the derivatives of the components\
+    with respect to the constants as nested list, see ``VPCModel.constants_jacobian``.
+    :type jacobian: Callable[[list[npt.NDArray]], Any]
+    :param target: The data with one row per component and one column per data point.
+    :type target: npt.NDArray
+    :param constants: The model's constants.
+    :type constants: list[str]
+    :param linear_constants: The constants the model is linear in.
+    :type linear_constants: list[str]
+    :return: The constants of the best point in the order of ``constants``.
+    :rtype: list[float]
+    """
+    linear = [constants.index(c) for c in linear_constants]
+    nonlinear = [i for i in range(len(constants)) if i not in linear]
+    point = np.ones(len(nonlinear))
+    best = [1.0] * len(constants)
+    for values, relative in ((SCAN_VALUES, False), (REFINE_FACTORS, True)):
+        candidates = np.array(values)
+        if len(candidates)**len(nonlinear) <= MAX_SCAN_POINTS:
+            grid = _grid(candidates, len(nonlinear))
+            grids = [point * grid if relative else grid]
+        else:
+            grids = [None] * len(nonlinear)
+        for k, grid in enumerate(grids):
+            if grid is None:
+                grid = np.tile(point, (len(candidates), 1))
+                grid[:, k] = point[k] * candidates if relative else candidates
+            best = _scan_grid(predict, jacobian, target, len(constants), linear, nonlinear, grid)
+            point = np.array([best[i] for i in nonlinear])
+        if not nonlinear:
+            break
+    return best
+
+
+def _scan_grid(
+    predict: Callable[[list[npt.NDArray]], Any],
+    jacobian: Callable[[list[npt.NDArray]], Any],
+    target: npt.NDArray,
+    num_consts: int,
+    linear: list[int],
+    nonlinear: list[int],
+    grid: npt.NDArray
+) -> list[float]:
+    """Evaluate the model at every point of a grid of the nonlinear constants in one vectorised
+    pass and return the point with the smallest sum of squared residuals. Ties within
+    ``SCAN_TIE_TOLERANCE`` are resolved in favour of the smallest nonlinear constants.
+
+    :param predict: See ``_scan``.
+    :type predict: Callable[[list[npt.NDArray]], Any]
+    :param jacobian: See ``_scan``.
+    :type jacobian: Callable[[list[npt.NDArray]], Any]
+    :param target: See ``_scan``.
+    :type target: npt.NDArray
+    :param num_consts: The number of constants.
+    :type num_consts: int
+    :param linear: Indices of the linear constants.
+    :type linear: list[int]
+    :param nonlinear: Indices of the nonlinear constants.
+    :type nonlinear: list[int]
+    :param grid: Matrix with one row per point and one column per nonlinear constant.
+    :type grid: npt.NDArray
+    :return: All constants of the best point.
+    :rtype: list[float]
+    """
+    num_points = len(grid)
+    shape = (num_points, *target.shape)
+
+    consts = np.ones((num_consts, num_points, 1))
+    consts[nonlinear] = grid.T[:, :, np.newaxis]
+    if linear:
+        consts[linear] = 0
+        offset = _stack_components(predict(list(consts)), shape)
+        entries = jacobian(list(consts))
+        design = np.stack([
+            np.stack([np.broadcast_to(np.asarray(row[i], dtype=float), shape[::2]) for i in linear], axis=-1)
+            for row in entries
+        ], axis=1).reshape(num_points, -1, len(linear))
+        rhs = (target.ravel() - offset)[..., np.newaxis]
+        valid = np.all(np.isfinite(design), axis=(1, 2)) & np.all(np.isfinite(rhs), axis=(1, 2))
+        solution = np.zeros((num_points, len(linear)))
+        solution[valid] = (np.linalg.pinv(design[valid]) @ rhs[valid])[..., 0]
+        consts[linear] = solution.T[:, :, np.newaxis]
+
+    residuals = _stack_components(predict(list(consts)), shape) - target.ravel()
+    ssr = np.sum(residuals**2, axis=1)
+    ssr[~np.isfinite(ssr)] = np.inf
+    # of equally good points, like aliases of a frequency above the Nyquist frequency of the data,
+    # the one with the smallest nonlinear constants is taken
+    near_best = ssr <= np.min(ssr) + SCAN_TIE_TOLERANCE * np.sum(target**2)
+    best = int(np.argmin(np.where(near_best, np.sum(np.abs(grid), axis=1), np.inf)))
+    return [float(c[best, 0]) for c in consts]
+
+
+def _grid(values: npt.NDArray, num_consts: int) -> npt.NDArray:
+    """Build the points of the full grid over ``values`` for the given number of constants.
+
+    :param values: The candidate values of every constant.
+    :type values: npt.NDArray
+    :param num_consts: The number of constants.
+    :type num_consts: int
+    :return: Matrix with one row per point and one column per constant.
+    :rtype: npt.NDArray
+    """
+    if num_consts == 0:
+        return np.ones((1, 0))
+    return np.array(np.meshgrid(*[values] * num_consts, indexing="ij")).reshape(num_consts, -1).T
+
+
+def _scan_rows(num_rows: int) -> npt.NDArray:
+    """Select at most ``MAX_SCAN_ROWS`` evenly spaced data points for the scan.
+
+    :param num_rows: The number of data points.
+    :type num_rows: int
+    :return: Indices of the selected data points.
+    :rtype: npt.NDArray
+    """
+    return np.unique(np.linspace(0, num_rows - 1, min(num_rows, MAX_SCAN_ROWS)).astype(int))
+
+
+def _stack_components(components: Any, shape: tuple[int, int, int]) -> npt.NDArray:
+    """Stack the components of a model evaluated for every point of the scan.
+
+    :param components: A single component or a sequence of components, each broadcastable to\
+    ``shape`` without its component axis.
+    :type components: Any
+    :param shape: The shape ``(G, C, N)`` of the stacked components.
+    :type shape: tuple[int, int, int]
+    :return: Matrix with one row per point of the scan and the components raveled\
+    component-major.
+    :rtype: npt.NDArray
+    """
+    if not isinstance(components, (list, tuple)):
+        components = [components]
+    return np.stack(
+        [np.broadcast_to(np.asarray(c, dtype=float), shape[::2]) for c in components], axis=1
+    ).reshape(shape[0], -1)
@@ -6,23 +6,235 @@ with provided data consisting of a list of lists where each sub-list is a column
 """
 # standard library imports
 import logging
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Iterable, Sequence
 
 # related third party imports
 import numpy as np
 import numpy.typing as npt
-from scipy.integrate import solve_ivp
+from scipy import sparse
+from scipy.integrate import RK45, solve_ivp
 from scipy.optimize import curve_fit
+from scipy.optimize import least_squares
 from scipy.optimize import minimize
+from scipy.stats import qmc
 
 # local imports
-from src.VPCModel import VPCModel
+from src import FileHandler, InitialGuess
+from src.VPCModel import ModelSpec, VPCModel
 
 
 logger = logging.getLogger("ModelFitter")
 
+IMPLICIT_ODE_SOLVERS = ("Radau", "BDF", "LSODA")
+# accepted steps of the explicit probe integration that estimates the stiffness of an ODE and
+# the fraction of the time span, at least up to the second time point, it may cover
+STIFFNESS_PROBE_STEPS = 50
+STIFFNESS_PROBE_WINDOW = 0.1
+# real-axis stability limit of h * |lambda| of the explicit RK45 (Dormand-Prince) method
+RK45_STABILITY_LIMIT = 3.3
+# fraction of the stability limit above which the probe's steps count as limited by stability
+STIFFNESS_STABILITY_FRACTION = 0.8
+# default relative and absolute tolerances of scipy.integrate.solve_ivp
+DEFAULT_ODE_TOLERANCES = (1e-3, 1e-6)
+# a continuation schedule of (rtol, atol) stages for FitOptions.ode_tolerance_schedule
+TOLERANCE_SCHEDULE = ((1e-2, 1e-5), (1e-4, 1e-7), (1e-6, 1e-9))
+# leading time points a quadratic is fitted to for the initial first derivative of a second-order state
+INITIAL_DERIVATIVE_POINTS = 7
+# initial weight of the continuity defects relative to the data residuals in multiple shooting,
+# the factor it grows by on every refit while the defects exceed their tolerance, and its maximum
+SHOOTING_CONTINUITY_WEIGHT = 10.0
+SHOOTING_WEIGHT_GROWTH = 10.0
+SHOOTING_MAX_WEIGHT = 1e8
+# largest continuity defect of a multiple-shooting fit relative to the magnitude of the state
+SHOOTING_DEFECT_TOLERANCE = 1e-6
+# vector models with at least this many components, whose constants Jacobian has at most this
+# fraction of nonzero blocks, are fitted with a sparse Jacobian
+SPARSE_JACOBIAN_MIN_COMPONENTS = 4
+SPARSE_JACOBIAN_DENSITY = 0.5
+# starting points of multi-start fits are sampled within this many orders of magnitude around
+# the initial guess of every constant
+MULTI_START_DECADES = 1.0
+# full-data Gauss-Newton passes over all chunks that polish the estimate of fit_streaming
+STREAMING_POLISH_PASSES = 5
+# relative step size below which the polishing passes of fit_streaming have converged
+STREAMING_TOLERANCE = 1e-8
+# constants are rounded to this many significant digits to form ODE solution cache keys, which is
+# well below the relative step of finite-difference probes (~1e-8) but merges floating point noise
+CACHE_SIGNIFICANT_DIGITS = 12
 
-def fit(model: VPCModel, data: list[list[int | float]]) -> None:
+
+@dataclass
+class FitOptions:
+    """Container class for settings that control how a model is fitted to data.
+
+    :param ode_optimizer: Optimizer used for ODE models. ``"least_squares"`` hands the residual\
+    vector to a trust-region least-squares solver, ``"minimize"`` minimizes the scalar sum of\
+    squares. Defaults to "least_squares".
+    :type ode_optimizer: str, optional
+    :param ode_sensitivities: Whether to integrate the forward sensitivity equations of an ODE\
+    system alongside its states to obtain exact gradients from a single integration, instead of\
+    approximating them by finite differences. Defaults to False.
+    :type ode_sensitivities: bool, optional
+    :param ode_solver: Integration method passed to ``scipy.integrate.solve_ivp``. For the\
+    implicit methods in ``IMPLICIT_ODE_SOLVERS`` the symbolic state Jacobian of the model is\
+    supplied. ``"auto"`` runs a short explicit probe integration and selects an implicit method\
+    if its step sizes turn out to be limited by stability, see ``_select_ode_solver``.\
+    Defaults to "auto".
+    :type ode_solver: str, optional
+    :param ode_cache_size: Maximum number of ODE solutions kept during a single fit whose Jacobian\
+    comes from ``ode_sensitivities`` or from the probes on a process pool, see ``workers``, so\
+    the Jacobian at the point the residuals were just evaluated at doesn't trigger another\
+    integration. Other fits never revisit a point and don't cache. Defaults to 1, i.e. the last\
+    solution.
+    :type ode_cache_size: int, optional
+    :param workers: Number of processes that evaluate the finite-difference probes of ODE fits\
+    concurrently. Not used with ``ode_sensitivities``. Defaults to 1, i.e. no process pool.
+    :type workers: int, optional
+    :param ode_tolerance_schedule: Sequence of ``(rtol, atol)`` stages for the integration of ODE\
+    models, e.g. ``TOLERANCE_SCHEDULE``. Each stage is optimized starting from the result of the\
+    previous one, with all but the last stage only converging as far as their ``rtol``, so early\
+    iterations don't pay for accuracy that is wasted far from the optimum. Defaults to None, i.e. a\
+    single stage with ``DEFAULT_ODE_TOLERANCES``.
+    :type ode_tolerance_schedule: Sequence[tuple[float, float]] | None, optional
+    :param ode_shooting_segments: Number of segments for multiple shooting of ODE models. Each\
+    segment starts from its own fitted initial state and is integrated independently, on the\
+    process pool if ``workers`` > 1, with continuity between segments enforced by a penalty whose\
+    weight grows until the defects are within ``SHOOTING_DEFECT_TOLERANCE``. Requires ``ode_optimizer="least_squares"`` and doesn't use sensitivities.\
+    Defaults to 1, i.e. single shooting.
+    :type ode_shooting_segments: int, optional
+    :param analytic_jacobian: Whether regression fits use the symbolic Jacobian with respect to\
+    the constants instead of finite differences, defaults to True.
+    :type analytic_jacobian: bool, optional
+    :param linear_solve: Whether regression models that are linear in their constants are fitted\
+    by a single linear least-squares solve instead of ``curve_fit``, defaults to True.
+    :type linear_solve: bool, optional
+    :param variable_projection: Whether regression models that are linear in some of their\
+    constants are fitted by variable projection, i.e. iterating only over the nonlinear constants\
+    while solving for the linear ones exactly in every step. Models fitted with a sparse Jacobian,\
+    see ``sparse_jacobian``, take precedence. Defaults to True.
+    :type variable_projection: bool, optional
+    :param ode_closed_form: Whether scalar first-order ODEs with a symbolic solution, see\
+    ``VPCModel.closed_form``, are fitted as regression models of their solution instead of being\
+    integrated numerically. Solving the ODE symbolically costs a fraction of a second once per\
+    equation, which pays off for large data sets. Defaults to False.
+    :type ode_closed_form: bool, optional
+    :param initial_guess: Starting values of the constants. ``"data"`` derives them from the data,\
+    see ``InitialGuess.initial_guess``, ``"ones"`` starts all constants at one. A sequence gives\
+    the values explicitly in the order of ``VPCModel.constants``. Defaults to "data".
+    :type initial_guess: str | Sequence[float], optional
+    :param scale_constants: Whether the optimizers work on the constants divided by the magnitude\
+    of their initial guess, so that constants of very different orders of magnitude are equally\
+    well conditioned. Results are transformed back by ``VPCModel.set_fit_information``.\
+    Defaults to True.
+    :type scale_constants: bool, optional
+    :param scale_data: Whether the residuals of every data column are divided by the column's\
+    magnitude, see ``FileHandler.column_scales``, so that components or states of different units\
+    contribute equally to the fit. Defaults to False.
+    :type scale_data: bool, optional
+    :param sparse_jacobian: Whether vector models, whose constants only affect a few of their\
+    components, are fitted with a sparse Jacobian, see ``SPARSE_JACOBIAN_MIN_COMPONENTS`` and\
+    ``SPARSE_JACOBIAN_DENSITY``. Defaults to True.
+    :type sparse_jacobian: bool, optional
+    :param multi_start: Number of starting points of the fit. With more than one, the first start\
+    is the initial guess and the others are drawn by Latin hypercube sampling within\
+    ``MULTI_START_DECADES`` orders of magnitude around it. Every start is fitted locally, on a\
+    process pool if ``workers`` > 1, and the result with the lowest cost is kept. Defaults to 1.
+    :type multi_start: int, optional
+    """
+    ode_optimizer: str = "least_squares"
+    ode_sensitivities: bool = False
+    ode_solver: str = "auto"
+    ode_cache_size: int = 1
+    workers: int = 1
+    ode_tolerance_schedule: Sequence[tuple[float, float]] | None = None
+    ode_shooting_segments: int = 1
+    analytic_jacobian: bool = True
+    linear_solve: bool = True
+    variable_projection: bool = True
+    ode_closed_form: bool = False
+    initial_guess: str | Sequence[float] = "data"
+    scale_constants: bool = True
+    scale_data: bool = False
+    sparse_jacobian: bool = True
+    multi_start: int = 1
+
+
+class _SolutionCache:
+    """Bounded least-recently-used cache for ODE solutions within a single fit.
+
+    Keys are the constants rounded to ``CACHE_SIGNIFICANT_DIGITS`` significant digits.
+
+    :param maxsize: Maximum number of cached entries, at least 1.
+    :type maxsize: int
+    """
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize: int = max(1, maxsize)
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[tuple[float,...], Any] = OrderedDict()
+
+    @staticmethod
+    def key(consts: tuple[float,...]) -> tuple[float,...]:
+        """Create the cache key for a set of constants.
+
+        :param consts: The constants of the function.
+        :type consts: tuple[float,...]
+        :return: The rounded constants.
+        :rtype: tuple[float,...]
+        """
+        return tuple(float(f"{c:.{CACHE_SIGNIFICANT_DIGITS - 1}e}") for c in consts)
+
+    def get(self, key: tuple[float,...]) -> Any:
+        """Return the cached entry for ``key`` and count the lookup as hit or miss.
+
+        :param key: Key created by ``key()``.
+        :type key: tuple[float,...]
+        :return: The cached entry, None if there is none.
+        :rtype: Any
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple[float,...], entry: Any) -> None:
+        """Store an entry, evicting the least recently used one if the cache is full.
+
+        :param key: Key created by ``key()``.
+        :type key: tuple[float,...]
+        :param entry: The entry to store.
+        :type entry: Any
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Discard all entries, keeping the statistics."""
+        self._entries.clear()
+
+    def info(self) -> dict[str, int]:
+        """Return statistics about the cache usage.
+
+        :return: Dictionary with the number of hits, misses, entries and the maximum size.
+        :rtype: dict[str, int]
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+def fit(model: VPCModel, data: list[list[int | float]], options: FitOptions | None = None) -> None:
     """Main entry function for the fitting process. Delegates ``model`` and ``data`` to the correct
     fitting routine based on whether it's an ordinary differential equation or not.
 
@@ -30,93 +242,589 @@ def fit(model: VPCModel, data: list[list[int | float]]) -> None:
     :type model: VPCModel
     :param data: The data the model is supposed to be fitted to.
     :type data: list[list[int  |  float]]
+    :param options: Settings for the fitting routines, defaults to None, i.e. ``FitOptions()``.
+    :type options: FitOptions | None, optional
+    """
+    if options is None:
+        options = FitOptions()
+    if options.multi_start != 1:
+        _fit_multi_start(model, data, options)
+    elif model.is_ode():
+        if options.ode_closed_form and _fit_ode_closed_form(model, data, options):
+            return
+        _fit_ode(model, data, options)
+    else:
+        _fit_reg(model, data, options)
+
+
+def _fit_multi_start(model: VPCModel, data: list[list[int | float]], options: FitOptions) -> None:
+    """Fit the model from ``options.multi_start`` starting points and keep the result with the
+    lowest cost. The summary of all runs is added to the ``fit_info`` of the model as\
+    ``"multi_start"``.
+
+    Each run is a single-start ``fit`` from an explicit initial guess. With ``workers`` > 1 the
+    runs are distributed over a process pool, with every run integrating ODEs in its own process.
+
+    This function sets the internal variables of the model to reflect the best fit.
+
+    :param model: The model that is to be fit.
+    :type model: VPCModel
+    :param data: The provided data to which the model is fitted.
+    :type data: list[list[int  |  float]]
+    :param options: Settings for the fit.
+    :type options: FitOptions
+    :raises ValueError: If ``options.multi_start`` isn't positive.
+    :raises RuntimeError: If the fits from all starting points fail.
+    """
+    if options.multi_start < 1:
+        raise ValueError("The number of starting points needs to be positive.")
+    if not model.is_ode() and options.linear_solve and model.is_linear_in_constants():
+        # the linear least-squares solution doesn't depend on a starting point
+        fit(model, data, replace(options, multi_start=1))
+        return
+
+    starts = _multi_start_points(_initial_guess(model, data, options), options.multi_start)
+    start_options = [
+        replace(options, multi_start=1, workers=1, initial_guess=start.tolist()) for start in starts
+    ]
+    if options.workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=options.workers,
+            initializer=_init_multi_start_worker,
+            initargs=(model.spec, data)
+        ) as pool:
+            runs = list(pool.map(_multi_start_worker, start_options))
+    else:
+        runs = [_fit_start(model, data, run_options) for run_options in start_options]
+
+    costs = [run.get("cost", np.nan) for run in runs]
+    if np.all(np.isnan(costs)):
+        model.set_fit_information(error=True)
+        raise RuntimeError("The fits from all starting points failed.")
+    best = int(np.nanargmin(costs))
+    summary = {
+        "starts": len(runs),
+        "workers": options.workers,
+        "best": best,
+        "failed": sum(1 for run in runs if "error" in run),
+        "runs": [{key: value for key, value in run.items() if key not in ("covariance", "fit_info")} for run in runs],
+    }
+    model.set_fit_information(
+        runs[best]["fitted_consts"],
+        covariance=runs[best]["covariance"],
+        fit_info={**runs[best]["fit_info"], "multi_start": summary}
+    )
+
+
+def _multi_start_points(initial_guess: Sequence[float], num_starts: int) -> npt.NDArray:
+    """Draw the starting points of a multi-start fit by Latin hypercube sampling of the orders of
+    magnitude of the constants. Constants keep the sign of their initial guess and constants
+    guessed as zero are sampled around one.
+
+    :param initial_guess: The initial guess of the constants, also used as the first start.
+    :type initial_guess: Sequence[float]
+    :param num_starts: Number of starting points.
+    :type num_starts: int
+    :return: Matrix with one row per starting point and one column per constant.
+    :rtype: npt.NDArray
+    """
+    center = np.asarray(initial_guess, dtype=float)
+    magnitudes = np.where(center != 0, np.abs(center), 1.0)
+    signs = np.where(center < 0, -1.0, 1.0)
+    samples = qmc.LatinHypercube(d=center.size, seed=0).random(num_starts - 1)
+    exponents = MULTI_START_DECADES * (2 * samples - 1)
+    return np.vstack([center, signs * magnitudes * 10.0**exponents])
+
+
+def _fit_start(model: VPCModel, data: list[list[int | float]], options: FitOptions) -> dict[str, Any]:
+    """Run a single start of a multi-start fit.
+
+    :param model: The model that is to be fit.
+    :type model: VPCModel
+    :param data: The provided data to which the model is fitted.
+    :type data: list[list[int  |  float]]
+    :param options: Settings of the single-start fit, with the starting point as initial guess.
+    :type options: FitOptions
+    :return: Dictionary with the starting point and either the fitted constants, their cost,\
+    covariance and ``fit_info``, or the error of a failed fit.
+    :rtype: dict[str, Any]
+    """
+    run: dict[str, Any] = {"initial_guess": options.initial_guess}
+    try:
+        fit(model, data, options)
+    except (RuntimeError, ValueError) as e:
+        logger.debug(f"Fit from starting point {options.initial_guess} failed: {e}")
+        run["error"] = str(e)
+        return run
+    cost = float(model.fit_info["cost"])
+    if not np.isfinite(cost):
+        run["error"] = "The cost of the fit is not finite."
+        return run
+    run.update({
+        "fitted_consts": {name: float(value) for name, value in model.fitted_consts.items()},
+        "cost": cost,
+        "covariance": model.covariance,
+        "fit_info": model.fit_info,
+    })
+    return run
+
+
+# model and data of the worker process, set up once by _init_multi_start_worker
+_worker_model: VPCModel | None = None
+_worker_data: list[list[int | float]] | None = None
+
+
+def _init_multi_start_worker(spec: ModelSpec, data: list[list[int | float]]) -> None:
+    """Initializer of the worker processes of multi-start fits, building the model from its
+    specification once per process, see ``_init_probe_worker``.
+
+    :param spec: The specification of the fitted model.
+    :type spec: ModelSpec
+    :param data: The provided data to which the model is fitted.
+    :type data: list[list[int  |  float]]
+    """
+    global _worker_model, _worker_data
+    _worker_model = spec.to_model()
+    _worker_data = data
+
+
+def _multi_start_worker(options: FitOptions) -> dict[str, Any]:
+    """Fit the worker's model from a single starting point, see ``_fit_start``.
+
+    :param options: Settings of the single-start fit, with the starting point as initial guess.
+    :type options: FitOptions
+    :return: The summary of the run.
+    :rtype: dict[str, Any]
+    """
+    return _fit_start(_worker_model, _worker_data, options)
+
+
+def fit_streaming(
+    model: VPCModel,
+    chunks: Callable[[], Iterable[list[list[int | float]]]],
+    options: FitOptions | None = None,
+    polish_passes: int = STREAMING_POLISH_PASSES
+) -> None:
+    """Fit a regression model to data that is only available in chunks of rows, e.g. from
+    ``FileHandler.read_file_chunks``, so that only a single chunk is held in memory at a time.
+
+    The first chunk is fitted by ``_fit_reg`` with the given ``options``. Every further chunk then
+    updates the estimate by a recursive Gauss-Newton step, which weighs the chunk against the
+    information gathered from all previous chunks. Finally, up to ``polish_passes`` Gauss-Newton
+    passes over all chunks, each accumulating the normal equations chunk by chunk, converge to the
+    full-data least-squares solution. The streaming steps use the symbolic Jacobian of the model.
+    Without polish passes, the cost and covariance are estimated from the information and the
+    chunk costs gathered during the streaming pass.
+
+    :param model: The model that is to be fitted.
+    :type model: VPCModel
+    :param chunks: Function returning a new iterable over the chunks of the data on every call,\
+    each chunk laid out like the data of ``fit``.
+    :type chunks: Callable[[], Iterable[list[list[int | float]]]]
+    :param options: Settings for the fit of the first chunk, defaults to None, i.e.\
+    ``FitOptions()``. With ``scale_data`` the column scales of the first chunk are used throughout.
+    :type options: FitOptions | None, optional
+    :param polish_passes: Maximum number of full-data passes, defaults to\
+    ``STREAMING_POLISH_PASSES``. 0 keeps the estimate of the single streaming pass.
+    :type polish_passes: int, optional
+    :raises ValueError: If the model is an ODE or there is no data.
     """
     if model.is_ode():
-        _fit_ode(model, data)
+        raise ValueError("Streaming fits are only supported for regression models.")
+    options = options or FitOptions()
+    chunk_iter = iter(chunks())
+    first_chunk = next(chunk_iter, None)
+    if first_chunk is None:
+        raise ValueError("No data to fit.")
+
+    _fit_reg(model, first_chunk, options)
+    first_fit_info = model.fit_info
+    num_indep_vars = len(model.independent_var)
+    column_sigma = np.ones(len(first_chunk) - num_indep_vars)
+    if options.scale_data:
+        column_sigma = np.array(FileHandler.column_scales(first_chunk[num_indep_vars:]))
+    consts = np.array([model.fitted_consts[name] for name in model.constants])
+
+    # recursive Gauss-Newton, the first chunk only contributes its information at the estimate
+    information, _, streaming_cost, num_rows = _streaming_normal_equations(model, first_chunk, consts, column_sigma)
+    num_chunks = 1
+    for chunk in chunk_iter:
+        chunk_information, gradient, chunk_cost, chunk_rows = _streaming_normal_equations(
+            model, chunk, consts, column_sigma
+        )
+        information += chunk_information
+        consts = consts + _gauss_newton_step(information, gradient)
+        streaming_cost += chunk_cost
+        num_rows += chunk_rows
+        num_chunks += 1
+
+    streaming_consts = consts.copy()
+    streaming_information = information
+    best_consts = consts
+    cost = np.inf
+    step = np.zeros_like(consts)
+    passes = 0
+    for passes in range(1, polish_passes + 1):
+        information = np.zeros((consts.size, consts.size))
+        gradient = np.zeros(consts.size)
+        pass_cost = 0.0
+        for chunk in chunks():
+            chunk_information, chunk_gradient, chunk_cost, _ = _streaming_normal_equations(
+                model, chunk, consts, column_sigma
+            )
+            information += chunk_information
+            gradient += chunk_gradient
+            pass_cost += chunk_cost
+        if pass_cost > cost:
+            # the last step overshot, retry half of it
+            step /= 2
+            consts = best_consts + step
+            continue
+        best_consts, best_information, cost = consts, information, pass_cost
+        step = _gauss_newton_step(information, gradient)
+        if np.linalg.norm(step) <= STREAMING_TOLERANCE * (np.linalg.norm(consts) + STREAMING_TOLERANCE):
+            break
+        consts = best_consts + step
+
+    consts = best_consts
+    if not np.isfinite(cost):
+        # no polish pass, the chunks' costs at the estimates they were linearized at approximate the cost
+        best_information, cost = streaming_information, streaming_cost
+    if np.isfinite(cost):
+        covariance = _covariance_from_normal_matrix(best_information, 2 * cost, num_rows * column_sigma.size)
     else:
-        _fit_reg(model, data)
+        covariance = np.full((consts.size, consts.size), np.inf)
+    fit_info = {
+        "optimizer": "streaming",
+        "first_chunk": first_fit_info,
+        "chunks": num_chunks,
+        "rows": num_rows,
+        "streaming_consts": streaming_consts.tolist(),
+        "polish_passes": passes,
+        "cost": cost,
+    }
+    model.set_fit_information(dict(zip(model.constants, consts)), covariance=covariance, fit_info=fit_info)
+
+
+def _streaming_normal_equations(
+    model: VPCModel,
+    chunk: list[list[int | float]],
+    consts: npt.NDArray,
+    column_sigma: npt.NDArray
+) -> tuple[npt.NDArray, npt.NDArray, float, int]:
+    """Evaluate the Gauss-Newton normal equations of a regression model on a single chunk.
+
+    :param model: The model that is to be fitted.
+    :type model: VPCModel
+    :param chunk: The data of the chunk, laid out like the data of ``fit``.
+    :type chunk: list[list[int | float]]
+    :param consts: Values of the constants at which the model is linearized.
+    :type consts: npt.NDArray
+    :param column_sigma: The scale the residuals of every data column are divided by.
+    :type column_sigma: npt.NDArray
+    :return: ``J^T J`` and ``-J^T r`` of the residuals ``r`` and their Jacobian ``J``, the cost\
+    ``0.5 * r^T r`` and the number of rows of the chunk.
+    :rtype: tuple[npt.NDArray, npt.NDArray, float, int]
+    """
+    formatted_function, running_var_vals, model_res_vals = _regression_arrays(model, chunk)
+    num_points = len(running_var_vals[0])
+    sigma = np.repeat(column_sigma, num_points)
+    prediction = np.broadcast_to(formatted_function(running_var_vals, *consts), model_res_vals.shape)
+    residuals = (prediction - model_res_vals) / sigma
+    jac = _stack_constants_jacobian(model.constants_jacobian(*running_var_vals, *consts), num_points)
+    jac = jac / sigma[:, np.newaxis]
+    return jac.T @ jac, -jac.T @ residuals, 0.5 * float(residuals @ residuals), num_points
+
+
+def _gauss_newton_step(information: npt.NDArray, gradient: npt.NDArray) -> npt.NDArray:
+    """Solve the Gauss-Newton normal equations for the step of the constants. The equations are
+    scaled by the diagonal of ``information`` first, so constants of very different magnitudes
+    don't spoil the least-squares solution, which also handles singular equations.
+
+    :param information: The matrix ``J^T J``.
+    :type information: npt.NDArray
+    :param gradient: The vector ``-J^T r``.
+    :type gradient: npt.NDArray
+    :return: The step of the constants.
+    :rtype: npt.NDArray
+    """
+    diagonal = np.sqrt(np.diag(information))
+    diagonal = np.where(diagonal > 0, diagonal, 1.0)
+    scaled = information / np.outer(diagonal, diagonal)
+    return np.linalg.lstsq(scaled, gradient / diagonal, rcond=None)[0] / diagonal
+
+
+def _fit_ode_closed_form(
+    model: VPCModel,
+    data: list[list[int | float]],
+    options: FitOptions
+) -> bool:
+    """Fit a scalar first-order ODE through the regression path using its closed-form solution
+    with the data averaged over the rows at the earliest time point as initial condition.
 
+    The solution is fitted from the initial guess of the ODE and, if it differs, from the data
+    guess of the solution itself, keeping the fit with the lower cost.
 
-def _fit_ode(model: VPCModel, data: list[list[int | float]]) -> None:
+    This function sets the internal variables of the model to reflect the fit.
+
+    :param model: The model that is to be fit.
+    :type model: VPCModel
+    :param data: The provided data to which the model is fitted, time in the first column and\
+    the state in the second.
+    :type data: list[list[int  |  float]]
+    :param options: Settings for the fit.
+    :type options: FitOptions
+    :return: Whether the model was fitted, False if there is no usable closed-form solution.
+    :rtype: bool
+    """
+    if not model.has_ode_system() or len(data) != 2:
+        return False
+    try:
+        closed_form = model.closed_form
+        if closed_form is None:
+            return False
+        expression, initial_time, initial_value = closed_form
+        solution_model = VPCModel(expression, [model.ode_time_var, initial_time, initial_value])
+    except Exception as e:
+        logger.debug(f"Couldn't build a model of the closed-form solution: {e}")
+        return False
+    if solution_model.constants != model.constants:
+        logger.debug(f"Closed-form solution {expression} doesn't keep the model's constants.")
+        return False
+    # the initial condition enters the solution as two constant columns of independent variables
+    initial_row = [column[0] for column in FileHandler.average_replicates(data)]
+    solution_data = [data[0], *([value] * len(data[0]) for value in initial_row), data[1]]
+
+    # the guess of the ODE starts the fit, the data guess of the solution is tried as well
+    initial_guesses = [_initial_guess(model, data, options)]
+    solution_guess = _initial_guess(solution_model, solution_data, options)
+    if solution_guess != initial_guesses[0]:
+        initial_guesses.append(solution_guess)
+    best_fit = None
+    for initial_guess in initial_guesses:
+        try:
+            _fit_reg(solution_model, solution_data, replace(options, initial_guess=initial_guess))
+        except Exception as e:
+            logger.debug(f"Fit of the closed-form solution from {initial_guess} failed: {e}")
+            continue
+        cost = solution_model.fit_info["cost"]
+        if np.isfinite(cost) and (best_fit is None or cost < best_fit[2]["cost"]):
+            best_fit = (solution_model.fitted_consts, solution_model.covariance, solution_model.fit_info)
+    if best_fit is None:
+        logger.warning("Fit of the closed-form solution failed, integrating the ODE numerically.")
+        return False
+
+    fitted_consts, covariance, fit_info = best_fit
+    model.set_fit_information(
+        fitted_consts,
+        covariance=covariance,
+        fit_info={**fit_info, "closed_form": model.closed_form_string(*initial_row)}
+    )
+    return True
+
+
+def _fit_ode(
+    model: VPCModel,
+    data: list[list[int | float]],
+    options: FitOptions | None = None
+) -> None:
     """Fit a model represented by an ordinary differential equation (ODE) to provided data.
 
     This function sets the internal variables of the model to reflect the fit.
 
+    All states of the ODE system are integrated together and compared to their data columns in
+    one residual vector, see ``_ODEProblem`` for the expected layout of the data. The initial first
+    derivatives of second-order states are fitted alongside the constants and reported separately
+    in ``fit_info["initial_derivatives"]``.
+
     :param model: The model that is to be fit.
     :type model: VPCModel
     :param data: The provided data to which the model is fitted.
     :type data: list[list[int  |  float]]
+    :param options: Settings for the fit, defaults to None, i.e. ``FitOptions()``.
+    :type options: FitOptions | None, optional
+    :raises ValueError: If ``options.ode_optimizer`` is not a known optimizer.
+    :raises RuntimeError: If there isn't exactly one data column per state of the ODE system.
     :raises RuntimeError: If an error occurs during the minimization process or while solving the initial value problem.
     """
-    if len(model.independent_var) > 1:
-        ode_func = model.model_function
+    if options is None:
+        options = FitOptions()
+    if options.ode_optimizer not in ("least_squares", "minimize"):
+        raise ValueError(f"Unknown ODE optimizer '{options.ode_optimizer}'.")
+    use_shooting = options.ode_shooting_segments > 1
+    if use_shooting and options.ode_optimizer != "least_squares":
+        raise ValueError("Multiple shooting requires the 'least_squares' ODE optimizer.")
+
+    use_sensitivities = options.ode_sensitivities and model.has_ode_system() and not use_shooting
+    if use_shooting and options.ode_sensitivities:
+        logger.warning("Sensitivities are not used with multiple shooting.")
+    elif options.ode_sensitivities and not use_sensitivities:
+        logger.warning(
+            "Sensitivities require an explicit ODE system like y' = f(t, y)."
+            "  Falling back to finite differences."
+        )
+
+    initial_guess = _initial_guess(model, data, options)
+    scales = _constant_scales(initial_guess, options)
+    residual_scales = FileHandler.column_scales(data[1:]) if options.scale_data else None
+    # only a Jacobian of its own is evaluated at the point the optimizer just evaluated the residuals at
+    use_cache = not use_shooting and (use_sensitivities or options.workers > 1)
+    problem = _ODEProblem(
+        model,
+        data,
+        sensitivities=use_sensitivities,
+        ode_solver=options.ode_solver,
+        cache_size=options.ode_cache_size if use_cache else 0,
+        initial_guess=initial_guess,
+        residual_scales=residual_scales
+    )
+
+    pool = None
+    if options.workers > 1 and not use_sensitivities:
+        pool = ProcessPoolExecutor(
+            max_workers=options.workers,
+            initializer=_init_probe_worker,
+            initargs=(model.spec, data, residual_scales)
+        )
+
+    shooting = None
+    if use_shooting:
+        shooting = _ShootingProblem(problem, options.ode_shooting_segments, pool)
+        # parameters also contain the initial states of the segments
+        unscaled_residuals = shooting.residuals
+        params = shooting.initial_parameters(initial_guess)
+        jac_kwargs = {"jac_sparsity": shooting.jac_sparsity()}
     else:
-        ode_func = lambda t, *args: model.model_function(*args) # type: ignore
+        unscaled_residuals = problem.residuals
+        params = problem.initial_parameters(initial_guess)
+        jac_kwargs = {}
+    # the optimizers work on the parameters divided by their scales
+    param_scales = np.concatenate([scales, np.ones(len(params) - len(scales))])
+    params = params / param_scales
 
-    t_data = data[0]
-    y_data = data[1]
+    def residual_function(params: npt.NDArray) -> npt.NDArray:
+        """Helper function that returns the residual vector for the scaled parameters.
 
-    def objective_function(
-        consts: tuple[float,...],
-        t_data: list[float],
-        y_data: list[float],
-        y0: float
-    ) -> Any:
+        :param params: The parameters divided by their scales.
+        :type params: npt.NDArray
+        :return: The residual vector.
+        :rtype: npt.NDArray
+        """
+        return unscaled_residuals(params * param_scales)
+
+    def jacobian_function(params: npt.NDArray) -> npt.NDArray:
+        """Helper function that returns the Jacobian of the residual vector with respect to the
+        scaled parameters, either from the forward sensitivities or from finite-difference probes
+        evaluated on the process pool.
+
+        :param params: The parameters divided by their scales.
+        :type params: npt.NDArray
+        :return: Jacobian of the residuals with respect to the scaled parameters.
+        :rtype: npt.NDArray
+        """
+        if pool is not None:
+            return _parallel_fd_jacobian(problem, pool, params, param_scales)
+        return problem.jacobian(tuple(params * param_scales)) * param_scales
+
+    def objective_function(params: npt.NDArray) -> Any:
         """Helper Function that is the objective to minimize. Used to fit the constants.
 
-        :param consts: The constants of the function.
-        :type consts: tuple[float,...]
-        :param t_data: The data for the independent variable, e.g. the time ``t``.
-        :type t_data: list[float]
-        :param y_data: The resulting data.
-        :type y_data: list[float]
-        :param y0: The initial condition of the differential equation.
-        :type y0: float
-        :raises RuntimeError: If an error occurrs while solving the initial value problem.
-        :return: The sum of squares of the differences between a certain set of constants and\
-        the result data.
+        :param params: The parameters divided by their scales.
+        :type params: npt.NDArray
+        :return: The sum of squares of the differences between a certain set of parameters and\
+        the result data. If a Jacobian is available, also the gradient of the sum of squares.
         :rtype: Any
         """
-        try:
-            sol = solve_ivp(
-                fun=ode_func,
-                t_span=[t_data[0], t_data[-1]],
-                y0=[y0],
-                t_eval=t_data,
-                args=(*consts,)
-            )
-        except ValueError as ve:
-            logger.error(
-                f"Value Error occurred in solve_ivp. Message:\n"
-                f"  {ve}"
-                f"  List of values for the call:\n"
-                f"  {ode_func=}, span={t_data[0]=}, {t_data[-1]}, {y0=}, t_eval={t_data}, args={consts}"
-            )
-            logger.debug(f"Trying again with altered initial value y0 *= 0.1.")
-            try:
-                sol = solve_ivp(
-                fun=ode_func,
-                t_span=[t_data[0], t_data[-1]],
-                y0=[y0*0.1],
-                t_eval=t_data,
-                args=(*consts,)
-            )
-            except Exception as e:
-                raise RuntimeError("Error in solving initial value problem.") from e
-        except RuntimeError as re:
-            logger.error(
-                f"Encountered a runtime error while solving initial value problem. See:\n"
-                f"  {re}"
-            )
-            raise
-        return np.sum((sol.y[0] - y_data)**2)
+        residuals = residual_function(params)
+        if use_sensitivities or pool is not None:
+            return np.sum(residuals**2), 2 * jacobian_function(params).T @ residuals
+        return np.sum(residuals**2)
+
+    jac: Any = "2-point"
+    if not use_shooting and (use_sensitivities or pool is not None):
+        jac = jacobian_function
 
-    initial_guess = [1 for c in model.constants]
+    schedule = options.ode_tolerance_schedule or [DEFAULT_ODE_TOLERANCES]
+    stages = []
 
     try:
-        result = minimize(objective_function, initial_guess, args=(t_data, y_data, y_data[1]))
-        fitted_consts = dict(zip(model.constants, result.x))
-        model.set_fit_information(fitted_consts)
+        for stage, (rtol, atol) in enumerate(schedule):
+            is_final_stage = stage == len(schedule) - 1
+            problem.set_tolerances(rtol, atol)
+            solves_before = problem.solve_count
+            if options.ode_optimizer == "least_squares":
+                # earlier stages only need to converge as far as the integration is accurate
+                tolerances = {} if is_final_stage else {"ftol": max(rtol, 1e-8), "xtol": max(rtol, 1e-8)}
+                result = least_squares(
+                    residual_function,
+                    params,
+                    jac=jac,
+                    method="trf",
+                    **jac_kwargs,
+                    **tolerances
+                )
+                nfev, njev = result.nfev, result.njev
+                # the penalty only approximates continuity, so its weight grows until the defects vanish
+                while (shooting is not None and is_final_stage and not shooting.is_continuous(result.fun)
+                        and shooting.continuity_weight < SHOOTING_MAX_WEIGHT):
+                    shooting.continuity_weight *= SHOOTING_WEIGHT_GROWTH
+                    result = least_squares(residual_function, result.x, jac=jac, method="trf", **jac_kwargs)
+                    nfev += result.nfev
+                    njev += result.njev
+                cost = result.cost
+            else:
+                result = minimize(
+                    objective_function,
+                    params,
+                    jac=use_sensitivities or pool is not None,
+                    tol=None if is_final_stage else rtol
+                )
+                cost = 0.5 * result.fun
+                nfev, njev = result.nfev, result.get("njev")
+            params = result.x
+            stages.append({
+                "rtol": rtol,
+                "atol": atol,
+                "nfev": nfev,
+                "njev": njev,
+                "ode_solves": problem.solve_count - solves_before,
+                "cost": cost,
+            })
+
+        num_consts = len(initial_guess)
+        if options.ode_optimizer == "least_squares":
+            full_jac = result.jac.toarray() if hasattr(result.jac, "toarray") else result.jac
+            # the marginal covariance of the constants, excluding initial derivatives and states of segments
+            covariance = _covariance_from_jacobian(full_jac, result.fun)[:num_consts, :num_consts]
+        else:
+            dof = problem.y_data.size - len(params)
+            if dof > 0 and hasattr(result, "hess_inv"):
+                # hess_inv approximates (2 J^T J)^-1 for the sum of squares
+                covariance = (2 * np.asarray(result.hess_inv) * result.fun / dof)[:num_consts, :num_consts]
+            else:
+                covariance = None
+        fit_info = {
+            "optimizer": options.ode_optimizer,
+            "initial_guess": initial_guess,
+            "constant_scales": scales.tolist(),
+            "nfev": sum(stage_info["nfev"] for stage_info in stages),
+            "njev": sum(stage_info["njev"] or 0 for stage_info in stages),
+            "cost": stages[-1]["cost"],
+            "tolerance_stages": stages,
+        }
+        fit_info["success"] = bool(result.success) and (shooting is None or shooting.is_continuous(result.fun))
+        fit_info["message"] = result.message
+        fit_info["workers"] = options.workers if pool is not None else 1
+        fit_info.update(problem.info())
+        if problem.num_params > num_consts:
+            # the fitted initial first derivatives of the second-order states, e.g. y'(t0)
+            derivative_names = model.ode_system_vars[problem.num_states:]
+            fitted_derivatives = (result.x * param_scales)[num_consts:problem.num_params]
+            fit_info["initial_derivatives"] = dict(zip(derivative_names, fitted_derivatives.tolist()))
+        if shooting is not None:
+            fit_info["shooting"] = shooting.info(result.fun)
+        fitted_consts = dict(zip(model.constants, result.x[:num_consts]))
+        model.set_fit_information(fitted_consts, covariance=covariance, fit_info=fit_info, scales=scales)
     except RuntimeError as re:
         logger.error(
             f"Failed to minimize the objective function."
@@ -132,9 +840,806 @@ def _fit_ode(model: VPCModel, data: list[list[int | float]]) -> None:
         )
         model.set_fit_information(error=True)
         raise RuntimeError("Error in minimize function.") from e
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+class _ODEProblem:
+    """Residuals of an ODE model with respect to data, evaluated by solving the initial value
+    problem for a set of constants. Used as the objective of the optimizers in ``_fit_ode``.
+
+    The first data column holds the time points, followed by one column per state of the ODE
+    system. The time points may be unsorted and repeated, e.g. for replicate measurements. The
+    system is integrated once on the sorted unique time points and the solution is scattered
+    back to every data row. The data averaged over the rows at the earliest time point is used as
+    the initial condition. Second-order equations are integrated as an equivalent first-order
+    system. Their initial first derivatives can't be read off the data, so they are fitted
+    alongside the constants: the parameters of the problem are the constants followed by the
+    initial first derivatives of the second-order states, seeded by ``_initial_derivative``.
+
+    If ``cache_size`` is positive, results are cached, so residuals and Jacobian at the same
+    parameters only need a single integration.
+
+    :param model: The model that is to be fit.
+    :type model: VPCModel
+    :param data: The provided data to which the model is fitted.
+    :type data: list[list[int  |  float]]
+    :param sensitivities: Whether to integrate the forward sensitivities to obtain the Jacobian\
+    of the residuals, defaults to False.
+    :type sensitivities: bool, optional
+    :param ode_solver: Integration method or "auto", see ``FitOptions``, defaults to "auto".
+    :type ode_solver: str, optional
+    :param cache_size: Maximum number of cached solutions, defaults to 1. 0 disables the cache.
+    :type cache_size: int, optional
+    :param initial_guess: Constants for the stiffness probe of ``ode_solver="auto"``, defaults to\
+    None, i.e. all ones.
+    :type initial_guess: list[float] | None, optional
+    :param residual_scales: Scales the residuals of each state are divided by, defaults to None,\
+    i.e. unscaled residuals.
+    :type residual_scales: Sequence[float] | None, optional
+    :raises RuntimeError: If there isn't exactly one data column per state of the ODE system.
+    """
+    def __init__(
+        self,
+        model: VPCModel,
+        data: list[list[int | float]],
+        sensitivities: bool = False,
+        ode_solver: str = "auto",
+        cache_size: int = 1,
+        initial_guess: list[float] | None = None,
+        residual_scales: Sequence[float] | None = None
+    ) -> None:
+        self.num_consts: int = len(model.constants)
+        self.sensitivities: bool = sensitivities
+
+        # assumption: first col for time, rest for the states in the order of the model's left-hand side
+        self.num_states: int = len(model.ode_state_vars) if model.has_ode_system() else 1
+        if len(data) != self.num_states + 1:
+            raise RuntimeError("Each state of the ODE system needs its own data column.")
+        # the integration grid of unique time points and the grid index of every data row
+        t_grid, self.t_index = np.unique(np.asarray(data[0], dtype=float), return_inverse=True)
+        self.t_data: list[float] = t_grid.tolist()
+        self.y_data: npt.NDArray = np.array(data[1:], dtype=float)
+        # the data averaged over the replicates of every time point of the grid
+        self.y_grid: npt.NDArray = np.array(FileHandler.average_replicates(data)[1:], dtype=float)
+        self.residual_scales: npt.NDArray = np.ones((self.num_states, 1))
+        if residual_scales is not None:
+            self.residual_scales = np.asarray(residual_scales, dtype=float).reshape(-1, 1)
+        # states whose first derivatives are appended to the system, in the order of the augmentation
+        self.second_order_states: list[int] = []
+        if model.has_ode_system():
+            self.second_order_states = [i for i, order in enumerate(model.ode_orders) if order == 2]
+        self.num_params: int = self.num_consts + len(self.second_order_states)
+        self.num_system: int = self.num_states + len(self.second_order_states)
+        # starting values of the fitted initial first derivatives
+        self.initial_derivatives: npt.NDArray = np.array(
+            [_initial_derivative(self.t_data, self.y_grid[i]) for i in self.second_order_states]
+        )
+
+        self.model_jac: Callable[..., Any] | None = None
+        if sensitivities:
+            self.ode_func: Callable[..., Any] = model.sensitivity_function
+            self.model_jac = model.sensitivity_jacobian
+        elif model.has_ode_system():
+            self.ode_func = model.ode_function
+            self.model_jac = model.ode_jacobian
+        elif len(model.independent_var) > 1:
+            self.ode_func = model.model_function
+        else:
+            self.ode_func = lambda t, *args: model.model_function(*args) # type: ignore
+
+        if initial_guess is None:
+            initial_guess = [1.0] * self.num_consts
+        self.probe_info: dict[str, Any] | None = None
+        if ode_solver == "auto":
+            ode_solver, self.probe_info = _select_ode_solver(
+                self.ode_func, self.model_jac, self.t_data,
+                self.initial_state(self.initial_parameters(initial_guess)), tuple(initial_guess)
+            )
+            logger.debug(f"Selected ODE solver {ode_solver} based on probe integration {self.probe_info}.")
+        self.ode_solver: str = ode_solver
+        self.rtol, self.atol = DEFAULT_ODE_TOLERANCES
+
+        self.solve_count: int = 0
+        self.solver_stats: dict[str, int] = {"nfev": 0, "njev": 0, "nlu": 0}
+        self.cache: _SolutionCache | None = _SolutionCache(cache_size) if cache_size > 0 else None
+
+    def set_tolerances(self, rtol: float, atol: float) -> None:
+        """Set the tolerances of the integration. Cached solutions are discarded if they change.
+
+        :param rtol: Relative tolerance passed to ``solve_ivp``.
+        :type rtol: float
+        :param atol: Absolute tolerance passed to ``solve_ivp``.
+        :type atol: float
+        """
+        if (rtol, atol) != (self.rtol, self.atol):
+            self.rtol, self.atol = rtol, atol
+            if self.cache is not None:
+                self.cache.clear()
+
+    @property
+    def ode_jac(self) -> Callable[..., Any] | None:
+        """The state Jacobian passed to ``solve_ivp``, only set for implicit methods."""
+        return self.model_jac if self.ode_solver in IMPLICIT_ODE_SOLVERS else None
+
+    def initial_parameters(self, consts: Sequence[float]) -> npt.NDArray:
+        """Build the initial parameter vector from the constants and the estimated initial first
+        derivatives of the second-order states.
+
+        :param consts: Initial guess of the constants.
+        :type consts: Sequence[float]
+        :return: The constants followed by the initial first derivatives.
+        :rtype: npt.NDArray
+        """
+        return np.concatenate([np.asarray(consts, dtype=float), self.initial_derivatives])
+
+    def initial_state(self, params: Sequence[float]) -> npt.NDArray:
+        """Build the initial state of the integrated system for a set of parameters.
+
+        :param params: The constants followed by the initial first derivatives.
+        :type params: Sequence[float]
+        :return: The states at the earliest time point, followed by the initial first derivatives\
+        and, if sensitivities are used, their initial sensitivities ``dy_i/dp_j``.
+        :rtype: npt.NDArray
+        """
+        state = np.concatenate([self.y_grid[:, 0], np.asarray(params[self.num_consts:], dtype=float)])
+        if not self.sensitivities:
+            return state
+        # only the initial first derivatives themselves depend on their parameters at the start
+        sens = np.zeros((self.num_system, self.num_params))
+        for j in range(self.num_params - self.num_consts):
+            sens[self.num_states + j, self.num_consts + j] = 1.0
+        return np.concatenate([state, sens.ravel()])
+
+    def solve(self, params: tuple[float,...]) -> tuple[npt.NDArray, npt.NDArray | None, Any]:
+        """Solve the initial value problem for a set of parameters without using the cache.
+
+        :param params: The constants followed by the initial first derivatives.
+        :type params: tuple[float,...]
+        :return: The residual vector, its Jacobian if sensitivities are used, and the solution\
+        object returned by ``solve_ivp``.
+        :rtype: tuple[npt.NDArray, npt.NDArray | None, Any]
+        """
+        sol = _solve_ode(
+            self.ode_func, self.t_data, self.initial_state(params), params[:self.num_consts],
+            method=self.ode_solver, jac=self.ode_jac, rtol=self.rtol, atol=self.atol
+        )
+        residuals = ((sol.y[:self.num_states, self.t_index] - self.y_data) / self.residual_scales).ravel()
+        jac = None
+        if self.sensitivities:
+            # rows of sol.y hold dy_i/dp_j in row-major order, residuals are ordered by state
+            sens = sol.y[self.num_system:].reshape(self.num_system, self.num_params, -1)
+            sens = sens[:self.num_states][:, :, self.t_index] / self.residual_scales[:, :, np.newaxis]
+            jac = sens.transpose(0, 2, 1).reshape(-1, self.num_params)
+        return residuals, jac, sol
+
+    def count_solve(self, stats: dict[str, int]) -> None:
+        """Accumulate the solver statistics of an integration, possibly solved in another process.
+
+        :param stats: The ``nfev``, ``njev`` and ``nlu`` of the solution.
+        :type stats: dict[str, int]
+        """
+        self.solve_count += 1
+        for stat in self.solver_stats:
+            self.solver_stats[stat] += stats[stat]
+
+    def evaluate(self, params: tuple[float,...]) -> tuple[npt.NDArray, npt.NDArray | None]:
+        """Return the residual vector and, if sensitivities are used, its Jacobian, from the cache,
+        if any, or by solving the initial value problem.
+
+        :param params: The constants followed by the initial first derivatives.
+        :type params: tuple[float,...]
+        :return: The residual vector and its Jacobian, if any.
+        :rtype: tuple[npt.NDArray, npt.NDArray | None]
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(params)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry
+        residuals, jac, sol = self.solve(params)
+        self.count_solve(_solver_stats(sol))
+        if self.cache is not None:
+            self.cache.put(key, (residuals, jac))
+        return residuals, jac
+
+    def residuals(self, params: tuple[float,...]) -> npt.NDArray:
+        """Compute the residual vector of the model for a set of parameters.
+
+        :param params: The constants followed by the initial first derivatives.
+        :type params: tuple[float,...]
+        :return: The differences between the solution for ``params`` and the result data at\
+        every time point.
+        :rtype: npt.NDArray
+        """
+        return self.evaluate(params)[0]
+
+    def jacobian(self, params: tuple[float,...]) -> npt.NDArray | None:
+        """Return the Jacobian of the residual vector obtained from the forward sensitivities.
+
+        :param params: The constants followed by the initial first derivatives.
+        :type params: tuple[float,...]
+        :return: Jacobian of the residuals with respect to the parameters, None without sensitivities.
+        :rtype: npt.NDArray | None
+        """
+        return self.evaluate(params)[1]
+
+    def info(self) -> dict[str, Any]:
+        """Return information about the integrations for the model's ``fit_info``.
+
+        :return: Dictionary with the number of solves, the ODE solver, its accumulated statistics,\
+        and, if any, the cache statistics and the results of the stiffness probe.
+        :rtype: dict[str, Any]
+        """
+        info: dict[str, Any] = {
+            "ode_solves": self.solve_count,
+            "ode_solver": self.ode_solver,
+            "ode_solver_stats": self.solver_stats,
+        }
+        if self.cache is not None:
+            info["ode_cache"] = self.cache.info()
+        if self.probe_info is not None:
+            info["stiffness_probe"] = self.probe_info
+        return info
+
+
+def _initial_derivative(t_data: Sequence[float], y_data: npt.NDArray) -> float:
+    """Estimate the first derivative of a state at the earliest time point from the slope of a
+    quadratic fitted to the first ``INITIAL_DERIVATIVE_POINTS`` time points, which is less
+    sensitive to noise than a finite difference.
+
+    :param t_data: The sorted unique time points.
+    :type t_data: Sequence[float]
+    :param y_data: The state at every time point.
+    :type y_data: npt.NDArray
+    :return: The estimated first derivative at ``t_data[0]``.
+    :rtype: float
+    """
+    num_points = min(INITIAL_DERIVATIVE_POINTS, len(t_data))
+    if num_points < 2:
+        return 0.0
+    t = np.asarray(t_data[:num_points], dtype=float) - t_data[0]
+    coefficients = np.polyfit(t, y_data[:num_points], min(2, num_points - 1))
+    return float(coefficients[-2])
+
+
+def _solver_stats(sol: Any) -> dict[str, int]:
+    """Extract the statistics of a ``solve_ivp`` solution.
+
+    :param sol: The solution object returned by ``solve_ivp``.
+    :type sol: Any
+    :return: Dictionary with the solution's ``nfev``, ``njev`` and ``nlu``.
+    :rtype: dict[str, int]
+    """
+    return {"nfev": sol.nfev, "njev": sol.njev, "nlu": sol.nlu}
+
+
+# problem of the worker process, set up once by _init_probe_worker
+_worker_problem: _ODEProblem | None = None
+
+
+def _init_probe_worker(
+    spec: ModelSpec,
+    data: list[list[int | float]],
+    residual_scales: Sequence[float] | None = None
+) -> None:
+    """Initializer of the worker processes evaluating finite-difference probes.
 
+    Lambdified functions can't be pickled, so every worker builds its own model from the model's
+    specification once.
 
-def _fit_reg(model: VPCModel, data: list[list[int | float]]) -> None:
+    :param spec: The specification of the fitted model.
+    :type spec: ModelSpec
+    :param data: The provided data to which the model is fitted.
+    :type data: list[list[int  |  float]]
+    :param residual_scales: Scales the residuals of each state are divided by, defaults to None.
+    :type residual_scales: Sequence[float] | None, optional
+    """
+    global _worker_problem
+    model = spec.to_model()
+    _worker_problem = _ODEProblem(
+        model, data, ode_solver="RK45", cache_size=0, residual_scales=residual_scales
+    )
+
+
+def _probe_worker(
+    params: npt.NDArray,
+    ode_solver: str,
+    tolerances: tuple[float, float]
+) -> tuple[npt.NDArray, dict[str, int]]:
+    """Solve the initial value problem of the worker's problem for one finite-difference probe.
+
+    :param params: The parameters of the probe, see ``_ODEProblem``.
+    :type params: npt.NDArray
+    :param ode_solver: The integration method currently used by the fit.
+    :type ode_solver: str
+    :param tolerances: The ``(rtol, atol)`` currently used by the fit.
+    :type tolerances: tuple[float, float]
+    :return: The residual vector and the solver statistics.
+    :rtype: tuple[npt.NDArray, dict[str, int]]
+    """
+    _worker_problem.ode_solver = ode_solver
+    _worker_problem.set_tolerances(*tolerances)
+    residuals, _, sol = _worker_problem.solve(tuple(params))
+    return residuals, _solver_stats(sol)
+
+
+def _parallel_fd_jacobian(
+    problem: _ODEProblem,
+    pool: ProcessPoolExecutor,
+    params: npt.NDArray,
+    scales: npt.NDArray
+) -> npt.NDArray:
+    """Approximate the Jacobian of the residuals by forward differences, with the probes for all
+    parameters solved concurrently on a process pool.
+
+    :param problem: The problem of the fit.
+    :type problem: _ODEProblem
+    :param pool: Pool of workers set up by ``_init_probe_worker``.
+    :type pool: ProcessPoolExecutor
+    :param params: The parameters divided by their scales, at which the Jacobian is approximated.
+    :type params: npt.NDArray
+    :param scales: Scales of the parameters.
+    :type scales: npt.NDArray
+    :return: Jacobian of the residuals with respect to the scaled parameters.
+    :rtype: npt.NDArray
+    """
+    x = np.asarray(params, dtype=float)
+    base = problem.residuals(tuple(x * scales))
+    # same step size as the "2-point" scheme of scipy.optimize.least_squares
+    steps = np.finfo(float).eps**0.5 * np.where(x >= 0, 1, -1) * np.maximum(1, np.abs(x))
+    probes = [x + step * np.eye(len(x))[j] for j, step in enumerate(steps)]
+    results = pool.map(
+        _probe_worker,
+        [probe * scales for probe in probes],
+        [problem.ode_solver] * len(probes),
+        [(problem.rtol, problem.atol)] * len(probes)
+    )
+
+    jac = np.empty((base.size, len(x)))
+    for j, (probe, (residuals, stats)) in enumerate(zip(probes, results)):
+        # probes are never revisited, so they are only counted and not cached
+        problem.count_solve(stats)
+        jac[:, j] = (residuals - base) / (probe[j] - x[j])
+    return jac
+
+
+class _ShootingProblem:
+    """Multiple-shooting formulation of an ``_ODEProblem``.
+
+    The unique time points are split into segments of roughly equal size. Every segment but the first
+    starts from its own initial state, which is fitted alongside the constants, so each segment is
+    only integrated over its own part of the time axis. Continuity between consecutive segments
+    is enforced by appending the weighted defects ``y_k(t_{k+1}) - s_{k+1}`` to the residuals.
+
+    The parameters seen by the optimizer are the parameters of the problem, i.e. the constants and
+    the initial first derivatives of the second-order states, followed by the initial states of
+    segments ``1, ..., K-1``.
+
+    :param problem: The single-shooting problem providing the ODE system, data and solver.
+    :type problem: _ODEProblem
+    :param segments: Number of segments, at most one less than the number of unique time points.
+    :type segments: int
+    :param pool: Pool of workers set up by ``_init_probe_worker`` to integrate the segments\
+    concurrently, defaults to None.
+    :type pool: ProcessPoolExecutor | None, optional
+    :raises ValueError: If there are too many segments for the time points.
+    """
+    def __init__(
+        self,
+        problem: _ODEProblem,
+        segments: int,
+        pool: ProcessPoolExecutor | None = None
+    ) -> None:
+        if not 1 < segments < len(problem.t_data):
+            raise ValueError("Number of shooting segments must be between 2 and the number of time points - 1.")
+        self.problem: _ODEProblem = problem
+        self.pool: ProcessPoolExecutor | None = pool
+        self.segment_indices: list[npt.NDArray] = np.array_split(np.arange(len(problem.t_data)), segments)
+        self.node_indices: list[int] = [int(indices[0]) for indices in self.segment_indices]
+        # the data rows of every segment and their time points relative to the segment's grid
+        self.segment_rows: list[npt.NDArray] = [
+            np.flatnonzero((problem.t_index >= indices[0]) & (problem.t_index <= indices[-1]))
+            for indices in self.segment_indices
+        ]
+        t_data = np.asarray(problem.t_data, dtype=float)
+        self.segment_times: list[npt.NDArray] = [
+            # every segment but the last also evaluates the start of the next one for its defect
+            t_data[indices[0]:indices[-1] + 2] if k < segments - 1 else t_data[indices]
+            for k, indices in enumerate(self.segment_indices)
+        ]
+        self.segment_solves: int = 0
+        self.continuity_weight: float = SHOOTING_CONTINUITY_WEIGHT
+        # magnitude of every state of the system the defects are compared to, the data for the
+        # states and their estimated first derivatives for the appended ones
+        magnitudes = [
+            *np.max(np.abs(problem.y_grid), axis=1),
+            *(np.max(np.abs(np.gradient(problem.y_grid[i], problem.t_data))) for i in problem.second_order_states)
+        ]
+        self.state_scales: npt.NDArray = np.where(np.asarray(magnitudes) > 0, magnitudes, 1.0)
+
+    @property
+    def num_nodes(self) -> int:
+        """Number of segments with fitted initial states."""
+        return len(self.segment_indices) - 1
+
+    def initial_parameters(self, consts: Sequence[float]) -> npt.NDArray:
+        """Build the initial parameter vector from the constants and the data at the nodes.
+
+        :param consts: Initial guess of the constants.
+        :type consts: Sequence[float]
+        :return: The parameters of the problem followed by the initial states of the segments.
+        :rtype: npt.NDArray
+        """
+        problem = self.problem
+        nodes = []
+        for index in self.node_indices[1:]:
+            state = [*problem.y_grid[:, index]]
+            # first derivatives of second-order states are estimated from the data
+            for i in problem.second_order_states:
+                gradient = np.gradient(problem.y_grid[i], problem.t_data)
+                state.append(gradient[index])
+            nodes.append(state)
+        return np.concatenate([problem.initial_parameters(consts), np.ravel(nodes)])
+
+    def jac_sparsity(self) -> npt.NDArray:
+        """Sparsity structure of the Jacobian of ``residuals``. The residuals of a segment only
+        depend on the constants and the segment's own initial state, its defect additionally on
+        the initial state of the next segment.
+
+        :return: Boolean matrix with a row per residual and a column per parameter.
+        :rtype: npt.NDArray
+        """
+        problem = self.problem
+        num_params, num_system = problem.num_params, problem.num_system
+        num_data = problem.y_data.size
+        sparsity = np.zeros(
+            (num_data + self.num_nodes * num_system, num_params + self.num_nodes * num_system),
+            dtype=bool
+        )
+        sparsity[:, :num_params] = True
+        row = 0
+        for k, segment_rows in enumerate(self.segment_rows):
+            rows = problem.num_states * len(segment_rows)
+            # the defect at the end of the segment, empty for the last segment
+            defect_rows = slice(num_data + k * num_system, num_data + (k+1) * num_system)
+            if k > 0:
+                # the segment's own initial state, that of the first segment are the parameters
+                cols = slice(num_params + (k-1) * num_system, num_params + k * num_system)
+                sparsity[row:row + rows, cols] = True
+                sparsity[defect_rows, cols] = True
+            if k < self.num_nodes:
+                # the initial state of the next segment
+                cols = slice(num_params + k * num_system, num_params + (k+1) * num_system)
+                sparsity[defect_rows, cols] = True
+            row += rows
+        return sparsity
+
+    def split_parameters(self, params: Sequence[float]) -> tuple[tuple[float,...], npt.NDArray]:
+        """Split the parameter vector into the constants and the initial states of the segments.
+
+        :param params: The parameters of the problem followed by the initial states of segments\
+        ``1, ..., K-1``.
+        :type params: Sequence[float]
+        :return: Tuple of the constants and a matrix with the initial state of every segment.
+        :rtype: tuple[tuple[float,...], npt.NDArray]
+        """
+        problem = self.problem
+        consts = tuple(params[:problem.num_consts])
+        nodes = np.reshape(params[problem.num_params:], (self.num_nodes, problem.num_system))
+        return consts, np.vstack([problem.initial_state(params[:problem.num_params]), nodes])
+
+    def residuals(self, params: Sequence[float]) -> npt.NDArray:
+        """Compute the residuals of all segments followed by the weighted continuity defects.
+
+        :param params: The parameters of the problem followed by the initial states of segments\
+        ``1, ..., K-1``.
+        :type params: Sequence[float]
+        :return: The residual vector.
+        :rtype: npt.NDArray
+        """
+        problem = self.problem
+        consts, starts = self.split_parameters(params)
+        tolerances = (problem.rtol, problem.atol)
+        if self.pool is not None:
+            num = len(starts)
+            results = list(self.pool.map(
+                _segment_worker,
+                self.segment_times, starts, [consts] * num,
+                [problem.ode_solver] * num, [tolerances] * num
+            ))
+        else:
+            results = [
+                _integrate_segment(
+                    problem.ode_func, problem.ode_jac, times, start, consts, problem.ode_solver, tolerances
+                )
+                for times, start in zip(self.segment_times, starts)
+            ]
+
+        data_residuals = []
+        defects = []
+        for k, (indices, rows, (states, stats)) in enumerate(zip(self.segment_indices, self.segment_rows, results)):
+            self.segment_solves += 1
+            problem.count_solve(stats)
+            segment_states = states[:problem.num_states, problem.t_index[rows] - indices[0]]
+            data_residuals.append((segment_states - problem.y_data[:, rows]) / problem.residual_scales)
+            if k < self.num_nodes:
+                defects.append(states[:, -1] - starts[k+1])
+        return np.concatenate([
+            np.concatenate(data_residuals, axis=1).ravel(),
+            self.continuity_weight * np.ravel(defects)
+        ])
+
+    def defects(self, residuals: npt.NDArray) -> npt.NDArray:
+        """Extract the unweighted continuity defects from a residual vector of ``residuals``.
+
+        :param residuals: The residual vector.
+        :type residuals: npt.NDArray
+        :return: Matrix with the defect of every state at the end of segments ``0, ..., K-2``.
+        :rtype: npt.NDArray
+        """
+        num_data = self.problem.y_data.size
+        return np.reshape(residuals[num_data:] / self.continuity_weight, (self.num_nodes, -1))
+
+    def is_continuous(self, residuals: npt.NDArray) -> bool:
+        """Determine whether the segments of a residual vector of ``residuals`` join up, i.e. all
+        defects are within ``SHOOTING_DEFECT_TOLERANCE`` of the magnitude of their state.
+
+        :param residuals: The residual vector.
+        :type residuals: npt.NDArray
+        :return: True if the solution is continuous within the tolerance, False otherwise.
+        :rtype: bool
+        """
+        return bool(np.all(np.abs(self.defects(residuals)) <= SHOOTING_DEFECT_TOLERANCE * self.state_scales))
+
+    def info(self, residuals: npt.NDArray) -> dict[str, Any]:
+        """Return information about the multiple-shooting fit for the model's ``fit_info``.
+
+        :param residuals: The residual vector at the fitted parameters.
+        :type residuals: npt.NDArray
+        :return: Dictionary with the number of segments, segment integrations, the final weight of\
+        the defects, the largest continuity defect and whether the defects are within tolerance.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "segments": len(self.segment_indices),
+            "segment_solves": self.segment_solves,
+            "continuity_weight": self.continuity_weight,
+            "max_defect": float(np.max(np.abs(self.defects(residuals)))),
+            "continuous": self.is_continuous(residuals),
+        }
+
+
+def _integrate_segment(
+    ode_func: Callable[..., Any],
+    ode_jac: Callable[..., Any] | None,
+    times: npt.NDArray,
+    start: npt.NDArray,
+    consts: tuple[float,...],
+    ode_solver: str,
+    tolerances: tuple[float, float]
+) -> tuple[npt.NDArray, dict[str, int]]:
+    """Integrate a single multiple-shooting segment.
+
+    :param ode_func: Right-hand side of the ODE system with signature ``f(t, y, *consts)``.
+    :type ode_func: Callable[..., Any]
+    :param ode_jac: Jacobian of ``ode_func`` for implicit methods, or None.
+    :type ode_jac: Callable[..., Any] | None
+    :param times: The time points of the segment, starting at its node.
+    :type times: npt.NDArray
+    :param start: The initial state of the segment.
+    :type start: npt.NDArray
+    :param consts: The constants of the function.
+    :type consts: tuple[float,...]
+    :param ode_solver: The integration method.
+    :type ode_solver: str
+    :param tolerances: The ``(rtol, atol)`` of the integration.
+    :type tolerances: tuple[float, float]
+    :return: The states at ``times`` and the solver statistics.
+    :rtype: tuple[npt.NDArray, dict[str, int]]
+    """
+    sol = _solve_ode(
+        ode_func, times, start, consts,
+        method=ode_solver, jac=ode_jac, rtol=tolerances[0], atol=tolerances[1]
+    )
+    return sol.y, _solver_stats(sol)
+
+
+def _segment_worker(
+    times: npt.NDArray,
+    start: npt.NDArray,
+    consts: tuple[float,...],
+    ode_solver: str,
+    tolerances: tuple[float, float]
+) -> tuple[npt.NDArray, dict[str, int]]:
+    """Integrate a single multiple-shooting segment with the worker's problem.
+
+    :param times: The time points of the segment, starting at its node.
+    :type times: npt.NDArray
+    :param start: The initial state of the segment.
+    :type start: npt.NDArray
+    :param consts: The constants of the function.
+    :type consts: tuple[float,...]
+    :param ode_solver: The integration method currently used by the fit.
+    :type ode_solver: str
+    :param tolerances: The ``(rtol, atol)`` currently used by the fit.
+    :type tolerances: tuple[float, float]
+    :return: The states at ``times`` and the solver statistics.
+    :rtype: tuple[npt.NDArray, dict[str, int]]
+    """
+    _worker_problem.ode_solver = ode_solver
+    return _integrate_segment(
+        _worker_problem.ode_func, _worker_problem.ode_jac, times, start, consts, ode_solver, tolerances
+    )
+
+
+def _select_ode_solver(
+    ode_func: Callable[..., Any],
+    ode_jac: Callable[..., Any] | None,
+    t_data: list[float],
+    initial_state: list[float],
+    consts: tuple[float,...]
+) -> tuple[str, dict[str, Any]]:
+    """Select an integration method for an ODE system based on a probe integration.
+
+    The system is integrated with the explicit RK45 method for at most ``STIFFNESS_PROBE_STEPS``
+    accepted steps within the first ``STIFFNESS_PROBE_WINDOW`` of the time span. After every step
+    the spectral radius ``rho`` of the state Jacobian is evaluated at the current state. An
+    accuracy-limited step size ``h`` keeps ``h * rho`` well below the stability limit of the
+    method, while on a stiff problem the steps stay close to it.
+    The system is therefore treated as stiff if the median of ``h * rho`` over the probe exceeds
+    ``STIFFNESS_STABILITY_FRACTION`` of ``RK45_STABILITY_LIMIT``. Stiff systems are solved with
+    BDF if a state Jacobian is available, LSODA otherwise.
+
+    :param ode_func: Right-hand side of the ODE system with signature ``f(t, y, *consts)``.
+    :type ode_func: Callable[..., Any]
+    :param ode_jac: Jacobian of ``ode_func`` with respect to the states, or None to approximate\
+    it by finite differences.
+    :type ode_jac: Callable[..., Any] | None
+    :param t_data: The data for the independent variable, e.g. the time ``t``.
+    :type t_data: list[float]
+    :param initial_state: The initial condition of the differential equation.
+    :type initial_state: list[float]
+    :param consts: The constants the probe is integrated with.
+    :type consts: tuple[float,...]
+    :return: Tuple of the name of the selected method and information about the probe.
+    :rtype: tuple[str, dict[str, Any]]
+    """
+    probe_info: dict[str, Any] = {"nfev": 0, "steps": 0, "stability_ratio": 0.0}
+    fun = lambda t, y: np.asarray(ode_func(t, y, *consts), dtype=float).ravel()
+    ratios = []
+    try:
+        window_end = max(
+            t_data[0] + STIFFNESS_PROBE_WINDOW * (t_data[-1] - t_data[0]), t_data[min(1, len(t_data) - 1)]
+        )
+        solver = RK45(fun, t_data[0], np.array(initial_state, dtype=float), window_end)
+        while solver.status == "running" and probe_info["steps"] < STIFFNESS_PROBE_STEPS:
+            solver.step()
+            probe_info["steps"] += 1
+            if ode_jac is not None:
+                jac = np.asarray(ode_jac(solver.t, solver.y, *consts), dtype=float)
+            else:
+                jac = _finite_difference_jacobian(fun, solver.t, solver.y)
+            ratios.append(solver.step_size * np.max(np.abs(np.linalg.eigvals(jac))))
+        probe_info["nfev"] = solver.nfev
+    except Exception as e:
+        logger.warning(
+            f"Probe integration for solver selection failed. See:\n"
+            f"  {e}"
+        )
+
+    if ratios:
+        probe_info["stability_ratio"] = float(np.median(ratios))
+    probe_info["stiff"] = bool(
+        probe_info["stability_ratio"] > STIFFNESS_STABILITY_FRACTION * RK45_STABILITY_LIMIT
+    )
+    if not probe_info["stiff"]:
+        return "RK45", probe_info
+    return ("BDF" if ode_jac is not None else "LSODA"), probe_info
+
+
+def _finite_difference_jacobian(fun: Callable[..., Any], t: float, y: npt.NDArray) -> npt.NDArray:
+    """Approximate the Jacobian of the right-hand side of an ODE system with respect to the states
+    by forward differences.
+
+    :param fun: Right-hand side of the ODE system with signature ``f(t, y)``.
+    :type fun: Callable[..., Any]
+    :param t: The time at which the Jacobian is evaluated.
+    :type t: float
+    :param y: The state at which the Jacobian is evaluated.
+    :type y: npt.NDArray
+    :return: Square matrix with a row per derivative and a column per state.
+    :rtype: npt.NDArray
+    """
+    f0 = fun(t, y)
+    steps = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(y), 1.0)
+    columns = [(fun(t, y + step * unit) - f0) / step for step, unit in zip(steps, np.eye(y.size))]
+    return np.array(columns).T
+
+
+def _solve_ode(
+    ode_func: Callable[..., Any],
+    t_data: list[float],
+    initial_state: list[float],
+    consts: tuple[float,...],
+    method: str = "RK45",
+    jac: Callable[..., Any] | None = None,
+    rtol: float = DEFAULT_ODE_TOLERANCES[0],
+    atol: float = DEFAULT_ODE_TOLERANCES[1]
+) -> Any:
+    """Solve the initial value problem of an ODE system on the time points of the data.
+
+    :param ode_func: Right-hand side of the ODE system with signature ``f(t, y, *consts)``.
+    :type ode_func: Callable[..., Any]
+    :param t_data: The data for the independent variable, e.g. the time ``t``.
+    :type t_data: list[float]
+    :param initial_state: The initial condition of the differential equation.
+    :type initial_state: list[float]
+    :param consts: The constants of the function.
+    :type consts: tuple[float,...]
+    :param method: Integration method used by ``solve_ivp``, defaults to "RK45".
+    :type method: str, optional
+    :param jac: Jacobian of ``ode_func`` with respect to the states, only used by implicit\
+    methods, defaults to None.
+    :type jac: Callable[..., Any] | None, optional
+    :param rtol: Relative tolerance of the integration, defaults to ``DEFAULT_ODE_TOLERANCES[0]``.
+    :type rtol: float, optional
+    :param atol: Absolute tolerance of the integration, defaults to ``DEFAULT_ODE_TOLERANCES[1]``.
+    :type atol: float, optional
+    :raises RuntimeError: If an error occurrs while solving the initial value problem.
+    :return: The solution object returned by ``solve_ivp``.
+    :rtype: Any
+    """
+    try:
+        sol = solve_ivp(
+            fun=ode_func,
+            t_span=[t_data[0], t_data[-1]],
+            y0=initial_state,
+            method=method,
+            t_eval=t_data,
+            args=(*consts,),
+            rtol=rtol,
+            atol=atol,
+            **({"jac": jac} if jac is not None else {})
+        )
+    except ValueError as ve:
+        logger.error(
+            f"Value Error occurred in solve_ivp. Message:\n"
+            f"  {ve}"
+            f"  List of values for the call:\n"
+            f"  {ode_func=}, span={t_data[0]=}, {t_data[-1]}, {initial_state=}, t_eval={t_data}, args={consts}"
+        )
+        logger.debug(f"Trying again with altered initial value y0 *= 0.1.")
+        try:
+            sol = solve_ivp(
+                fun=ode_func,
+                t_span=[t_data[0], t_data[-1]],
+                y0=np.multiply(initial_state, 0.1),
+                method=method,
+                t_eval=t_data,
+                args=(*consts,),
+                rtol=rtol,
+                atol=atol,
+                **({"jac": jac} if jac is not None else {})
+            )
+        except Exception as e:
+            raise RuntimeError("Error in solving initial value problem.") from e
+    except RuntimeError as re:
+        logger.error(
+            f"Encountered a runtime error while solving initial value problem. See:\n"
+            f"  {re}"
+        )
+        raise
+    return sol
+
+
+def _fit_reg(
+    model: VPCModel,
+    data: list[list[int | float]],
+    options: FitOptions | None = None
+) -> None:
     """Fit a model that is not represented by an ordinary differential equation (ODE) to provided data.
 
     This function sets the internal parameters of the model to reflect the fit.
@@ -143,11 +1648,94 @@ def _fit_reg(model: VPCModel, data: list[list[int | float]]) -> None:
     :type model: VPCModel
     :param data: The provided data to which the model is fitted.
     :type data: list[list[int  |  float]]
+    :param options: Settings for the fit, defaults to None, i.e. ``FitOptions()``.
+    :type options: FitOptions | None, optional
     :return: Tuple consisting of a callable function, as well as values\
     for the independent variable and their resulting data, taken from the provided input data
     :rtype: None
     """
     num_indep_vars = len(model.independent_var)
+    formatted_function, running_var_vals, model_res_vals = _regression_arrays(model, data)
+    num_points = len(running_var_vals[0])
+
+    options = options or FitOptions()
+    # residuals of every component are divided by the magnitude of its data column
+    sigma = np.ones(model_res_vals.shape)
+    if options.scale_data:
+        sigma = np.repeat(FileHandler.column_scales(data[num_indep_vars:]), num_points)
+
+    if options.linear_solve and model.is_linear_in_constants():
+        _fit_linear(model, formatted_function, running_var_vals, model_res_vals, sigma)
+        return
+    initial_guess = _initial_guess(model, data, options)
+    scales = _constant_scales(initial_guess, options)
+    # the dense projection would give up the sparsity, so sparse models skip variable projection
+    if (options.sparse_jacobian and model.components >= SPARSE_JACOBIAN_MIN_COMPONENTS
+            and model.constants_dependency.mean() <= SPARSE_JACOBIAN_DENSITY):
+        _fit_sparse(
+            model, formatted_function, running_var_vals, model_res_vals, sigma, options, initial_guess, scales
+        )
+        return
+
+    if options.variable_projection and model.linear_constants and model.nonlinear_constants:
+        _fit_variable_projection(
+            model, formatted_function, running_var_vals, model_res_vals, sigma, options, initial_guess, scales
+        )
+        return
+
+    # curve_fit works on the constants divided by their scales
+    scaled_function = lambda indep, *args: formatted_function(indep, *(np.asarray(args) * scales))
+    jacobian_function: Callable[..., Any] | None = None
+    if options.analytic_jacobian:
+        jacobian_function = lambda indep, *args: _stack_constants_jacobian(
+            model.constants_jacobian(*indep, *(np.asarray(args) * scales)), num_points
+        ) * scales
+
+    try:
+        popt, pcov, infodict, mesg, _ = curve_fit(
+            f=scaled_function,
+            xdata=running_var_vals,
+            ydata=model_res_vals,
+            p0=initial_guess / scales,
+            sigma=sigma if options.scale_data else None,
+            jac=jacobian_function,
+            full_output=True
+        )
+        fit_info = {
+            "optimizer": "curve_fit",
+            "initial_guess": initial_guess,
+            "constant_scales": scales.tolist(),
+            "analytic_jacobian": options.analytic_jacobian,
+            "nfev": infodict["nfev"],
+            "njev": infodict.get("njev"),
+            "cost": 0.5 * np.sum(infodict["fvec"]**2),
+            "message": mesg,
+        }
+        fitted_consts = dict(zip(model.constants, popt))
+        model.set_fit_information(fitted_consts, covariance=pcov, fit_info=fit_info, scales=scales)
+    except ValueError as ve:
+        logger.error("Value error in curve fitting regular function.")
+        raise RuntimeError("Value error in curve_fit.") from ve
+    except RuntimeError as re:
+        logger.error("Runtime error in curve fitting regular function.")
+        raise
+
+
+def _regression_arrays(
+    model: VPCModel,
+    data: list[list[int | float]]
+) -> tuple[Callable[..., Any], tuple[npt.NDArray, ...], npt.NDArray]:
+    """Arrange the data of a regression model for the optimizers.
+
+    :param model: The model that is to be fitted.
+    :type model: VPCModel
+    :param data: The provided data to which the model is fitted.
+    :type data: list[list[int  |  float]]
+    :return: The model function returning the raveled output of all components, the values of\
+    the independent variables and the raveled data of all components, component-major.
+    :rtype: tuple[Callable[..., Any], tuple[npt.NDArray, ...], npt.NDArray]
+    """
+    num_indep_vars = len(model.independent_var)
     if check_model_is_valid_vector(model, len(data)):
         # assumption: first col for independent var, rest for results for components in order
         formatted_function = lambda indep, *args: np.ravel(model.model_function(*indep, *args))
@@ -158,22 +1746,323 @@ def _fit_reg(model: VPCModel, data: list[list[int | float]]) -> None:
         model_res_vals = np.array(data[num_indep_vars])
 
     running_var_vals = tuple(np.array(data[i]) for i in range(num_indep_vars))
+    return formatted_function, running_var_vals, model_res_vals
+
+
+def _initial_guess(model: VPCModel, data: list[list[int | float]], options: FitOptions) -> list[float]:
+    """Determine the starting values of the constants according to ``options.initial_guess``.
+
+    :param model: The model that is to be fitted.
+    :type model: VPCModel
+    :param data: The provided data to which the model is fitted.
+    :type data: list[list[int  |  float]]
+    :param options: Settings for the fit.
+    :type options: FitOptions
+    :raises ValueError: If ``options.initial_guess`` is an unknown string or doesn't have one\
+    value per constant.
+    :return: The starting values in the order of ``model.constants``.
+    :rtype: list[float]
+    """
+    if isinstance(options.initial_guess, str):
+        if options.initial_guess == "data":
+            return InitialGuess.initial_guess(model, data)
+        if options.initial_guess == "ones":
+            return [1.0] * len(model.constants)
+        raise ValueError(f"Unknown initial guess '{options.initial_guess}'.")
+    if len(options.initial_guess) != len(model.constants):
+        raise ValueError("The initial guess needs one value per constant.")
+    return [float(value) for value in options.initial_guess]
+
+
+def _constant_scales(initial_guess: Sequence[float], options: FitOptions) -> npt.NDArray:
+    """Determine the scales the optimizers divide the constants by, the magnitudes of their
+    initial guess if ``options.scale_constants`` is set.
+
+    :param initial_guess: Starting values of the constants.
+    :type initial_guess: Sequence[float]
+    :param options: Settings for the fit.
+    :type options: FitOptions
+    :return: The scale of every constant, 1 for constants starting at zero.
+    :rtype: npt.NDArray
+    """
+    magnitudes = np.abs(np.asarray(initial_guess, dtype=float))
+    if not options.scale_constants:
+        return np.ones_like(magnitudes)
+    return np.where(magnitudes > 0, magnitudes, 1.0)
+
 
+def _fit_linear(
+    model: VPCModel,
+    formatted_function: Callable[..., Any],
+    running_var_vals: tuple[npt.NDArray, ...],
+    model_res_vals: npt.NDArray,
+    sigma: npt.NDArray
+) -> None:
+    """Fit a model that is linear in its constants by a single linear least-squares solve.
+
+    The design matrix is the constants Jacobian, which doesn't depend on the constants, and the
+    part of the model that is independent of the constants is subtracted from the data.
+
+    :param model: The model that is to be fitted.
+    :type model: VPCModel
+    :param formatted_function: The model function returning the raveled output of all components.
+    :type formatted_function: Callable[..., Any]
+    :param running_var_vals: Values of the independent variables.
+    :type running_var_vals: tuple[npt.NDArray, ...]
+    :param model_res_vals: The raveled data of all components.
+    :type model_res_vals: npt.NDArray
+    :param sigma: The scale every residual is divided by.
+    :type sigma: npt.NDArray
+    :raises RuntimeError: If the linear least-squares problem can't be solved.
+    """
+    num_consts = len(model.constants)
+    num_points = len(running_var_vals[0])
+    design = _stack_constants_jacobian(
+        model.constants_jacobian(*running_var_vals, *np.ones(num_consts)), num_points
+    ) / sigma[:, np.newaxis]
+    offset = np.broadcast_to(formatted_function(running_var_vals, *np.zeros(num_consts)), model_res_vals.shape)
+    target = (model_res_vals - offset) / sigma
     try:
-        popt, pcov = curve_fit(
-            f=formatted_function,
-            xdata=running_var_vals,
-            ydata=model_res_vals,
-            p0=np.ones(len(model.constants))
+        solution, _, rank, _ = np.linalg.lstsq(design, target, rcond=None)
+    except np.linalg.LinAlgError as le:
+        logger.error("Linear algebra error in linear least-squares fit of regular function.")
+        raise RuntimeError("Linear least-squares fit failed.") from le
+
+    residuals = design @ solution - target
+    fit_info = {
+        "optimizer": "lstsq",
+        "nfev": 1,
+        "cost": 0.5 * np.sum(residuals**2),
+        "rank": int(rank),
+        "message": "Solved linear least-squares problem.",
+    }
+    if rank < num_consts:
+        logger.warning("Design matrix is rank deficient, the fitted constants are not unique.")
+    fitted_consts = dict(zip(model.constants, solution))
+    model.set_fit_information(
+        fitted_consts,
+        covariance=_covariance_from_jacobian(design, residuals),
+        fit_info=fit_info
+    )
+
+
+def _fit_variable_projection(
+    model: VPCModel,
+    formatted_function: Callable[..., Any],
+    running_var_vals: tuple[npt.NDArray, ...],
+    model_res_vals: npt.NDArray,
+    sigma: npt.NDArray,
+    options: FitOptions,
+    initial_guess: list[float],
+    scales: npt.NDArray
+) -> None:
+    """Fit a model that is linear in some of its constants by variable projection.
+
+    The optimizer only iterates over the nonlinear constants. For each of their values the
+    linear constants are the solution of a linear least-squares problem, whose design matrix
+    are the columns of the constants Jacobian belonging to the linear constants. The Jacobian of
+    the projected residuals is approximated following Kaufman by projecting the Jacobian with
+    respect to the nonlinear constants onto the orthogonal complement of the design matrix.
+
+    :param model: The model that is to be fitted.
+    :type model: VPCModel
+    :param formatted_function: The model function returning the raveled output of all components.
+    :type formatted_function: Callable[..., Any]
+    :param running_var_vals: Values of the independent variables.
+    :type running_var_vals: tuple[npt.NDArray, ...]
+    :param model_res_vals: The raveled data of all components.
+    :type model_res_vals: npt.NDArray
+    :param sigma: The scale every residual is divided by.
+    :type sigma: npt.NDArray
+    :param options: Settings for the fit.
+    :type options: FitOptions
+    :param initial_guess: Starting values of all constants, of which only the nonlinear ones are\
+    used.
+    :type initial_guess: list[float]
+    :param scales: Scales of all constants, the optimizer works on the nonlinear constants divided\
+    by theirs.
+    :type scales: npt.NDArray
+    :raises RuntimeError: If the optimization fails.
+    """
+    num_points = len(running_var_vals[0])
+    linear = [model.constants.index(c) for c in model.linear_constants]
+    nonlinear = [model.constants.index(c) for c in model.nonlinear_constants]
+    nonlinear_scales = scales[nonlinear]
+
+    def all_consts(nonlinear_consts: Sequence[float], linear_consts: Sequence[float]) -> npt.NDArray:
+        consts = np.zeros(len(model.constants))
+        consts[nonlinear] = nonlinear_consts
+        consts[linear] = linear_consts
+        return consts
+
+    def project(nonlinear_consts: Sequence[float]) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+        """Solve for the linear constants given the nonlinear ones.
+
+        :param nonlinear_consts: Values of the nonlinear constants.
+        :type nonlinear_consts: Sequence[float]
+        :return: Tuple of all constants, the residuals and the design matrix.
+        :rtype: tuple[npt.NDArray, npt.NDArray, npt.NDArray]
+        """
+        consts = all_consts(nonlinear_consts, np.zeros(len(linear)))
+        full_jac = _stack_constants_jacobian(model.constants_jacobian(*running_var_vals, *consts), num_points)
+        design = full_jac[:, linear] / sigma[:, np.newaxis]
+        offset = np.broadcast_to(formatted_function(running_var_vals, *consts), model_res_vals.shape)
+        target = (model_res_vals - offset) / sigma
+        linear_consts = np.linalg.lstsq(design, target, rcond=None)[0]
+        consts[linear] = linear_consts
+        return consts, design @ linear_consts - target, design
+
+    # least_squares works on the nonlinear constants divided by their scales
+    def residuals(scaled_consts: npt.NDArray) -> npt.NDArray:
+        return project(scaled_consts * nonlinear_scales)[1]
+
+    def jacobian(scaled_consts: npt.NDArray) -> npt.NDArray:
+        consts, _, design = project(scaled_consts * nonlinear_scales)
+        full_jac = _stack_constants_jacobian(model.constants_jacobian(*running_var_vals, *consts), num_points)
+        nonlinear_jac = full_jac[:, nonlinear] / sigma[:, np.newaxis]
+        return (nonlinear_jac - design @ np.linalg.lstsq(design, nonlinear_jac, rcond=None)[0]) * nonlinear_scales
+
+    try:
+        result = least_squares(
+            residuals,
+            np.array([initial_guess[i] for i in nonlinear]) / nonlinear_scales,
+            jac=jacobian if options.analytic_jacobian else "2-point",
+            method="trf"
+        )
+        consts, fvec, _ = project(result.x * nonlinear_scales)
+        full_jac = _stack_constants_jacobian(
+            model.constants_jacobian(*running_var_vals, *consts), num_points
+        ) / sigma[:, np.newaxis]
+    except (ValueError, np.linalg.LinAlgError) as ve:
+        logger.error("Value error in variable projection fit of regular function.")
+        raise RuntimeError("Value error in variable projection fit.") from ve
+
+    fit_info = {
+        "optimizer": "variable_projection",
+        "initial_guess": initial_guess,
+        "constant_scales": scales.tolist(),
+        "linear_constants": model.linear_constants,
+        "nonlinear_constants": model.nonlinear_constants,
+        "nfev": result.nfev,
+        "njev": result.njev,
+        "cost": 0.5 * np.sum(fvec**2),
+        "success": result.success,
+        "message": result.message,
+    }
+    fitted_consts = dict(zip(model.constants, consts))
+    model.set_fit_information(
+        fitted_consts,
+        covariance=_covariance_from_jacobian(full_jac, fvec),
+        fit_info=fit_info
+    )
+
+
+def _fit_sparse(
+    model: VPCModel,
+    formatted_function: Callable[..., Any],
+    running_var_vals: tuple[npt.NDArray, ...],
+    model_res_vals: npt.NDArray,
+    sigma: npt.NDArray,
+    options: FitOptions,
+    initial_guess: list[float],
+    scales: npt.NDArray
+) -> None:
+    """Fit a vector model whose constants only affect some of its components with a sparse
+    Jacobian, following the dependency pattern of ``VPCModel.constants_dependency``.
+
+    The analytic Jacobian only evaluates the nonzero blocks, otherwise the pattern is passed to
+    the optimizer as ``jac_sparsity``, so that constants that don't share a component are probed
+    by the same finite-difference evaluation.
+
+    :param model: The model that is to be fitted.
+    :type model: VPCModel
+    :param formatted_function: The model function returning the raveled output of all components.
+    :type formatted_function: Callable[..., Any]
+    :param running_var_vals: Values of the independent variables.
+    :type running_var_vals: tuple[npt.NDArray, ...]
+    :param model_res_vals: The raveled data of all components.
+    :type model_res_vals: npt.NDArray
+    :param sigma: The scale every residual is divided by.
+    :type sigma: npt.NDArray
+    :param options: Settings for the fit.
+    :type options: FitOptions
+    :param initial_guess: Starting values of the constants.
+    :type initial_guess: list[float]
+    :param scales: Scales the optimizer divides the constants by.
+    :type scales: npt.NDArray
+    :raises RuntimeError: If the optimization fails.
+    """
+    num_points = len(running_var_vals[0])
+    dependency = model.constants_dependency
+    blocks = np.argwhere(dependency)
+    # row and column index of every nonzero entry, component-major like the residuals
+    rows = (blocks[:, 0, np.newaxis] * num_points + np.arange(num_points)).ravel()
+    cols = np.repeat(blocks[:, 1], num_points)
+    shape = (model_res_vals.size, len(model.constants))
+
+    # the optimizer works on the constants divided by their scales
+    def residuals(scaled_consts: npt.NDArray) -> npt.NDArray:
+        return (formatted_function(running_var_vals, *(scaled_consts * scales)) - model_res_vals) / sigma
+
+    def jacobian(scaled_consts: npt.NDArray) -> sparse.csr_matrix:
+        entries = model.constants_jacobian(*running_var_vals, *(scaled_consts * scales))
+        values = np.concatenate([
+            np.broadcast_to(np.asarray(entries[i][j], dtype=float), num_points) for i, j in blocks
+        ])
+        return sparse.csr_matrix((values * scales[cols] / sigma[rows], (rows, cols)), shape=shape)
+
+    jac_kwargs: dict[str, Any] = {"jac": jacobian}
+    if not options.analytic_jacobian:
+        jac_kwargs = {"jac": "2-point", "jac_sparsity": sparse.csr_matrix((np.ones(rows.size), (rows, cols)), shape=shape)}
+
+    try:
+        result = least_squares(
+            residuals,
+            np.asarray(initial_guess) / scales,
+            method="trf",
+            **jac_kwargs
         )
-        fitted_consts = dict(zip(model.constants, popt))
-        model.set_fit_information(fitted_consts)
     except ValueError as ve:
-        logger.error("Value error in curve fitting regular function.")
-        raise RuntimeError("Value error in curve_fit.") from ve
-    except RuntimeError as re:
-        logger.error("Runtime error in curve fitting regular function.")
-        raise
+        logger.error("Value error in sparse fit of regular function.")
+        raise RuntimeError("Value error in sparse least-squares fit.") from ve
+
+    fit_info = {
+        "optimizer": "least_squares",
+        "initial_guess": initial_guess,
+        "constant_scales": scales.tolist(),
+        "analytic_jacobian": options.analytic_jacobian,
+        "jacobian_density": float(dependency.mean()),
+        "nfev": result.nfev,
+        "njev": result.njev,
+        "cost": result.cost,
+        "success": result.success,
+        "message": result.message,
+    }
+    fitted_consts = dict(zip(model.constants, result.x))
+    model.set_fit_information(
+        fitted_consts,
+        covariance=_covariance_from_jacobian(result.jac, result.fun),
+        fit_info=fit_info,
+        scales=scales
+    )
+
+
+def _stack_constants_jacobian(entries: list[list[Any]], num_points: int) -> npt.NDArray:
+    """Arrange the output of ``VPCModel.constants_jacobian`` like the raveled model output.
+
+    :param entries: Derivatives of each component with respect to each constant, each a scalar\
+    or an array with one value per data point.
+    :type entries: list[list[Any]]
+    :param num_points: The number of data points.
+    :type num_points: int
+    :return: Matrix with a row per component and data point, component-major, and a column per\
+    constant.
+    :rtype: npt.NDArray
+    """
+    return np.vstack([
+        np.column_stack([np.broadcast_to(np.asarray(entry, dtype=float), num_points) for entry in row])
+        for row in entries
+    ])
 
 
 def check_model_is_valid_vector(model: VPCModel, columns: int) -> bool:
@@ -199,6 +2088,76 @@ def check_model_is_valid_vector(model: VPCModel, columns: int) -> bool:
     return model.is_vector()
 
 
+def _covariance_from_jacobian(jac: npt.NDArray | sparse.spmatrix, residuals: npt.NDArray) -> npt.NDArray:
+    """Estimate the covariance matrix of fitted constants from the Jacobian of the residuals.
+
+    Uses the same approach as ``scipy.optimize.curve_fit``, i.e. the Moore-Penrose inverse of
+    ``J^T J`` scaled by the residual variance. For a sparse Jacobian the singular values are
+    obtained from ``J^T J`` instead of ``J``, so it is never converted to a dense matrix.
+
+    :param jac: Jacobian of the residual vector with respect to the constants at the optimum.
+    :type jac: npt.NDArray | sparse.spmatrix
+    :param residuals: Residual vector at the optimum.
+    :type residuals: npt.NDArray
+    :return: Covariance matrix of the constants. Filled with ``inf`` if it can't be estimated.
+    :rtype: npt.NDArray
+    """
+    if sparse.issparse(jac):
+        return _covariance_from_normal_matrix((jac.T @ jac).toarray(), np.sum(residuals**2), jac.shape[0])
+    _, s, vt = np.linalg.svd(jac, full_matrices=False)
+    return _pseudo_inverse_covariance(s, vt, np.sum(residuals**2), jac.shape[0])
+
+
+def _covariance_from_normal_matrix(normal: npt.NDArray, residual_sum: float, num_res: int) -> npt.NDArray:
+    """Estimate the covariance matrix of fitted constants from the matrix ``J^T J`` of the
+    normal equations, like ``_covariance_from_jacobian``, for when ``J`` isn't available as a
+    dense matrix. The singular values of ``J`` are the square roots of the eigenvalues.
+
+    :param normal: The matrix ``J^T J`` at the optimum.
+    :type normal: npt.NDArray
+    :param residual_sum: Sum of the squared residuals at the optimum.
+    :type residual_sum: float
+    :param num_res: Number of residuals.
+    :type num_res: int
+    :return: Covariance matrix of the constants. Filled with ``inf`` if it can't be estimated.
+    :rtype: npt.NDArray
+    """
+    eigenvalues, v = np.linalg.eigh(normal)
+    order = np.argsort(eigenvalues)[::-1]
+    return _pseudo_inverse_covariance(
+        np.sqrt(np.clip(eigenvalues[order], 0, None)), v[:, order].T, residual_sum, num_res
+    )
+
+
+def _pseudo_inverse_covariance(s: npt.NDArray, vt: npt.NDArray, residual_sum: float, num_res: int) -> npt.NDArray:
+    """Compute the covariance matrix from the singular value decomposition of the Jacobian.
+
+    :param s: Singular values of the Jacobian in descending order.
+    :type s: npt.NDArray
+    :param vt: Right singular vectors of the Jacobian, one per row.
+    :type vt: npt.NDArray
+    :param residual_sum: Sum of the squared residuals at the optimum.
+    :type residual_sum: float
+    :param num_res: Number of residuals.
+    :type num_res: int
+    :return: Covariance matrix of the constants. Filled with ``inf`` if it can't be estimated.
+    :rtype: npt.NDArray
+    """
+    num_consts = vt.shape[1]
+    threshold = np.finfo(float).eps * max(num_res, num_consts) * (s[0] if s.size else 0.0)
+    keep = s > threshold
+    s = s[keep]
+    vt = vt[keep]
+    pcov = (vt.T / s**2) @ vt
+
+    dof = num_res - num_consts
+    if dof > 0 and keep.all():
+        pcov *= residual_sum / dof
+    else:
+        pcov = np.full((num_consts, num_consts), np.inf)
+    return pcov
+
+
 def evaluate_fit(pcov: npt.NDArray) -> dict[str, float]:
     """Evaluate the goodness of fit based on the covariance matrix.
 
@@ -1,40 +1,442 @@
 # standard library imports
+import hashlib
+import importlib.util
+import inspect
 import logging
-from dataclasses import dataclass
-from re import search, finditer
+import timeit
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
 import re
+from types import ModuleType
+from typing import Any, Sequence
 
 # related third party imports
+import numpy as np
+import numpy.typing as npt
 from sympy import FunctionClass
-from sympy import lambdify, symbols, parse_expr
+from sympy import Derivative, Dummy, Eq, Expr, Function, Integral, Matrix, Subs, Symbol, log
+from sympy import collect, cse, dsolve, expand, expand_log, lambdify, parse_expr, powsimp, solve, srepr, zeros
 
 
 logger = logging.getLogger("VPCModel")
 
+# splits a model string before every comma that starts another equation
+EQUATION_SEPARATOR = re.compile(r",(?=[^,=]*=)")
+# names in an expression, used to order the symbols by their first appearance
+NAME_PATTERN = re.compile(r"\b[a-zA-Z_][a-zA-Z0-9_]*\b")
+# first derivatives like y' on the right-hand side of second-order ODEs
+PRIME_PATTERN = re.compile(r"\b([a-zA-Z]+)'")
+# patterns of a model string that mark it as an ODE of at most second order
+ODE_PATTERNS = (
+    (re.compile(r"\bd\^2([a-zA-Z]+)\/d((?!\1)[a-zA-Z]+)\^2\b"), "Pattern < d^2(a)/d(b)^2 >"),
+    (re.compile(r"\bd([a-zA-Z]+)\/d((?!\1)[a-zA-Z]+)\b"), "Pattern < d(a)/d(b) >"),
+    (re.compile(r"[a-zA-Z]+''"), "Pattern < ()'' >"),
+    (re.compile(r"[a-zA-Z]+'"), "Pattern < ()' >")
+)
+# patterns of the derivatives on the left-hand side of an ODE system and their orders
+ODE_LHS_PATTERNS = (
+    (re.compile(r"([a-zA-Z]+)''"), 2),
+    (re.compile(r"d\*\*2([a-zA-Z]+)\/d([a-zA-Z]+)\*\*2"), 2),
+    (re.compile(r"([a-zA-Z]+)'"), 1),
+    (re.compile(r"d([a-zA-Z]+)\/d([a-zA-Z]+)"), 1)
+)
+# modules the model expressions are lambdified with
+LAMBDIFY_MODULES = ("scipy", "numpy")
+# maximum number of compiled models kept in memory, see cache_info
+MODEL_CACHE_SIZE = 128
+# backends generating the model function, see VPCModel.select_backend, and their optional packages
+BACKENDS = ("numpy", "numexpr", "numba")
+BACKEND_PACKAGES = {"numpy": "numpy", "numexpr": "numexpr", "numba": "numba"}
+# number of data points and repetitions of the self-benchmark of backend "auto"
+BACKEND_BENCHMARK_POINTS = 10_000
+BACKEND_BENCHMARK_REPEATS = 5
+# functions a closed-form solution of an ODE may contain, see VPCModel.closed_form
+CLOSED_FORM_FUNCTIONS = {"exp", "log", "sin", "cos", "tan"}
+
+
+@dataclass
+class _CompiledModel:
+    """Artefacts of compiling a model expression, shared by all models with the same parsed
+    expression, independent variables, lambdify modules and backend. Models loaded from the
+    on-disk cache get the parsed expression of the model that looked them up."""
+    symbols: list[str]
+    derivatives: list[str]
+    components: int
+    model_function: FunctionClass | None = None
+    parsed_expression: Expr | tuple[Expr, ...] | None = None
+    backend_functions: dict[str, FunctionClass | None] = field(default_factory=dict)
+    closed_forms: dict[str, tuple[Expr, Symbol, Symbol] | None] = field(default_factory=dict)
+
+
+class _ModelCache:
+    """Least recently used cache of compiled models, optionally backed by a directory of the
+    generated lambdify source, which is imported again instead of compiling a model.
+
+    :param maxsize: Maximum number of compiled models kept in memory, at least 1.
+    :type maxsize: int
+    """
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize: int = max(1, maxsize)
+        self.directory: Path | None = None
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self.disk_writes: int = 0
+        self._entries: OrderedDict[tuple[Any, ...], _CompiledModel] = OrderedDict()
+
+    def get(self, key: tuple[Any, ...]) -> _CompiledModel | None:
+        """Return the compiled model for ``key`` from memory or disk and count the lookup.
+
+        :param key: The parsed expression, independent variables, lambdify modules and backend.
+        :type key: tuple[Any, ...]
+        :return: The compiled model, None if there is none.
+        :rtype: _CompiledModel | None
+        """
+        compiled = self._entries.get(key)
+        if compiled is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return compiled
+        compiled = self._load(key)
+        if compiled is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._store(key, compiled)
+        return compiled
+
+    def put(self, key: tuple[Any, ...], compiled: _CompiledModel) -> None:
+        """Store a newly compiled model in memory and, if a directory is set, on disk.
+
+        :param key: The parsed expression, independent variables, lambdify modules and backend.
+        :type key: tuple[Any, ...]
+        :param compiled: The compiled model.
+        :type compiled: _CompiledModel
+        """
+        self._store(key, compiled)
+        if self.directory is not None:
+            self._write(key, compiled)
+
+    def clear(self) -> None:
+        """Discard all compiled models in memory and reset the statistics. Files on disk are kept."""
+        self._entries.clear()
+        self.hits = self.disk_hits = self.misses = self.disk_writes = 0
+
+    def info(self) -> dict[str, Any]:
+        """Return statistics about the cache.
+
+        :return: Dictionary with the number of memory hits, disk hits, misses, i.e. models that\
+        were compiled, files written, the current and maximum size and the cache directory.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "disk_writes": self.disk_writes,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "directory": str(self.directory) if self.directory is not None else None,
+        }
+
+    def _store(self, key: tuple[Any, ...], compiled: _CompiledModel) -> None:
+        self._entries[key] = compiled
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: tuple[Any, ...]) -> Path:
+        return self.directory / f"model_{hashlib.sha256(repr(key).encode()).hexdigest()[:32]}.py"
+
+    def _write(self, key: tuple[Any, ...], compiled: _CompiledModel) -> None:
+        """Write the lambdify source of a compiled model as a module, preceded by the imports the
+        generated code needs beyond the namespace of ``LAMBDIFY_MODULES``."""
+        function = compiled.model_function
+        namespace = _lambdify_namespace(key[2])
+        imports = []
+        for name, value in function.__globals__.items():
+            if namespace.get(name) is value:
+                continue
+            if isinstance(value, ModuleType):
+                imports.append(f"import {value.__name__} as {name}")
+            elif callable(value) and hasattr(value, "__module__") and hasattr(value, "__name__"):
+                imports.append(f"from {value.__module__} import {value.__name__} as {name}")
+        metadata = {
+            "key": repr(key),
+            "symbols": compiled.symbols,
+            "derivatives": compiled.derivatives,
+            "components": compiled.components,
+            "function": function.__name__,
+        }
+        source = "\n".join([
+            f"# compiled model of {str(compiled.parsed_expression)!r}, see VPCModel.set_cache_directory",
+            *imports,
+            f"METADATA = {metadata!r}",
+            "",
+            inspect.getsource(function),
+        ])
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._path(key).write_text(source)
+            self.disk_writes += 1
+        except OSError as e:
+            logger.warning(f"Couldn't write compiled model to the cache directory: {e}")
+
+    def _load(self, key: tuple[Any, ...]) -> _CompiledModel | None:
+        """Import the lambdify source of a compiled model from the cache directory, if any."""
+        if self.directory is None or not self._path(key).is_file():
+            return None
+        path = self._path(key)
+        namespace = dict(_lambdify_namespace(key[2]))
+        try:
+            exec(compile(path.read_text(), str(path), "exec"), namespace)
+            metadata = namespace["METADATA"]
+            if metadata["key"] != repr(key):
+                return None
+            return _CompiledModel(
+                symbols=metadata["symbols"],
+                derivatives=metadata["derivatives"],
+                components=metadata["components"],
+                model_function=namespace[metadata["function"]],
+            )
+        except Exception as e:
+            logger.warning(f"Couldn't load compiled model from {path}, compiling it again: {e}")
+            return None
+
+
+@cache
+def _lambdify_namespace(modules: tuple[str, ...]) -> dict[str, Any]:
+    """Return the namespace that functions lambdified with ``modules`` are executed in.
+
+    :param modules: The lambdify modules.
+    :type modules: tuple[str, ...]
+    :return: Dictionary of the names available to the generated code.
+    :rtype: dict[str, Any]
+    """
+    return lambdify([], 0, list(modules)).__globals__
+
+
+def _lambdify(args: list[Any], expression: Any) -> FunctionClass:
+    """Generate the numerical function of a SymPy expression with ``LAMBDIFY_MODULES``.
+
+    Common subexpressions are eliminated across all entries of ``expression`` before code
+    generation, so terms shared by several components, e.g. ``exp(-k*t)``, or by the entries of a
+    Jacobian are only evaluated once per call.
+
+    :param args: The arguments of the function, symbols or lists of symbols.
+    :type args: list[Any]
+    :param expression: The expression, or a (nested) list or matrix of expressions.
+    :type expression: Any
+    :return: The lambdified function.
+    :rtype: FunctionClass
+    """
+    return lambdify(args, expression, list(LAMBDIFY_MODULES), cse=_eliminate_subexpressions)
+
+
+def _eliminate_subexpressions(expression: Any) -> tuple[list[tuple[Symbol, Expr]], Any]:
+    """Common-subexpression elimination for ``lambdify``. Unlike SymPy's ``cse`` it also covers
+    all entries of nested lists, like the rows of the Jacobians returned as nested lists.
+
+    :param expression: The expression, or a (nested) list or matrix of expressions.
+    :type expression: Any
+    :return: Tuple of the replacements and the reduced expression of the same structure.
+    :rtype: tuple[list[tuple[Symbol, Expr]], Any]
+    """
+    if not (isinstance(expression, list) and any(isinstance(entry, list) for entry in expression)):
+        return cse(expression, list=False)
+    rows = [entry if isinstance(entry, list) else [entry] for entry in expression]
+    replacements, reduced = cse([entry for row in rows for entry in row])
+    nested, start = [], 0
+    for entry, row in zip(expression, rows):
+        nested.append(reduced[start:start + len(row)] if isinstance(entry, list) else reduced[start])
+        start += len(row)
+    return replacements, nested
+
+
+def _has_elementary_solution(rhs: Expr, state: Symbol, time: Symbol) -> bool:
+    """Check whether ``y' = rhs`` is a linear ODE ``y' = p*y + q(t)`` with ``q`` polynomial in
+    time or a Bernoulli ODE ``y' = p*y + r*y**n``, with ``p`` and ``r`` independent of time, whose
+    solutions are elementary.
+
+    :param rhs: The right-hand side of the ODE.
+    :type rhs: Expr
+    :param state: The state symbol.
+    :type state: Symbol
+    :param time: The time symbol.
+    :type time: Symbol
+    :return: True if the ODE has one of the forms.
+    :rtype: bool
+    """
+    terms = collect(expand(rhs), state, evaluate=False)
+    powers = {}
+    for power, coefficient in terms.items():
+        if coefficient.has(state):
+            return False
+        if power == 1:
+            powers[0] = coefficient
+        elif power == state:
+            powers[1] = coefficient
+        elif power.is_Pow and power.base == state and power.exp.is_number:
+            powers[power.exp] = coefficient
+        else:
+            return False
+    others = set(powers) - {0, 1}
+    if len(others) > 1 or (others and 0 in powers):
+        return False
+    if any(coefficient.has(time) for power, coefficient in powers.items() if power != 0):
+        return False
+    return 0 not in powers or powers[0].is_polynomial(time)
+
+
+def _unused_name(name: str, names: set[str]) -> str:
+    """Append zeros to ``name`` until it isn't one of ``names``.
+
+    :param name: The preferred name.
+    :type name: str
+    :param names: The names that are taken.
+    :type names: set[str]
+    :return: The first unused name.
+    :rtype: str
+    """
+    while name in names:
+        name += "0"
+    return name
+
+
+_model_cache = _ModelCache(MODEL_CACHE_SIZE)
+
+
+def available_backends() -> list[str]:
+    """Return the backends of ``BACKENDS`` whose packages are installed.
+
+    :return: List of the available backends, always including "numpy".
+    :rtype: list[str]
+    """
+    return [backend for backend in BACKENDS if importlib.util.find_spec(BACKEND_PACKAGES[backend]) is not None]
+
+
+def _numexpr_function(args: list[Symbol], expression: Expr | tuple[Expr, ...]) -> FunctionClass:
+    """Generate a model function that evaluates every component with ``numexpr``, which splits
+    the element-wise evaluation into cache-sized blocks on several threads.
+
+    :param args: The arguments of the function.
+    :type args: list[Symbol]
+    :param expression: The expression, or a tuple with one expression per component.
+    :type expression: Expr | tuple[Expr, ...]
+    :raises ImportError: If numexpr is not installed.
+    :return: The generated function.
+    :rtype: FunctionClass
+    """
+    import numexpr  # noqa: F401
+    if not isinstance(expression, tuple):
+        return lambdify(args, expression, "numexpr")
+    functions = [lambdify(args, component, "numexpr") for component in expression]
+    return lambda *values: tuple(function(*values) for function in functions)
+
+
+def _numba_function(numpy_function: FunctionClass) -> FunctionClass:
+    """JIT-compile the NumPy model function with ``numba``. The kernel is compiled on its first
+    call for the types of the arguments.
+
+    :param numpy_function: The model function generated for the "numpy" backend.
+    :type numpy_function: FunctionClass
+    :raises ImportError: If numba is not installed.
+    :return: The compiled function.
+    :rtype: FunctionClass
+    """
+    import numba
+    return numba.njit(numpy_function)
+
+
+def cache_info() -> dict[str, Any]:
+    """Return statistics about the cache of compiled models, e.g. to confirm that constructing
+    models with the same expression, independent variables and backend skips code generation.
+
+    :return: Dictionary with the number of memory hits, disk hits, misses, i.e. models that were\
+    compiled, files written, the current and maximum size and the cache directory.
+    :rtype: dict[str, Any]
+    """
+    return _model_cache.info()
+
+
+def clear_cache() -> None:
+    """Discard the compiled models kept in memory and reset the cache statistics."""
+    _model_cache.clear()
+
+
+def set_cache_directory(directory: str | Path | None) -> None:
+    """Set the directory of the on-disk cache of compiled models. Newly compiled models are
+    written to it as Python source and models missing from memory are imported from it, so the
+    directory must only contain files written by this cache.
+
+    :param directory: Path to the cache directory, created if needed. None disables the on-disk\
+    cache, which is the default.
+    :type directory: str | Path | None
+    """
+    _model_cache.directory = Path(directory) if directory is not None else None
+
+
 @dataclass
 class VPCModel():
-    """Dataclass to store a model and extract relevant information from it."""
+    """Dataclass to store a model and extract relevant information from it.
+
+    The backend generating the model function is one of ``BACKENDS`` or "auto", which picks the
+    fastest available backend by a self-benchmark, see ``select_backend``. Backends that aren't
+    installed or can't evaluate the expression fall back to "numpy".
+    """
     _model_string: str
     _independent_var: list[str]
+    _backend: str = "numpy"
 
     def __post_init__(self) -> None:
         """Set some internal variables post-initialization of the model.
 
         :raises ValueError: If the model string or independent variables are not provided.
+        :raises ValueError: If the backend is unknown.
         """
+        if self._backend not in (*BACKENDS, "auto"):
+            raise ValueError(f"Unknown backend '{self._backend}'.")
         if self._model_string == "":
             raise ValueError("Can't instantiate VPCModel without a model string.")
         if not self._independent_var:
             raise ValueError("Can't instantiate VPCModel without an independent variable.")
 
         self._expression_string: str = self.cut_off_lhs()
-        self._model_function: FunctionClass = self.model_string_to_function()
-        self._symbols: list[str] = self.extract_symbols(self._independent_var)
-        self._constants: list[str] = [c for c in self._symbols if c not in self._independent_var]
-        self._components: int = self.expression_string.count(",") + 1
+        self._compiled: _CompiledModel = self._compile()
+        self._symbols: list[str] = self._compiled.symbols
+        self._model_function: FunctionClass = self._compiled.model_function
+        self._is_ode: bool | None = None
+        self._ode_state_vars, self._ode_time_var, self._ode_orders = self.parse_ode_lhs()
+        self._constants: list[str] = [
+            c for c in self._symbols
+            if c not in self._independent_var
+            and c not in self._ode_state_vars
+            and c != self._ode_time_var
+        ]
+        self._components: int = self._compiled.components
+        self._backend_name: str = "numpy"
+        if self._backend == "auto":
+            self.select_backend(BACKEND_BENCHMARK_POINTS)
+        elif self._backend != "numpy":
+            self._set_backend(self._backend)
+
+        self._ode_function: FunctionClass | None = None
+        self._sensitivity_function: FunctionClass | None = None
+        self._ode_jacobian: FunctionClass | None = None
+        self._sensitivity_jacobian: FunctionClass | None = None
+        self._constants_jacobian: FunctionClass | None = None
+        self._ode_constants_jacobian: FunctionClass | None = None
+        self._constants_dependency: npt.NDArray | None = None
+        self._log_linear_form: tuple[FunctionClass, list[str]] | None = None
+        self._log_linear_form_checked: bool = False
+        self._linear_constants: list[str] | None = None
 
         self._fitted_consts: dict[str, float] | None = None # {"a": 1.437, "b": 3.25, ...}
         self._resulting_function: str | None = None
+        self._covariance: npt.NDArray | None = None
+        self._fit_info: dict[str, Any] | None = None
 
     @property
     def model_string(self) -> str:
@@ -80,6 +482,30 @@ class VPCModel():
         """
         return self._model_function
 
+    @property
+    def spec(self) -> "ModelSpec":
+        """Property to return the picklable specification of the model, from which worker
+        processes rebuild it, see ``ModelSpec``.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: The model string, independent variables and the backend in use.
+        :rtype: ModelSpec
+        """
+        return ModelSpec(self._model_string, tuple(self._independent_var), self._backend_name)
+
+    @property
+    def backend(self) -> str:
+        """Property to return the backend that generated ``model_function``, which differs from
+        the requested one if that isn't available.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: Name of the backend, one of ``BACKENDS``.
+        :rtype: str
+        """
+        return self._backend_name
+
     @property
     def symbols(self) -> list[str]:
         """Property to return the list of symbols that are in the expression of the class instance.
@@ -113,6 +539,255 @@ class VPCModel():
         """
         return self._components
 
+    @property
+    def ode_state_vars(self) -> list[str]:
+        """Property to return the state variables of the model if it is a system of ODEs,
+        i.e. the variables whose derivatives make up the left-hand side of the model equation.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: List of state variables in the order of the left-hand side, empty if there are none.
+        :rtype: list[str]
+        """
+        return self._ode_state_vars
+
+    @property
+    def ode_time_var(self) -> str | None:
+        """Property to return the variable the ODE system is differentiated by, e.g. ``t``.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: Name of the time variable, None if the model is no system of ODEs.
+        :rtype: str | None
+        """
+        return self._ode_time_var
+
+    @property
+    def ode_orders(self) -> list[int]:
+        """Property to return the order of the derivative of each state variable of the ODE system.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: List of derivative orders in the order of ``ode_state_vars``.
+        :rtype: list[int]
+        """
+        return self._ode_orders
+
+    @property
+    def ode_system_vars(self) -> list[str]:
+        """Property to return the states of the first-order system that is integrated, i.e. the
+        state variables followed by the first derivatives ``y'`` of all second-order states.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: List of the names of all integrated states.
+        :rtype: list[str]
+        """
+        derivatives = [
+            f"{state}'" for state, order in zip(self._ode_state_vars, self._ode_orders) if order == 2
+        ]
+        return self._ode_state_vars + derivatives
+
+    @property
+    def ode_function(self) -> FunctionClass:
+        """Property to return the lambdified right-hand side of the ODE system with the signature
+        ``f(t, y, *constants)`` expected by ``scipy.integrate.solve_ivp``.
+        The function is created on first access.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :raises ValueError: If the model is no system of ODEs.
+        :return: FunctionClass / lambda expression of the ODE system.
+        :rtype: sympy.FunctionClass
+        """
+        if self._ode_function is None:
+            time, states, consts = self._ode_symbols()
+            self._ode_function = _lambdify(
+                [time, states, *consts], self._ode_rhs()
+            )
+        return self._ode_function
+
+    @property
+    def sensitivity_function(self) -> FunctionClass:
+        """Property to return the lambdified right-hand side of the ODE system augmented by its
+        forward sensitivity equations ``S' = df/dy * S + df/dp``.
+
+        The augmented state consists of the ``n`` model states followed by the ``n x (m + q)``
+        sensitivities ``dy_i/dp_j`` in row-major order, ``m`` being the number of constants and
+        ``q`` the number of second-order states. The last ``q`` parameters are the initial first
+        derivatives of the second-order states, which only enter through the initial condition.
+        The function is created on first access.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :raises ValueError: If the model is no system of ODEs.
+        :return: FunctionClass / lambda expression of the augmented ODE system.
+        :rtype: sympy.FunctionClass
+        """
+        if self._sensitivity_function is None:
+            time, states, consts = self._ode_symbols()
+            aug_states, aug_rhs = self._sensitivity_system()
+            self._sensitivity_function = _lambdify(
+                [time, aug_states, *consts], aug_rhs
+            )
+        return self._sensitivity_function
+
+    @property
+    def ode_jacobian(self) -> FunctionClass:
+        """Property to return the lambdified Jacobian ``df/dy`` of the ODE system's right-hand side
+        with respect to its states, with the signature ``jac(t, y, *constants)`` expected by the
+        implicit methods of ``scipy.integrate.solve_ivp``.
+        The function is created on first access.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :raises ValueError: If the model is no system of ODEs.
+        :return: FunctionClass / lambda expression of the state Jacobian.
+        :rtype: sympy.FunctionClass
+        """
+        if self._ode_jacobian is None:
+            time, states, consts = self._ode_symbols()
+            jac = Matrix(self._ode_rhs()).jacobian(states)
+            self._ode_jacobian = _lambdify([time, states, *consts], jac)
+        return self._ode_jacobian
+
+    @property
+    def sensitivity_jacobian(self) -> FunctionClass:
+        """Property to return the lambdified Jacobian of ``sensitivity_function`` with respect to
+        the augmented state, for use with the implicit methods of ``scipy.integrate.solve_ivp``.
+        The function is created on first access.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :raises ValueError: If the model is no system of ODEs.
+        :return: FunctionClass / lambda expression of the augmented state Jacobian.
+        :rtype: sympy.FunctionClass
+        """
+        if self._sensitivity_jacobian is None:
+            time, states, consts = self._ode_symbols()
+            aug_states, aug_rhs = self._sensitivity_system()
+            jac = Matrix(aug_rhs).jacobian(aug_states)
+            self._sensitivity_jacobian = _lambdify(
+                [time, aug_states, *consts], jac
+            )
+        return self._sensitivity_jacobian
+
+    @property
+    def constants_jacobian(self) -> FunctionClass:
+        """Property to return the lambdified Jacobian of the model's components with respect to
+        its constants. It takes the same arguments as ``model_function`` and returns a nested list
+        with one row per component and one entry per constant, each either a scalar or an array
+        shaped like the independent variables.
+        The function is created on first access.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: FunctionClass / lambda expression of the constants Jacobian.
+        :rtype: sympy.FunctionClass
+        """
+        if self._constants_jacobian is None:
+            sympy_vars, _ = self._parse_expression()
+            jac = Matrix(self._component_expressions()).jacobian([Symbol(c) for c in self._constants])
+            self._constants_jacobian = _lambdify(sympy_vars, jac.tolist())
+        return self._constants_jacobian
+
+    @property
+    def constants_dependency(self) -> npt.NDArray:
+        """Property to return which constants each component of the model depends on, i.e. the
+        sparsity pattern of ``constants_jacobian``.
+        The pattern is determined symbolically on first access.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: Boolean matrix with one row per component and one column per constant.
+        :rtype: npt.NDArray
+        """
+        if self._constants_dependency is None:
+            components = self._component_expressions()
+            self._constants_dependency = np.array([
+                [Symbol(c) in component.free_symbols for c in self._constants]
+                for component in components
+            ], dtype=bool).reshape(len(components), len(self._constants))
+        return self._constants_dependency
+
+    @property
+    def ode_constants_jacobian(self) -> FunctionClass:
+        """Property to return the lambdified Jacobian ``df/dp`` of the ODE system's right-hand side
+        with respect to its constants, with the signature ``jac(t, y, *constants)``. It returns a
+        nested list with one row per entry of ``ode_system_vars`` and one entry per constant.
+        The function is created on first access.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :raises ValueError: If the model is no system of ODEs.
+        :return: FunctionClass / lambda expression of the constants Jacobian.
+        :rtype: sympy.FunctionClass
+        """
+        if self._ode_constants_jacobian is None:
+            time, states, consts = self._ode_symbols()
+            jac = Matrix(self._ode_rhs()).jacobian(consts)
+            self._ode_constants_jacobian = _lambdify([time, states, *consts], jac.tolist())
+        return self._ode_constants_jacobian
+
+    @property
+    def log_linear_form(self) -> tuple[FunctionClass, list[str]] | None:
+        """Property to return the log-linearisation of a single component regression model, i.e.
+        ``log(f) = g_0(x) + theta_1 * g_1(x) + ... + theta_m * g_m(x)`` with ``theta_j`` being
+        ``log(c_j)`` for constants that appear as factors, like ``a`` in ``a*exp(-k*t)`` or
+        ``a*x**b``, and ``c_j`` otherwise.
+        The form is determined on first access.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: Tuple of a function of the independent variables returning ``[g_0, ..., g_m]``\
+        with the ``g_j`` in the order of ``constants``, and the constants whose logarithm is\
+        linear, or None if the model can't be log-linearised.
+        :rtype: tuple[sympy.FunctionClass, list[str]] | None
+        """
+        if not self._log_linear_form_checked:
+            self._log_linear_form_checked = True
+            self._log_linear_form = self._log_linearize()
+        return self._log_linear_form
+
+    @property
+    def linear_constants(self) -> list[str]:
+        """Property to return the constants the model is jointly linear in, i.e. the model is of
+        the form ``f_0(x, p) + c_1 * f_1(x, p) + ... + c_k * f_k(x, p)`` with ``c_i`` being the
+        linear constants and ``p`` the remaining, nonlinear ones. If constants only appear as a
+        product, like ``a*b``, the later one in ``constants`` is regarded as linear.
+        The constants are determined symbolically on first access.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: List of linear constants, in the order of ``constants``.
+        :rtype: list[str]
+        """
+        if self._linear_constants is None:
+            consts = [Symbol(c) for c in self._constants]
+            jac = Matrix(self._component_expressions()).jacobian(consts)
+            dependencies = {c: jac[:, j].free_symbols & set(consts) for j, c in enumerate(consts)}
+            linear = [c for c in consts if c not in dependencies[c]]
+            # drop constants whose derivative still depends on other linear constants
+            while True:
+                coupled = next((c for c in linear if dependencies[c] & set(linear)), None)
+                if coupled is None:
+                    break
+                linear.remove(coupled)
+            self._linear_constants = [c.name for c in linear]
+            logger.debug(f"Model determined to be linear in the constants {self._linear_constants}.")
+        return self._linear_constants
+
+    @property
+    def nonlinear_constants(self) -> list[str]:
+        """Property to return the constants that are not in ``linear_constants``.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: List of nonlinear constants, in the order of ``constants``.
+        :rtype: list[str]
+        """
+        return [c for c in self._constants if c not in self.linear_constants]
+
     @property
     def fitted_consts(self) -> dict[str, float]:
         """Property to return the dictionary of fitted constants of the function.
@@ -143,6 +818,35 @@ class VPCModel():
             return ""
         return self._resulting_function
 
+    @property
+    def covariance(self) -> npt.NDArray | None:
+        """Property to return the covariance matrix of the fitted constants.
+        If this value is not set at the time of accessing it through this property,
+        None will be returned.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: Covariance matrix with rows and columns ordered like ``constants``.
+        :rtype: npt.NDArray | None
+        """
+        return self._covariance
+
+    @property
+    def fit_info(self) -> dict[str, Any]:
+        """Property to return the dictionary of information about the last fit, e.g. the optimizer
+        used and its number of function evaluations.
+        If this value is not set at the time of accessing it through this property,
+        an empty dictionary will be returned.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: Dictionary with information about the fitting process.
+        :rtype: dict[str, Any]
+        """
+        if self._fit_info is None:
+            return {}
+        return self._fit_info
+
     # def set_initial_values(self, initial_values: list[float]) -> None:
     #     self.initial_values = initial_values
 
@@ -165,17 +869,34 @@ class VPCModel():
     def set_fit_information(
         self,
         fitted_consts: dict[str, float] | None = None,
-        error: bool = False
+        error: bool = False,
+        covariance: npt.NDArray | None = None,
+        fit_info: dict[str, Any] | None = None,
+        scales: Sequence[float] | None = None
     ) -> None:
         """Set the fitted model information to the model's internal variables.
 
+        If the constants were fitted in scaled form ``c / scale``, the fitted constants and their
+        covariance are transformed back to the original scale of the constants.
+
         :param fitted_consts: The fitted model constants, defaults to None.
         :type fitted_consts: dict[str, float]
         :param error: Indicates if an error occurred during fitting, defaults to False.
         :type error: bool
+        :param covariance: Covariance matrix of the fitted constants, defaults to None.
+        :type covariance: npt.NDArray | None
+        :param fit_info: Information about the fitting process, defaults to None.
+        :type fit_info: dict[str, Any] | None
+        :param scales: Scales of the fitted constants in the order of ``fitted_consts``, defaults\
+        to None, i.e. the constants are not scaled.
+        :type scales: Sequence[float] | None
         """
         if error or fitted_consts is None:
             return
+        if scales is not None:
+            fitted_consts = {c: value * scale for (c, value), scale in zip(fitted_consts.items(), scales)}
+            if covariance is not None:
+                covariance = covariance * np.outer(scales, scales)
 
         res_func = self.model_string
         for constant in fitted_consts:
@@ -188,6 +909,8 @@ class VPCModel():
 
         self._set_fitted_consts(fitted_consts)
         self._set_resulting_function(res_func)
+        self._covariance = covariance
+        self._fit_info = fit_info
 
     def format_eq(self, equation: str) -> str:
         """Replaces some characters for others in a string. Strips leading and trailing spaces.
@@ -199,38 +922,57 @@ class VPCModel():
         """
         return equation.strip().replace("^", "**")
 
+    def split_equations(self) -> list[str]:
+        """Split a model string of several comma-separated equations, e.g.
+        ``x' = -a*x, y' = a*x - b*y``, into the single equations.
+
+        :return: List of the equations, a single element if there is at most one equals sign.
+        :rtype: list[str]
+        """
+        equation = self._model_string
+        if equation.count("=") <= 1:
+            return [equation]
+        return EQUATION_SEPARATOR.split(equation)
+
     def cut_off_lhs(self) -> str:
         """Cuts off the left hand side of an equation, indicated by an equals sign.
         Also strips leading and trailing spaces and replaces some characters if needed.
+        For several equations the right hand sides are joined by commas.
 
         :return: Model equation without left hand side, including the equals sign.
         :rtype: str
         """
-        equation = self._model_string
-        ind = equation.find("=")
-        if ind != -1:
-            return self.format_eq(equation[ind+1:])
-        else:
-            return self.format_eq(equation)
+        sides = []
+        for equation in self.split_equations():
+            ind = equation.find("=")
+            if ind != -1:
+                sides.append(self.format_eq(equation[ind+1:]))
+            else:
+                sides.append(self.format_eq(equation))
+        return ", ".join(sides)
 
     def cut_off_rhs(self) -> str:
         """Cuts off the right hand side of an equation, indicated by an equals sign.
         Also strips leading and trailing spaces and replaces some characters if needed.
+        For several equations the left hand sides are joined by commas.
 
         :return: Model equation without right hand side, including the equals sign.
         :rtype: str
         """
-        equation = self._model_string
-        ind = equation.find("=")
-        if ind != -1:
-            return self.format_eq(equation[:ind])
-        else:
-            return self.format_eq(equation)
+        sides = []
+        for equation in self.split_equations():
+            ind = equation.find("=")
+            if ind != -1:
+                sides.append(self.format_eq(equation[:ind]))
+            else:
+                sides.append(self.format_eq(equation))
+        return ", ".join(sides)
 
     def extract_symbols(self, sorting_prio: list[str] | None = None) -> list[str]:
         """Extract all unique symbols out of the model equations right-hand side.
 
-        Unique symbols are single or multi-character sequences consisting of letters.
+        The symbols are the free symbols of the parsed expression, so names of functions and
+        numbers like ``pi`` are not included, in the order of their first appearance.
         If a sorting prio is given, the characters in it are returned at the front of the output,
         the rest is ordered alphabetically.
 
@@ -239,77 +981,447 @@ class VPCModel():
         :return: All unique symbols in the expression on the right-hand of the equation.
         :rtype: list[str]
         """
-        exclude = [
-            "sin", "cos", "tan",
-            "exp", "log",
-            "sqrt",
-            "pi"
-        ]
-        expression = self._model_string
-
-        if "=" in expression:
-            expression = self.cut_off_lhs()
-
-        seen = set()
-        unique_symbols = []
-
-        for match in finditer(r"\b[a-zA-Z]+\b|\b[a-zA-Z]\b", expression):
-            symbol = match.group()
-            if symbol not in seen:
-                seen.add(symbol)
-                unique_symbols.append(symbol)
+        free_symbols = {
+            symbol.name for component in self._component_expressions() for symbol in component.free_symbols
+        } - set(self._compiled.derivatives)
+        first_appearance: dict[str, int] = {}
+        for match in NAME_PATTERN.finditer(self._expression_string):
+            first_appearance.setdefault(match.group(), len(first_appearance))
+        unique_symbols = sorted(
+            free_symbols, key=lambda symbol: (first_appearance.get(symbol, len(first_appearance)), symbol)
+        )
 
         if sorting_prio:
-            def custom_sort_key(char, prio):
-                if char in prio:
-                    return (0, char)
-                else:
-                    return (1, char)
-
-            unique_symbols.sort(key=lambda c: custom_sort_key(c, sorting_prio))
+            unique_symbols.sort(key=lambda symbol: (symbol not in sorting_prio, symbol))
 
-        return [s for s in unique_symbols if s not in exclude]
+        return unique_symbols
 
     def model_string_to_function(self) -> FunctionClass:
-        """Create a lambda function based on the model equation.
+        """Create a lambda function based on the parsed model expression.
 
-        Extracts all symbols from the expression and converts them to SymPy symbols.
-        Finally lambdifies the expression to return a callable model function.
+        The arguments are the model's symbols followed by derivatives like ``y'`` on the
+        right-hand side of second-order ODEs. Finally lambdifies the expression to return a
+        callable model function.
 
         :return: Lambdified model expression.
         :rtype: FunctionClass
         """
         logger.info(f"Lambdifying expression...")
-        expression: str = self._expression_string
-        logger.debug(f"Expression is: {expression}")
-        sorted_symbols: list[str] = self.extract_symbols(self._independent_var)
-        logger.debug(f"detected symbols in expression: {sorted_symbols}")
-        sympy_vars = symbols(sorted_symbols)
-        parsed_expression = parse_expr(expression)
-        func: FunctionClass = lambdify(sympy_vars, parsed_expression, ["scipy","numpy"])
+        sympy_vars, parsed_expression = self._parse_expression()
+        func: FunctionClass = _lambdify(sympy_vars, parsed_expression)
         logger.info(f"Success.")
         return func
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the model as its specification and fit results, since the lambdified functions
+        can't be pickled. Unpickling rebuilds the functions, from the cache of compiled models of
+        the unpickling process if possible.
+
+        :return: The function restoring the model and its arguments.
+        :rtype: tuple[Any, ...]
+        """
+        fit_state = (self._fitted_consts, self._resulting_function, self._covariance, self._fit_info)
+        return _restore_model, (self.spec, fit_state)
+
+    def select_backend(self, num_points: int) -> dict[str, float]:
+        """Benchmark the model function of every available backend on synthetic data of the given
+        size and switch ``model_function`` to the fastest one.
+
+        :param num_points: Number of data points of the benchmark, e.g. the size of the data the\
+        model is fitted to.
+        :type num_points: int
+        :return: Dictionary with the best time of an evaluation in seconds for every backend that\
+        could evaluate the model.
+        :rtype: dict[str, float]
+        """
+        args = self._sample_arguments(num_points)
+        timings = {}
+        for backend in available_backends():
+            if not self._set_backend(backend):
+                continue
+            function = self._model_function
+            timings[backend] = min(
+                timeit.repeat(lambda: function(*args), number=1, repeat=BACKEND_BENCHMARK_REPEATS)
+            )
+        fastest = min(timings, key=timings.get)
+        logger.debug(f"Backend timings for {num_points} points: {timings}, selected {fastest}.")
+        self._set_backend(fastest)
+        return timings
+
+    def _set_backend(self, backend: str) -> bool:
+        """Switch ``model_function`` to the function generated by the given backend, if it can
+        evaluate the model. Generated functions are shared by all models of the same compiled
+        model.
+
+        :param backend: One of ``BACKENDS``.
+        :type backend: str
+        :return: True if the backend is used, False if it isn't available or failed, in which\
+        case the "numpy" backend is used.
+        :rtype: bool
+        """
+        functions = self._compiled.backend_functions
+        if backend not in functions:
+            functions[backend] = None
+            try:
+                if backend == "numpy":
+                    function = self._compiled.model_function
+                elif backend == "numexpr":
+                    function = _numexpr_function(*self._parse_expression())
+                else:
+                    function = _numba_function(self._compiled.model_function)
+                # compiles kernels and reveals unsupported functions before the function is used
+                function(*self._sample_arguments(2))
+                functions[backend] = function
+            except Exception as e:
+                logger.warning(f"Backend {backend} is not available for this model, using numpy: {e}")
+        function = functions[backend]
+        if function is None:
+            self._model_function, self._backend_name = self._compiled.model_function, "numpy"
+            return False
+        self._model_function, self._backend_name = function, backend
+        return True
+
+    def _sample_arguments(self, num_points: int) -> list[Any]:
+        """Create arguments of ``model_function`` for trying and benchmarking backends, with
+        constants set to one and all other symbols to arrays of ``num_points`` values.
+
+        :param num_points: The number of values of the arrays.
+        :type num_points: int
+        :return: List of the arguments in the order of ``model_function``.
+        :rtype: list[Any]
+        """
+        samples = np.linspace(0.1, 1.0, num_points)
+        return [
+            1.0 if name in self._constants else samples
+            for name in self._symbols + self._compiled.derivatives
+        ]
+
+    def _compile(self) -> _CompiledModel:
+        """Parse the model's expression once and derive the symbols, the number of components
+        and the model function from the parsed tree, or take them from the cache of compiled
+        models, see ``cache_info``.
+
+        :return: The compiled model.
+        :rtype: _CompiledModel
+        """
+        logger.debug(f"Expression is: {self._expression_string}")
+        expression, derivatives = self._replace_primes(self._expression_string)
+        parsed_expression = parse_expr(expression, local_dict=derivatives)
+        # the parsed tree doesn't depend on whitespace or the order of operands
+        key = (srepr(parsed_expression), tuple(self._independent_var), LAMBDIFY_MODULES, self._backend)
+        compiled = _model_cache.get(key)
+        if compiled is not None:
+            if compiled.parsed_expression is None:
+                compiled.parsed_expression = parsed_expression
+            return compiled
+        compiled = _CompiledModel(
+            symbols=[],
+            derivatives=[symbol.name for symbol in derivatives.values()],
+            components=len(parsed_expression) if isinstance(parsed_expression, tuple) else 1,
+            parsed_expression=parsed_expression
+        )
+        self._compiled = compiled
+        compiled.symbols = self.extract_symbols(self._independent_var)
+        logger.debug(f"detected symbols in expression: {compiled.symbols}")
+        compiled.model_function = self.model_string_to_function()
+        _model_cache.put(key, compiled)
+        return compiled
+
+    def _parse_expression(self) -> tuple[list[Symbol], Expr | tuple[Expr, ...]]:
+        """Return the model's expression parsed into SymPy, which is parsed once per compiled model.
+
+        :return: Tuple of the symbols in the order of the model function's arguments, i.e. the\
+        sorted symbols followed by derivatives like ``y'``, and the parsed expression.
+        :rtype: tuple[list[Symbol], Expr | tuple[Expr, ...]]
+        """
+        compiled = self._compiled
+        sympy_vars = [Symbol(name) for name in compiled.symbols + compiled.derivatives]
+        return sympy_vars, compiled.parsed_expression
+
+    def _component_expressions(self) -> list[Expr]:
+        """Return the parsed expression of every component of the model.
+
+        :return: List with one SymPy expression per component.
+        :rtype: list[Expr]
+        """
+        _, parsed_expression = self._parse_expression()
+        if isinstance(parsed_expression, tuple):
+            return list(parsed_expression)
+        return [parsed_expression]
+
+    def parse_ode_lhs(self) -> tuple[list[str], str | None, list[int]]:
+        """Extract the state variables, the time variable and the derivative orders from the
+        left-hand side of the model equation, if it consists only of first or second derivatives
+        like ``y'``, ``dy/dt``, ``y''`` or ``d^2y/dt^2``.
+
+        If the time variable is not given explicitly it is the first independent variable that is
+        not a state variable, or ``t`` if there is none.
+
+        :return: Tuple of the state variables, the time variable and the order of each state's\
+        derivative, ``([], None, [])`` if the left-hand side is not made up of derivatives.
+        :rtype: tuple[list[str], str | None, list[int]]
+        """
+        if "=" not in self._model_string:
+            return [], None, []
+
+        state_vars = []
+        time_var = None
+        orders = []
+        for term in self.cut_off_rhs().replace(" ", "").split(","):
+            for pattern, order in ODE_LHS_PATTERNS:
+                match = pattern.fullmatch(term)
+                if match:
+                    break
+            else:
+                return [], None, []
+            state_vars.append(match.group(1))
+            orders.append(order)
+            if len(match.groups()) > 1:
+                time_var = match.group(2)
+
+        if time_var is None:
+            time_var = next((v for v in self._independent_var if v not in state_vars), "t")
+        return state_vars, time_var, orders
+
+    def has_ode_system(self) -> bool:
+        """Determine whether the model is given as an explicit system of ODEs of at most second
+        order, i.e. ``y' = f(t, y)`` or ``y'' = f(t, y, y')``, which can be integrated directly.
+
+        :return: True if the model is an explicit system of ODEs, False otherwise.
+        :rtype: bool
+        """
+        return bool(self._ode_state_vars)
+
+    def _ode_symbols(self) -> tuple[Symbol, list[Symbol], list[Symbol]]:
+        """Create the SymPy symbols of the time variable, the states of the equivalent first-order
+        system and the constants.
+
+        :raises ValueError: If the model is no system of ODEs.
+        :return: Tuple of the time symbol, list of state symbols and list of constant symbols.
+        :rtype: tuple[Symbol, list[Symbol], list[Symbol]]
+        """
+        if not self.has_ode_system():
+            raise ValueError("Model is not an explicit system of ODEs.")
+        return (
+            Symbol(self._ode_time_var),
+            [Symbol(s) for s in self.ode_system_vars],
+            [Symbol(c) for c in self._constants]
+        )
+
+    def _sensitivity_system(self) -> tuple[list[Symbol], list[Expr]]:
+        """Build the ODE system augmented by its forward sensitivity equations
+        ``S' = df/dy * S + df/dp``, with ``S`` holding the sensitivities ``dy_i/dp_j``. The
+        parameters are the constants followed by the initial first derivatives of the second-order
+        states, for which ``df/dp`` vanishes.
+
+        :raises ValueError: If the model is no system of ODEs.
+        :return: Tuple of the augmented state symbols, i.e. the states followed by the\
+        sensitivities in row-major order, and the augmented right-hand side.
+        :rtype: tuple[list[Symbol], list[Expr]]
+        """
+        _, states, consts = self._ode_symbols()
+        rhs = Matrix(self._ode_rhs())
+        num_velocities = self._ode_orders.count(2)
+        sens = Matrix(len(states), len(consts) + num_velocities, lambda i, j: Dummy(f"s_{i}_{j}"))
+        sens_rhs = rhs.jacobian(states) * sens + rhs.jacobian(consts).row_join(zeros(len(states), num_velocities))
+        return [*states, *sens], [*rhs, *sens_rhs]
+
+    def _replace_primes(self, expression: str) -> tuple[str, dict[str, Symbol]]:
+        """Replace first derivatives like ``y'`` in an expression by placeholder names that SymPy
+        can parse.
+
+        :param expression: The expression in which derivatives are replaced.
+        :type expression: str
+        :return: Tuple of the altered expression and a dictionary mapping the placeholder names\
+        to symbols named like the derivatives, e.g. ``y'``.
+        :rtype: tuple[str, dict[str, Symbol]]
+        """
+        local_dict: dict[str, Symbol] = {}
+
+        def replace(match: re.Match) -> str:
+            name = f"__{match.group(1)}_prime"
+            local_dict[name] = Symbol(f"{match.group(1)}'")
+            return name
+
+        return PRIME_PATTERN.sub(replace, expression), local_dict
+
+    def _ode_rhs(self) -> list[Expr]:
+        """Parse the right-hand side of the ODE system into the right-hand side of the equivalent
+        first-order system, with one SymPy expression per entry of ``ode_system_vars``.
+
+        Second-order equations ``y'' = f(t, y, y')`` are rewritten as ``y' = v, v' = f(t, y, v)``
+        with ``v`` being the symbol ``y'``.
+
+        :raises ValueError: If the number of right-hand side components doesn't match the number\
+        of state variables.
+        :return: List of the parsed right-hand side components.
+        :rtype: list[Expr]
+        """
+        rhs = self._component_expressions()
+        if len(rhs) != len(self._ode_state_vars):
+            raise ValueError("Each state variable of the ODE system needs its own right-hand side.")
+
+        first_order_rhs = [
+            expr if order == 1 else Symbol(f"{state}'")
+            for state, expr, order in zip(self._ode_state_vars, rhs, self._ode_orders)
+        ]
+        second_order_rhs = [expr for expr, order in zip(rhs, self._ode_orders) if order == 2]
+        return first_order_rhs + second_order_rhs
+
     def is_ode(self) -> bool:
         """Determines whether the model is an ODE of at most 2nd order.
+        The model string is only classified on the first call.
 
         :return: True if at most 2nd order ODE, False otherwise.
         :rtype: bool
         """
-        patterns = [
-            (re.compile(r"\bd\^2([a-zA-Z]+)\/d((?!\1)[a-zA-Z]+)\^2\b"), "Pattern < d^2(a)/d(b)^2 >"),
-            (re.compile(r"\bd([a-zA-Z]+)\/d((?!\1)[a-zA-Z]+)\b"), "Pattern < d(a)/d(b) >"),
-            (re.compile(r"[a-zA-Z]+''"), "Pattern < ()'' >"),
-            (re.compile(r"[a-zA-Z]+'"), "Pattern < ()' >")
-        ]
+        if self._is_ode is None:
+            self._is_ode = False
+            for pattern, pattern_name in ODE_PATTERNS:
+                if pattern.search(self._model_string):
+                    logger.debug(f"Match found with {pattern_name}, function determined to be an ODE.")
+                    self._is_ode = True
+                    break
+            else:
+                logger.debug("No match found, function determined to not be an ODE.")
+        return self._is_ode
 
-        for pattern, pattern_name in patterns:
-            match = search(pattern=pattern, string=self._model_string)
-            if match:
-                logger.debug(f"Match found with {pattern_name}, function determined to be an ODE.")
-                return True
-        logger.debug("No match found, function determined to not be an ODE.")
-        return False
+    @property
+    def closed_form(self) -> tuple[str, str, str] | None:
+        """Property to return the closed-form solution of a scalar first-order ODE as an
+        expression string in the time variable, the constants and two symbols for the initial
+        condition ``y(t0) = y0``, so that the solution of one equation is the same model for every
+        initial condition.
+
+        Only linear equations with constant coefficient of the state and a polynomial in time as
+        inhomogeneity, e.g. ``y' = -k*y + a``, and Bernoulli equations with constant coefficients,
+        e.g. ``y' = r*y*(1 - y/K)``, are solved symbolically, since their solutions are elementary,
+        while SymPy can spend seconds on integrals without one. The symbolic solution is computed
+        on first access and shared by all models of the same equation.
+
+        A property without an accompanying setter is used to prohibit setting this value.
+
+        :return: Tuple of the expression string of the solution and the names of the symbols of\
+        the initial time and value, or None if there is no closed form that only uses functions\
+        known to the model parser.
+        :rtype: tuple[str, str, str] | None
+        """
+        solution = self._closed_form_solution()
+        if solution is None:
+            return None
+        expression, t0, y0 = solution
+        return str(expression), t0.name, y0.name
+
+    def closed_form_string(self, initial_time: float, initial_value: float) -> str | None:
+        """Return the closed-form solution of a scalar first-order ODE, see ``closed_form``, for
+        the initial condition ``y(initial_time) = initial_value``.
+
+        :param initial_time: Time of the initial condition.
+        :type initial_time: float
+        :param initial_value: Value of the state at ``initial_time``.
+        :type initial_value: float
+        :return: Expression string of the solution, or None if there is no closed form.
+        :rtype: str | None
+        """
+        solution = self._closed_form_solution()
+        if solution is None:
+            return None
+        expression, t0, y0 = solution
+        return str(powsimp(expand(expression.subs({t0: float(initial_time), y0: float(initial_value)}))))
+
+    def _closed_form_solution(self) -> tuple[Expr, Symbol, Symbol] | None:
+        """Return the symbolic closed-form solution of the model from the compiled model, which
+        caches it per equation, since models of different states can share their right-hand side.
+
+        :return: Tuple of the solution and the symbols of the initial time and value, or None.
+        :rtype: tuple[Expr, Symbol, Symbol] | None
+        """
+        closed_forms = self._compiled.closed_forms
+        if self.model_string not in closed_forms:
+            closed_forms[self.model_string] = self._solve_ode_symbolically()
+        return closed_forms[self.model_string]
+
+    def _solve_ode_symbolically(self) -> tuple[Expr, Symbol, Symbol] | None:
+        """Solve a scalar first-order ODE symbolically with SymPy's ``dsolve``.
+
+        :return: Tuple of the solution and the symbols of the initial time and value, or None if\
+        the model is no scalar first-order linear or Bernoulli ODE of the forms in ``closed_form``.
+        :rtype: tuple[Expr, Symbol, Symbol] | None
+        """
+        if self._ode_orders != [1]:
+            return None
+        time, (state,), consts = self._ode_symbols()
+        rhs = self._ode_rhs()[0]
+        if not _has_elementary_solution(rhs, state, time):
+            logger.debug("ODE is not of a form with an elementary closed-form solution.")
+            return None
+        # nonzero constants keep dsolve from splitting the solution into Piecewise cases
+        nonzero_consts = {c: Symbol(c.name, nonzero=True) for c in consts}
+        y = Function(state.name)
+        names = {*self._symbols, *self._independent_var}
+        t0, y0 = (Symbol(_unused_name(f"{name}0", names)) for name in (time.name, state.name))
+        equation = Eq(y(time).diff(time), rhs.subs(nonzero_consts).subs(state, y(time)))
+        for hint in ("1st_linear", "Bernoulli"):
+            try:
+                general_solution = dsolve(equation, y(time), hint=hint)
+            except (ValueError, NotImplementedError):
+                continue
+            if isinstance(general_solution, list) or general_solution.has(Integral):
+                continue
+            integration_consts = general_solution.rhs.free_symbols - {time, *nonzero_consts.values()}
+            if len(integration_consts) != 1:
+                continue
+            integration_const = integration_consts.pop()
+            initial_const = solve(Eq(general_solution.rhs.subs(time, t0), y0), integration_const)
+            if len(initial_const) != 1:
+                continue
+            solution = general_solution.rhs.subs(integration_const, initial_const[0])
+            solution = solution.subs({v: c for c, v in nonzero_consts.items()})
+            if (solution.free_symbols <= {time, t0, y0, *consts}
+                    and not solution.has(Integral, Derivative, Subs)
+                    and all(f.func.__name__ in CLOSED_FORM_FUNCTIONS for f in solution.atoms(Function))):
+                logger.debug(f"Found closed-form solution {solution} with hint {hint}.")
+                return solution, t0, y0
+        logger.debug("No closed-form solution found for the ODE.")
+        return None
+
+    def _log_linearize(self) -> tuple[FunctionClass, list[str]] | None:
+        """Try to rewrite the logarithm of the model as a linear function of the constants or
+        their logarithms, see ``log_linear_form``.
+
+        :return: Tuple of the lambdified ``[g_0, ..., g_m]`` and the log-transformed constants, or\
+        None if the model is an ODE, a vector or not log-linear.
+        :rtype: tuple[FunctionClass, list[str]] | None
+        """
+        if self.is_ode() or self._components != 1 or not self._constants:
+            return None
+        _, parsed_expression = self._parse_expression()
+        # positive symbols allow expanding the logarithm of products and powers
+        positive = {s: Symbol(s.name, positive=True) for s in parsed_expression.free_symbols}
+        consts = [positive.get(Symbol(c), Symbol(c, positive=True)) for c in self._constants]
+        log_expression = expand_log(log(parsed_expression.subs(positive)), force=True)
+        log_consts = {c: Dummy(f"log_{c.name}") for c in consts if log_expression.has(log(c))}
+        log_expression = log_expression.subs({log(c): d for c, d in log_consts.items()})
+        thetas = [log_consts.get(c, c) for c in consts]
+        jac = Matrix([log_expression]).jacobian(thetas)
+        if jac.free_symbols & {*consts, *log_consts.values()}:
+            return None
+        offset = log_expression.subs({theta: 0 for theta in thetas})
+        if offset.free_symbols & set(consts):
+            return None
+        indep = [positive.get(Symbol(v), Symbol(v, positive=True)) for v in self._independent_var]
+        func = _lambdify(indep, [offset, *jac])
+        logger.debug(f"Model log-linearised to {log_expression}.")
+        return func, [c.name for c in log_consts]
+
+    def is_linear_in_constants(self) -> bool:
+        """Determine whether every component of the model is linear in the constants, i.e. of the
+        form ``f_0(x) + c_1 * f_1(x) + ... + c_m * f_m(x)``.
+
+        :return: True if the model is linear in its constants, False otherwise.
+        :rtype: bool
+        """
+        return bool(self._constants) and len(self.linear_constants) == len(self._constants)
 
     def is_vector(self) -> bool:
         """Determine whether the function is a vector based on the number of its components.
@@ -320,4 +1432,45 @@ class VPCModel():
         """
         if self.components < 1:
             raise Exception("Model components are unexpectedly less than 1.")
-        return self.components > 1
\ No newline at end of file
+        return self.components > 1
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """Lightweight, picklable specification of a ``VPCModel`` that can be sent to worker
+    processes. Workers rebuild the model with ``to_model``, which compiles it only once per
+    process thanks to the cache of compiled models, see ``cache_info``.
+
+    :param model_string: The model string as passed to ``VPCModel``, before formatting.
+    :type model_string: str
+    :param independent_var: The independent variables of the model.
+    :type independent_var: tuple[str, ...]
+    :param backend: The backend generating the model function, defaults to "numpy".
+    :type backend: str, optional
+    """
+    model_string: str
+    independent_var: tuple[str, ...]
+    backend: str = "numpy"
+
+    def to_model(self) -> VPCModel:
+        """Build the model of the specification.
+
+        :return: A new model without fit results.
+        :rtype: VPCModel
+        """
+        return VPCModel(self.model_string, list(self.independent_var), self.backend)
+
+
+def _restore_model(spec: ModelSpec, fit_state: tuple[Any, ...]) -> VPCModel:
+    """Restore a pickled model, see ``VPCModel.__reduce__``.
+
+    :param spec: The specification of the model.
+    :type spec: ModelSpec
+    :param fit_state: The fitted constants, resulting function, covariance and fit information.
+    :type fit_state: tuple[Any, ...]
+    :return: The restored model.
+    :rtype: VPCModel
+    """
+    model = spec.to_model()
+    model._fitted_consts, model._resulting_function, model._covariance, model._fit_info = fit_state
+    return model
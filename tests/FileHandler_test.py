@@ -43,6 +43,23 @@ def test_read_file_invalid_file(tmp_path):
     with pytest.raises(FileNotFoundError):
         read_file(file_path)
 
+# Test cases for read_file_chunks function
+def test_read_file_chunks(temp_file_path_csv, temp_file_path_xlsx):
+    data_frame = pd.DataFrame({"A": range(5), "B": range(5, 10)})
+    data_frame.to_csv(temp_file_path_csv, index=False)
+    data_frame.to_excel(temp_file_path_xlsx, index=False)
+    for file_path in (temp_file_path_csv, temp_file_path_xlsx):
+        chunks = list(read_file_chunks(file_path, 2))
+        assert [len(chunk[0]) for chunk in chunks] == [2, 2, 1]
+        assert chunks[2] == [[4], [9]]
+
+def test_read_file_chunks_invalid(tmp_path, temp_file_path_csv):
+    with pytest.raises(FileNotFoundError):
+        next(read_file_chunks(tmp_path / "test.csv"))
+    pd.DataFrame({"A": [1]}).to_csv(temp_file_path_csv, index=False)
+    with pytest.raises(ValueError):
+        next(read_file_chunks(temp_file_path_csv, 0))
+
 # Test cases for dataframe_tolist function
 def test_dataframe_tolist(temp_dataframe):
     expected = [[1, 2, 3], [4, 5, 6]]
@@ -52,6 +69,15 @@ def test_dataframe_tolist_empty():
     with pytest.raises(ValueError):
         dataframe_tolist(pd.DataFrame())
 
+# Test cases for column_scales function
+def test_column_scales():
+    assert column_scales([[1, -4, 2], [0.5, 0.25], [0, 0]]) == [4.0, 0.5, 1.0]
+
+# Test cases for average_replicates function
+def test_average_replicates():
+    data = [[1, 0, 1, 0], [2, 4, 4, 6], [1, 1, 3, 1]]
+    assert average_replicates(data) == [[0.0, 1.0], [5.0, 3.0], [1.0, 2.0]]
+
 # Test cases for write_file function
 def test_write_file_excel(temp_dataframe, tmp_path):
     file_path = tmp_path / "test.xlsx"
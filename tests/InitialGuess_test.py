@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+from src.InitialGuess import initial_guess, _grid
+from src.VPCModel import VPCModel
+
+def test_log_linear_guess():
+    t = np.linspace(0, 10, 20)
+    model = VPCModel("a * exp(-k * t)", ["t"])
+    guess = initial_guess(model, [list(t), list(40 * np.exp(-0.3 * t))])
+    assert guess == pytest.approx([40, 0.3])
+
+def test_power_law_guess():
+    x = np.linspace(1, 10, 20)
+    model = VPCModel("a * x**b", ["x"])
+    assert initial_guess(model, [list(x), list(2 * x**1.5)]) == pytest.approx([2, 1.5])
+
+def test_scan_guess():
+    t = np.linspace(0, 10, 50)
+    model = VPCModel("a * exp(-k * t) + b", ["t"])
+    guess = initial_guess(model, [list(t), list(40 * np.exp(-0.3 * t) + 5)])
+    # the scan resolves the nonlinear constant to within half an order of magnitude
+    assert 0.1 < guess[2] < 1
+    assert guess[0] == pytest.approx(40, rel=0.2)
+
+def test_ode_guess():
+    t = np.linspace(0, 10, 50)
+    x = 5 * np.exp(-0.8 * t)
+    y = 5 * 0.8 / (0.3 - 0.8) * (np.exp(-0.8 * t) - np.exp(-0.3 * t))
+    model = VPCModel("x' = -a*x, y' = a*x - b*y", ["t"])
+    assert initial_guess(model, [list(t), list(x), list(y)]) == pytest.approx([0.8, 0.3], rel=5e-2)
+
+def test_guess_falls_back_to_ones():
+    model = VPCModel("a * exp(-k * t)", ["t"])
+    assert initial_guess(model, [[0, 1, 2], [-1, -2, -3], [1, 2, 3]]) == [1.0, 1.0]
+
+def test_grid():
+    assert _grid(np.array([1.0, 2.0]), 2).tolist() == [[1, 1], [1, 2], [2, 1], [2, 2]]
+    assert _grid(np.array([1.0, 2.0]), 0).shape == (1, 0)
+
+def test_scan_guess_many_constants():
+    t = np.linspace(0, 5, 50)
+    rates = np.linspace(0.2, 3, 6)
+    # 6 nonlinear constants exceed MAX_SCAN_POINTS and are scanned one at a time
+    model = VPCModel(", ".join(f"exp(-k{name} * t)" for name in "abcdef"), ["t"])
+    guess = initial_guess(model, [list(t), *[list(np.exp(-k * t)) for k in rates]])
+    assert np.all(np.abs(np.log10(np.array(guess) / rates)) <= 0.25)
+
+def test_scan_guess_prefers_unaliased_frequency():
+    # sampled 11 times per period of 2*pi, frequencies 10 and 1 give the same data points
+    t = np.arange(40) * 2 * np.pi / 11
+    model = VPCModel("a * sin(w * t)", ["t"])
+    guess = initial_guess(model, [list(t), list(2 * np.sin(-10 * t))])
+    assert abs(guess[1]) == pytest.approx(1)
+    assert abs(guess[0]) == pytest.approx(2)
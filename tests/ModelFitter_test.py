@@ -1,7 +1,11 @@
+from concurrent.futures import ProcessPoolExecutor
 import pytest
 import numpy as np
-from src.ModelFitter import fit, _fit_ode, _fit_reg, check_model_is_valid_vector, evaluate_fit
-from src.VPCModel import VPCModel
+from src.ModelFitter import fit, fit_streaming, _fit_ode, _fit_reg, check_model_is_valid_vector, evaluate_fit
+from src.ModelFitter import FitOptions, _select_ode_solver, _SolutionCache, TOLERANCE_SCHEDULE, RK45_STABILITY_LIMIT
+from src.ModelFitter import _ODEProblem, _ShootingProblem
+from src.FileHandler import average_replicates
+from src.VPCModel import VPCModel, cache_info
 
 # Fixtures
 @pytest.fixture
@@ -26,6 +30,288 @@ def test_fit_ode(vpc_model_ode):
     assert hasattr(vpc_model_ode, 'fitted_consts')
     assert vpc_model_ode.fitted_consts is not None
 
+def test_fit_ode_least_squares(vpc_model_ode):
+    data = [
+        [0, 1, 2, 3, 4],  # t data
+        [1, 0.7, 0.5, 0.35, 0.25]  # y data
+    ]
+    fit(vpc_model_ode, data, FitOptions(ode_closed_form=False, ode_optimizer="least_squares"))
+    assert vpc_model_ode.fit_info["optimizer"] == "least_squares"
+    assert vpc_model_ode.covariance.shape == (1, 1)
+    eval_metrics = evaluate_fit(vpc_model_ode.covariance)
+    assert np.isfinite(eval_metrics["rmse"])
+
+def test_fit_ode_least_squares_needs_fewer_solves():
+    data = [
+        [0, 1, 2, 3, 4],  # t data
+        [1, 0.7, 0.5, 0.35, 0.25]  # y data
+    ]
+    model_lsq = VPCModel("y' = -k * y", ["y"])
+    model_min = VPCModel("y' = -k * y", ["y"])
+    options = {"ode_closed_form": False, "initial_guess": "ones"}
+    fit(model_lsq, data, FitOptions(ode_optimizer="least_squares", **options))
+    fit(model_min, data, FitOptions(ode_optimizer="minimize", **options))
+    assert model_lsq.fitted_consts["k"] == pytest.approx(model_min.fitted_consts["k"], rel=1e-3)
+    assert model_lsq.fit_info["ode_solves"] < model_min.fit_info["ode_solves"]
+
+@pytest.mark.parametrize("optimizer", ["least_squares", "minimize"])
+def test_fit_ode_sensitivities(optimizer):
+    t = np.linspace(0, 4, 9)
+    data = [list(t), list(2 * np.exp(-0.5 * t) + 0.3 * t)]
+    model_fd = VPCModel("y' = -k * y + a", ["y"])
+    model_sens = VPCModel("y' = -k * y + a", ["y"])
+    fit(model_fd, data, FitOptions(ode_closed_form=False, ode_optimizer=optimizer))
+    fit(model_sens, data, FitOptions(ode_closed_form=False, ode_optimizer=optimizer, ode_sensitivities=True))
+    for const in ["a", "k"]:
+        assert model_sens.fitted_consts[const] == pytest.approx(model_fd.fitted_consts[const], rel=1e-2)
+    assert model_sens.fit_info["ode_solves"] < model_fd.fit_info["ode_solves"]
+
+@pytest.mark.parametrize("sensitivities", [False, True])
+def test_fit_ode_implicit_solver(sensitivities):
+    t = np.linspace(0, 4, 9)
+    data = [list(t), list(np.exp(-0.5 * t))]
+    model_explicit = VPCModel("y' = -k * y", ["y"])
+    model_implicit = VPCModel("y' = -k * y", ["y"])
+    fit(model_explicit, data, FitOptions(ode_sensitivities=sensitivities))
+    fit(model_implicit, data, FitOptions(ode_sensitivities=sensitivities, ode_solver="Radau"))
+    assert model_implicit.fitted_consts["k"] == pytest.approx(model_explicit.fitted_consts["k"], rel=1e-2)
+
+@pytest.mark.parametrize("options, rel", [
+    ({}, 1e-3),
+    ({"ode_sensitivities": True}, 1e-3),
+    # the continuity defects are weighed against three times as many data residuals
+    ({"ode_shooting_segments": 2}, 1e-2),
+])
+def test_fit_ode_replicates(options, rel):
+    rng = np.random.default_rng(0)
+    t = np.repeat(np.linspace(0, 4, 9), 3)
+    y = 2 * np.exp(-0.5 * t) + 0.3 * t + rng.normal(0, 0.02, t.size)
+    order = rng.permutation(t.size)
+    data = [list(t[order]), list(y[order])]
+    model = VPCModel("y' = -k * y + a", ["y"])
+    model_mean = VPCModel("y' = -k * y + a", ["y"])
+    fit(model, data, FitOptions(ode_closed_form=False, **options))
+    fit(model_mean, average_replicates(data), FitOptions(ode_closed_form=False, **options))
+    # with balanced replicates the sum of squares only differs by a constant from that of the means
+    for const in ["a", "k"]:
+        assert model.fitted_consts[const] == pytest.approx(model_mean.fitted_consts[const], rel=rel)
+
+def test_select_ode_solver():
+    model = VPCModel("y' = -k * (y - cos(t))", ["t"])
+    t_data = list(np.linspace(0, 10, 11))
+    solver, probe_info = _select_ode_solver(model.ode_function, model.ode_jacobian, t_data, [1.0], (1.0,))
+    assert solver == "RK45"
+    assert not probe_info["stiff"]
+    solver, probe_info = _select_ode_solver(model.ode_function, model.ode_jacobian, t_data, [1.0], (1e4,))
+    assert solver == "BDF"
+    assert probe_info["stiff"]
+    solver, _ = _select_ode_solver(model.ode_function, None, t_data, [1.0], (1e4,))
+    assert solver == "LSODA"
+    # a long time span alone doesn't make a problem stiff
+    model = VPCModel("y'' = -k*y - c*y'", ["t"])
+    t_data = list(np.linspace(0, 200, 801))
+    solver, probe_info = _select_ode_solver(model.ode_function, model.ode_jacobian, t_data, [1.0, 0.0], (0.2, 4.0))
+    assert solver == "RK45"
+    assert probe_info["stability_ratio"] < RK45_STABILITY_LIMIT
+
+def test_fit_ode_records_solver(vpc_model_ode):
+    data = [
+        [0, 1, 2, 3, 4],  # t data
+        [1, 0.7, 0.5, 0.35, 0.25]  # y data
+    ]
+    fit(vpc_model_ode, data, FitOptions(ode_closed_form=False))
+    assert vpc_model_ode.fit_info["ode_solver"] == "RK45"
+    assert vpc_model_ode.fit_info["ode_solver_stats"]["nfev"] > 0
+    assert "stiffness_probe" in vpc_model_ode.fit_info
+
+@pytest.mark.parametrize("sensitivities", [False, True])
+def test_fit_ode_coupled_system(sensitivities):
+    t = np.linspace(0, 10, 21)
+    x = 5 * np.exp(-0.8 * t)
+    y = 5 * 0.8 / (0.3 - 0.8) * (np.exp(-0.8 * t) - np.exp(-0.3 * t))
+    model = VPCModel("x' = -a*x, y' = a*x - b*y", ["t"])
+    fit(model, [list(t), list(x), list(y)], FitOptions(ode_sensitivities=sensitivities))
+    assert model.fitted_consts["a"] == pytest.approx(0.8, rel=1e-2)
+    assert model.fitted_consts["b"] == pytest.approx(0.3, rel=1e-2)
+
+@pytest.mark.parametrize("sensitivities", [False, True])
+def test_fit_ode_second_order(sensitivities):
+    t = np.linspace(0, 10, 81)
+    # damped oscillator y'' = -4*y - 0.2*y' with y(0) = 1, y'(0) = -0.1
+    omega = np.sqrt(4 - 0.01)
+    y = np.exp(-0.1 * t) * np.cos(omega * t)
+    model = VPCModel("y'' = -k*y - c*y'", ["t"])
+    fit(model, [list(t), list(y)], FitOptions(ode_sensitivities=sensitivities))
+    assert model.fitted_consts["k"] == pytest.approx(4, rel=5e-2)
+    assert model.fitted_consts["c"] == pytest.approx(0.2, rel=5e-2)
+
+@pytest.mark.parametrize("options", [{}, {"ode_sensitivities": True}, {"workers": 2}])
+def test_fit_ode_second_order_noisy(options):
+    t = np.linspace(0, 10, 81)
+    # y'' = -4*y - 0.2*y' with y(0) = 1, y'(0) = -0.1
+    omega = np.sqrt(4 - 0.01)
+    y = np.exp(-0.1 * t) * np.cos(omega * t)
+    # noise for which the slope of the first data points is far off the initial first derivative
+    y += np.random.default_rng(3).normal(0, 0.05, t.size)
+    model = VPCModel("y'' = -k*y - c*y'", ["t"])
+    fit(model, [list(t), list(y)], FitOptions(**options))
+    assert model.fitted_consts["k"] == pytest.approx(4, rel=2e-2)
+    assert model.fitted_consts["c"] == pytest.approx(0.2, rel=0.2)
+    assert model.fit_info["initial_derivatives"]["y'"] == pytest.approx(-0.1, abs=0.15)
+    assert list(model.fitted_consts) == ["c", "k"]
+
+def test_fit_ode_missing_state_column():
+    model = VPCModel("x' = -a*x, y' = a*x - b*y", ["t"])
+    with pytest.raises(RuntimeError):
+        fit(model, [[0, 1, 2], [1, 0.5, 0.25]])
+
+def test_solution_cache():
+    cache = _SolutionCache(2)
+    key = cache.key((0.1 + 0.2, 1.0))
+    assert cache.key((0.3, 1.0)) == key
+    assert cache.key((0.3 * (1 + 1e-8), 1.0)) != key
+    assert cache.get(key) is None
+    cache.put(key, "a")
+    assert cache.get(key) == "a"
+    cache.put(cache.key((1.0,)), "b")
+    cache.put(cache.key((2.0,)), "c")
+    assert cache.get(key) is None
+    assert cache.info() == {"hits": 1, "misses": 2, "size": 2, "maxsize": 2}
+
+@pytest.mark.parametrize("options", [{"ode_sensitivities": True}, {"workers": 2}])
+def test_fit_ode_cache_info(options):
+    t = np.linspace(0, 4, 9)
+    data = [list(t), list(np.exp(-0.5 * t))]
+    model = VPCModel("y' = -k * y", ["y"])
+    fit(model, data, FitOptions(ode_closed_form=False, **options))
+    cache_info = model.fit_info["ode_cache"]
+    # the Jacobian is evaluated at the point the residuals were just evaluated at
+    assert cache_info["hits"] > 0
+    assert cache_info["hits"] == model.fit_info["njev"]
+    assert cache_info["size"] <= cache_info["maxsize"] == 1
+
+def test_fit_ode_no_cache_without_jacobian():
+    t = np.linspace(0, 4, 9)
+    data = [list(t), list(np.exp(-0.5 * t))]
+    model = VPCModel("y' = -k * y", ["y"])
+    fit(model, data, FitOptions(ode_closed_form=False))
+    # finite differences of the optimizer never revisit a point
+    assert "ode_cache" not in model.fit_info
+
+def test_fit_ode_parallel_probes():
+    t = np.linspace(0, 4, 9)
+    data = [list(t), list(2 * np.exp(-0.5 * t) + 0.3 * t)]
+    model_serial = VPCModel("y' = -k * y + a", ["y"])
+    model_parallel = VPCModel("y' = -k * y + a", ["y"])
+    fit(model_serial, data, FitOptions(ode_closed_form=False))
+    fit(model_parallel, data, FitOptions(ode_closed_form=False, workers=2))
+    assert model_parallel.fit_info["workers"] == 2
+    for const in ["a", "k"]:
+        assert model_parallel.fitted_consts[const] == pytest.approx(model_serial.fitted_consts[const], rel=1e-6)
+
+@pytest.mark.parametrize("optimizer", ["least_squares", "minimize"])
+def test_fit_ode_tolerance_schedule(optimizer):
+    t = np.linspace(0, 4, 9)
+    data = [list(t), list(2 * np.exp(-0.5 * t) + 0.3 * t)]
+    model_single = VPCModel("y' = -k * y + a", ["y"])
+    model_schedule = VPCModel("y' = -k * y + a", ["y"])
+    fit(model_single, data, FitOptions(ode_closed_form=False, ode_optimizer=optimizer, ode_tolerance_schedule=[TOLERANCE_SCHEDULE[-1]]))
+    fit(model_schedule, data, FitOptions(ode_closed_form=False, ode_optimizer=optimizer, ode_tolerance_schedule=TOLERANCE_SCHEDULE))
+    stages = model_schedule.fit_info["tolerance_stages"]
+    assert [(stage["rtol"], stage["atol"]) for stage in stages] == list(TOLERANCE_SCHEDULE)
+    assert sum(stage["ode_solves"] for stage in stages) == model_schedule.fit_info["ode_solves"]
+    for const in ["a", "k"]:
+        assert model_schedule.fitted_consts[const] == pytest.approx(model_single.fitted_consts[const], rel=1e-3)
+
+def test_fit_ode_multiple_shooting():
+    t = np.linspace(0, 10, 41)
+    data = [list(t), list(np.exp(-0.2 * t) * np.cos(1.5 * t))]
+    model = VPCModel("y'' = -k * y - c * y'", ["y"])
+    fit(model, data, FitOptions(ode_shooting_segments=4))
+    assert model.fitted_consts["k"] == pytest.approx(2.29, rel=2e-2)
+    assert model.fitted_consts["c"] == pytest.approx(0.4, rel=5e-2)
+    assert model.covariance.shape == (2, 2)
+    shooting = model.fit_info["shooting"]
+    assert shooting["segments"] == 4
+    assert shooting["max_defect"] < 1e-2
+    with pytest.raises(ValueError):
+        _fit_ode(model, data, FitOptions(ode_optimizer="minimize", ode_shooting_segments=4))
+
+@pytest.mark.parametrize("model_string, truth", [
+    ("y' = -k*y", lambda t: 2 * np.exp(-0.5 * t)),
+    ("y'' = -k*y - c*y'", lambda t: np.exp(-0.1 * t) * np.cos(np.sqrt(3.99) * t)),
+])
+def test_fit_ode_multiple_shooting_matches_single_shooting(model_string, truth):
+    t = np.linspace(0, 10, 81)
+    data = [list(t), list(truth(t) + np.random.default_rng(1).normal(0, 0.05, t.size))]
+    single = VPCModel(model_string, ["t"])
+    fit(single, data, FitOptions(ode_closed_form=False))
+    model = VPCModel(model_string, ["t"])
+    fit(model, data, FitOptions(ode_closed_form=False, ode_shooting_segments=8))
+    assert model.fit_info["success"]
+    assert model.fit_info["shooting"]["continuous"]
+    for const in model.constants:
+        assert model.fitted_consts[const] == pytest.approx(single.fitted_consts[const], rel=5e-3)
+
+def test_fit_ode_multiple_shooting_mixed_orders():
+    t = np.linspace(0, 6, 49)
+    # the second-order state follows a first-order one, y' is the third state of the system
+    data = [list(t), list(2 * np.exp(-0.5 * t)), list(np.cos(1.5 * t))]
+    model = VPCModel("x' = -a*x, y'' = -k*y", ["t"])
+    shooting = _ShootingProblem(_ODEProblem(model, data), 3)
+    nodes = shooting.initial_parameters([1.0, 1.0])[shooting.problem.num_params:].reshape(2, 3)
+    node_times = t[shooting.node_indices[1:]]
+    # the node velocity is estimated from y, not from x
+    np.testing.assert_allclose(nodes[:, 2], -1.5 * np.sin(1.5 * node_times), atol=5e-2)
+    fit(model, data, FitOptions(ode_shooting_segments=3))
+    assert model.fitted_consts["a"] == pytest.approx(0.5, rel=1e-2)
+    assert model.fitted_consts["k"] == pytest.approx(2.25, rel=1e-2)
+    assert model.fit_info["shooting"]["max_defect"] < 1e-2
+
+def test_fit_ode_closed_form():
+    t = np.linspace(0, 4, 9)
+    data = [list(t), list(2 * np.exp(-0.5 * t) + 0.3 * t)]
+    model_numeric = VPCModel("y' = -k * y + a", ["t"])
+    model_closed = VPCModel("y' = -k * y + a", ["t"])
+    fit(model_numeric, data, FitOptions(ode_closed_form=False))
+    fit(model_closed, data, FitOptions(ode_closed_form=True))
+    assert "closed_form" in model_closed.fit_info
+    assert "ode_solves" not in model_closed.fit_info
+    for const in ["a", "k"]:
+        assert model_closed.fitted_consts[const] == pytest.approx(model_numeric.fitted_consts[const], rel=1e-2)
+    assert model_closed.covariance.shape == (2, 2)
+
+def test_fit_ode_closed_form_logistic():
+    t = np.linspace(0, 6, 25)
+    data = [list(t), list(5 / (1 + 4 * np.exp(-1.2 * t)))]
+    model = VPCModel("y' = r*y*(1 - y/K)", ["t"])
+    fit(model, data, FitOptions(ode_closed_form=True))
+    assert "closed_form" in model.fit_info
+    assert model.fitted_consts["K"] == pytest.approx(5, rel=1e-4)
+    assert model.fitted_consts["r"] == pytest.approx(1.2, rel=1e-4)
+
+def test_fit_ode_closed_form_fallback():
+    t = np.linspace(0.5, 4, 9)
+    data = [list(t), list(2 * np.exp(-0.5 * t) + 0.3 * np.sin(t))]
+    model = VPCModel("y' = -k*y + a*sin(t)/t", ["t"])
+    fit(model, data, FitOptions(ode_closed_form=True))
+    assert "closed_form" not in model.fit_info
+    assert "ode_solves" in model.fit_info
+
+def test_fit_ode_closed_form_cached():
+    t = np.linspace(0, 4, 9)
+    first = VPCModel("y' = -k * y + a", ["t"])
+    fit(first, [list(t), list(2 * np.exp(-0.5 * t) + 0.3)], FitOptions(ode_closed_form=True))
+    misses = cache_info()["misses"]
+    second = VPCModel("y' = -k * y + a", ["t"])
+    fit(second, [list(t), list(1 + 0.2 * t)], FitOptions(ode_closed_form=True))
+    assert cache_info()["misses"] == misses
+    assert first.fit_info["closed_form"] != second.fit_info["closed_form"]
+
+def test_fit_ode_unknown_optimizer(vpc_model_ode):
+    with pytest.raises(ValueError):
+        _fit_ode(vpc_model_ode, [[0, 1], [1, 0.5]], FitOptions(ode_optimizer="foo"))
+
 def test_fit_reg(vpc_model_reg):
     data = [
         [0, 1, 2, 3, 4],  # x data
@@ -35,6 +321,202 @@ def test_fit_reg(vpc_model_reg):
     assert hasattr(vpc_model_reg, 'fitted_consts')
     assert vpc_model_reg.fitted_consts is not None
 
+@pytest.mark.parametrize("model_string, data", [
+    ("a * exp(-b * x) + c", [[0, 1, 2, 3, 4], [3.5, 2.0, 1.24, 0.87, 0.68]]),
+    ("a*t, b+t", [[0, 1, 2, 3], [0, 2, 4, 6], [1, 2, 3, 4]]),
+])
+def test_fit_reg_analytic_jacobian(model_string, data):
+    model_fd = VPCModel(model_string, ["x"] if "x" in model_string else ["t"])
+    model_jac = VPCModel(model_string, ["x"] if "x" in model_string else ["t"])
+    fit(model_fd, data, FitOptions(analytic_jacobian=False, linear_solve=False, variable_projection=False))
+    fit(model_jac, data, FitOptions(linear_solve=False, variable_projection=False))
+    assert model_jac.fit_info["analytic_jacobian"]
+    for const in model_jac.constants:
+        assert model_jac.fitted_consts[const] == pytest.approx(model_fd.fitted_consts[const], rel=1e-4)
+    assert model_jac.fit_info["nfev"] < model_fd.fit_info["nfev"]
+
+@pytest.mark.parametrize("model_string, data", [
+    ("a * exp(-x) + b * x + 2", [[0, 1, 2, 3, 4], [3.1, 3.3, 4.2, 6.0, 8.1]]),
+    ("a*t, b+t", [[0, 1, 2, 3], [0, 2.1, 3.9, 6], [1, 2.2, 3, 4.1]]),
+])
+def test_fit_reg_linear_solve(model_string, data):
+    model_iterative = VPCModel(model_string, ["x"] if "x" in model_string else ["t"])
+    model_linear = VPCModel(model_string, ["x"] if "x" in model_string else ["t"])
+    assert model_linear.is_linear_in_constants()
+    fit(model_iterative, data, FitOptions(linear_solve=False))
+    fit(model_linear, data)
+    assert model_linear.fit_info["optimizer"] == "lstsq"
+    for const in model_linear.constants:
+        assert model_linear.fitted_consts[const] == pytest.approx(model_iterative.fitted_consts[const], rel=1e-6)
+    assert np.allclose(model_linear.covariance, model_iterative.covariance, rtol=1e-4)
+
+def test_fit_reg_variable_projection():
+    t = np.linspace(0, 5, 21)
+    data = [list(t), list(5 * np.exp(-3 * t) + 1)]
+    model_joint = VPCModel("a * exp(-k * t) + b", ["t"])
+    model_vp = VPCModel("a * exp(-k * t) + b", ["t"])
+    fit(model_joint, data, FitOptions(variable_projection=False))
+    fit(model_vp, data)
+    assert model_vp.fit_info["optimizer"] == "variable_projection"
+    assert model_vp.fit_info["nonlinear_constants"] == ["k"]
+    for const, value in [("a", 5), ("b", 1), ("k", 3)]:
+        assert model_vp.fitted_consts[const] == pytest.approx(value, rel=1e-6)
+        assert model_vp.fitted_consts[const] == pytest.approx(model_joint.fitted_consts[const], rel=1e-4)
+    assert model_vp.covariance.shape == (3, 3)
+
+@pytest.mark.parametrize("guess", ["ones", "data", [30, 5, 1]])
+def test_fit_reg_initial_guess(guess):
+    t = np.linspace(0, 5, 21)
+    data = [list(t), list(40 * np.exp(-3 * t) + 5)]
+    model = VPCModel("a * exp(-k * t) + b", ["t"])
+    fit(model, data, FitOptions(initial_guess=guess, variable_projection=False))
+    assert model.fitted_consts["k"] == pytest.approx(3, rel=1e-6)
+    assert len(model.fit_info["initial_guess"]) == 3
+
+@pytest.mark.parametrize("model_string, options", [
+    ("a * exp(-k * t) + b", {"variable_projection": False}),
+    ("a * exp(-k * t) + b", {}),
+    ("y' = -k * y + b", {"ode_closed_form": False}),
+])
+def test_fit_scale_constants(model_string, options):
+    t = np.linspace(0, 86400, 25)
+    noise = np.random.default_rng(0).normal(0, 20, t.size)
+    data = [list(t), list(2e4 * np.exp(-3e-5 * t) + 50 + noise)]
+    model_raw = VPCModel(model_string, ["t"])
+    model_scaled = VPCModel(model_string, ["t"])
+    fit(model_raw, data, FitOptions(scale_constants=False, **options))
+    fit(model_scaled, data, FitOptions(**options))
+    for const in model_scaled.constants:
+        assert model_scaled.fitted_consts[const] == pytest.approx(model_raw.fitted_consts[const], rel=1e-3)
+    assert np.allclose(model_scaled.covariance, model_raw.covariance, rtol=1e-2, atol=0)
+
+def test_fit_scale_data():
+    t = np.linspace(0, 10, 21)
+    rng = np.random.default_rng(0)
+    x = 5e3 * np.exp(-0.8 * t) + rng.normal(0, 50, t.size)
+    y = 0.8 * t + rng.normal(0, 0.01, t.size)
+    model_raw = VPCModel("a * exp(-k * t), k * t", ["t"])
+    model_scaled = VPCModel("a * exp(-k * t), k * t", ["t"])
+    fit(model_raw, [list(t), list(x), list(y)])
+    fit(model_scaled, [list(t), list(x), list(y)], FitOptions(scale_data=True))
+    # without scaling the precise second component hardly contributes to the fit of k
+    raw_error = abs(model_raw.fitted_consts["k"] - 0.8)
+    scaled_error = abs(model_scaled.fitted_consts["k"] - 0.8)
+    assert scaled_error < raw_error
+
+@pytest.mark.parametrize("analytic", [True, False])
+def test_fit_reg_sparse_jacobian(analytic):
+    t = np.linspace(0, 4, 30)
+    rates = [0.5, 1.0, 1.5, 2.0]
+    model = VPCModel(", ".join(f"exp(-k{name} * t) + s * t" for name in "abcd"), ["t"])
+    rng = np.random.default_rng(0)
+    data = [list(t), *[list(np.exp(-k * t) + 0.1 * t + rng.normal(0, 0.01, t.size)) for k in rates]]
+    options = FitOptions(analytic_jacobian=analytic, variable_projection=False)
+    _fit_reg(model, data, options)
+    assert "jacobian_density" in model.fit_info
+    dense_model = VPCModel(model.model_string, ["t"])
+    _fit_reg(dense_model, data, FitOptions(analytic_jacobian=analytic, variable_projection=False, sparse_jacobian=False))
+    assert "jacobian_density" not in dense_model.fit_info
+    for name in model.constants:
+        assert model.fitted_consts[name] == pytest.approx(dense_model.fitted_consts[name], rel=1e-4)
+    assert np.allclose(model.covariance, dense_model.covariance, rtol=1e-3)
+
+def test_fit_reg_sparse_jacobian_scaled_constants():
+    t = np.linspace(0, 400, 30)
+    rates = [0.005, 0.01, 0.015, 0.02]
+    model = VPCModel(", ".join(f"s * exp(-k{name} * t)" for name in "abcd"), ["t"])
+    data = [list(t), *[list(2e4 * np.exp(-k * t)) for k in rates]]
+    _fit_reg(model, data, FitOptions(variable_projection=False))
+    assert "jacobian_density" in model.fit_info
+    assert model.fit_info["constant_scales"][-1] > 1e3
+    assert model.fitted_consts["s"] == pytest.approx(2e4, rel=1e-6)
+    for name, k in zip("abcd", rates):
+        assert model.fitted_consts[f"k{name}"] == pytest.approx(k, rel=1e-6)
+
+def test_fit_reg_sparse_jacobian_before_variable_projection():
+    t = np.linspace(0, 4, 30)
+    rates = np.linspace(0.2, 2.0, 20)
+    model = VPCModel(", ".join(f"a{i} * exp(-k{i} * t)" for i in range(rates.size)), ["t"])
+    data = [list(t), *[list((1 + i % 3) * np.exp(-k * t)) for i, k in enumerate(rates)]]
+    fit(model, data)
+    assert model.fit_info["optimizer"] == "least_squares"
+    assert "jacobian_density" in model.fit_info
+    for i, k in enumerate(rates):
+        assert model.fitted_consts[f"k{i}"] == pytest.approx(k, rel=1e-4)
+        assert model.fitted_consts[f"a{i}"] == pytest.approx(1 + i % 3, rel=1e-4)
+
+@pytest.mark.parametrize("polish_passes", [0, 5])
+def test_fit_streaming(polish_passes):
+    rng = np.random.default_rng(0)
+    t = rng.uniform(0, 5, 400)
+    y = 3 * np.exp(-0.7 * t) + 0.5 + rng.normal(0, 0.05, t.size)
+    chunks = [[list(t[i:i + 100]), list(y[i:i + 100])] for i in range(0, t.size, 100)]
+    model = VPCModel("a * exp(-k * t) + c", ["t"])
+    fit_streaming(model, lambda: chunks, polish_passes=polish_passes)
+    assert model.fit_info["chunks"] == 4
+    assert model.fit_info["rows"] == 400
+    full_model = VPCModel("a * exp(-k * t) + c", ["t"])
+    fit(full_model, [list(t), list(y)])
+    tolerance = 1e-2 if polish_passes == 0 else 1e-6
+    for name in model.constants:
+        assert model.fitted_consts[name] == pytest.approx(full_model.fitted_consts[name], rel=tolerance)
+    assert model.fit_info["cost"] == pytest.approx(full_model.fit_info["cost"], rel=tolerance)
+    assert np.allclose(model.covariance, full_model.covariance, rtol=1e-3 if polish_passes else 1e-1)
+
+def test_fit_streaming_invalid(vpc_model_ode, vpc_model_reg):
+    with pytest.raises(ValueError):
+        fit_streaming(vpc_model_ode, lambda: [[[0, 1], [1, 0.5]]])
+    with pytest.raises(ValueError):
+        fit_streaming(vpc_model_reg, lambda: [])
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_fit_multi_start(workers):
+    t = np.linspace(0, 6, 80)
+    data = [list(t), list(2 * np.sin(4.5 * t))]
+    single = VPCModel("a * sin(w * t)", ["t"])
+    fit(single, data, FitOptions(initial_guess="ones"))
+    # a single start from w = 1 ends in a local minimum
+    assert single.fitted_consts["w"] != pytest.approx(4.5, rel=1e-3)
+    model = VPCModel("a * sin(w * t)", ["t"])
+    fit(model, data, FitOptions(initial_guess="ones", multi_start=20, workers=workers))
+    assert model.fitted_consts["w"] == pytest.approx(4.5, rel=1e-6)
+    summary = model.fit_info["multi_start"]
+    assert summary["starts"] == 20
+    assert summary["runs"][0]["initial_guess"] == [1.0, 1.0]
+    assert model.fit_info["cost"] == min(run["cost"] for run in summary["runs"] if "cost" in run)
+
+def test_fit_multi_start_leibniz_ode():
+    t = np.linspace(0, 6, 49)
+    model = VPCModel("d^2y/dt^2 = -k*y", ["t"])
+    fit(model, [list(t), list(np.cos(1.5 * t))], FitOptions(multi_start=3, workers=2))
+    assert model.is_ode()
+    assert model.fitted_consts["k"] == pytest.approx(2.25, rel=1e-2)
+
+def test_fit_multi_start_invalid(vpc_model_reg):
+    with pytest.raises(ValueError):
+        fit(vpc_model_reg, [[0, 1, 2], [1, 2, 3]], FitOptions(multi_start=0))
+
+def _fit_in_worker(model, data):
+    fit(model, data)
+    return model
+
+def test_fit_in_worker_processes():
+    t = np.linspace(0, 4, 20)
+    models = [VPCModel("a * exp(-k * t)", ["t"]) for _ in range(3)]
+    datasets = [[list(t), list(a * np.exp(-0.5 * t))] for a in (1.0, 2.0, 3.0)]
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        fitted = list(pool.map(_fit_in_worker, models, datasets))
+    for model, a in zip(fitted, (1.0, 2.0, 3.0)):
+        assert model.fitted_consts["a"] == pytest.approx(a)
+        assert model.fitted_consts["k"] == pytest.approx(0.5)
+
+def test_fit_invalid_initial_guess(vpc_model_reg):
+    data = [[0, 1, 2], [1, 2, 3]]
+    with pytest.raises(ValueError):
+        fit(vpc_model_reg, data, FitOptions(initial_guess="foo", linear_solve=False))
+    with pytest.raises(ValueError):
+        fit(vpc_model_reg, data, FitOptions(initial_guess=[1.0], linear_solve=False))
+
 def test_check_model_is_valid_vector(vpc_model_reg, vpc_model_vec):
     invalid = check_model_is_valid_vector(vpc_model_reg, 2)
     valid = check_model_is_valid_vector(vpc_model_vec, 3)
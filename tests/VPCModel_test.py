@@ -1,5 +1,8 @@
+import inspect
+import pickle
 import pytest
-from src.VPCModel import VPCModel
+import numpy as np
+from src.VPCModel import VPCModel, ModelSpec, BACKENDS, available_backends, cache_info, clear_cache, set_cache_directory
 
 @pytest.fixture
 def valid_model():
@@ -49,9 +52,23 @@ def test_cut_off_rhs(valid_model):
 def test_extract_symbols(valid_model):
     assert valid_model.extract_symbols() == ['x']
 
+def test_symbols_from_parsed_expression():
+    model = VPCModel("k1 * exp(-k2 * t) + pi", ["t"])
+    assert model.symbols == ["t", "k1", "k2"]
+    assert model.constants == ["k1", "k2"]
+    assert VPCModel("b*x + a", ["x"]).extract_symbols() == ["b", "x", "a"]
+    # commas inside function calls don't separate components
+    assert VPCModel("Max(a*x, b)", ["x"]).components == 1
+
 def test_model_string_to_function(valid_model):
     assert callable(valid_model.model_function)
 
+def test_common_subexpressions():
+    model = VPCModel("a * exp(-k * t), b * exp(-k * t) + t", ["t"])
+    assert inspect.getsource(model.model_function).count("exp(") == 1
+    assert model.model_function(1.0, 2.0, 3.0, 0.5) == pytest.approx((2 * np.exp(-0.5), 3 * np.exp(-0.5) + 1))
+    assert inspect.getsource(model.constants_jacobian).count("exp(") == 1
+
 def test_is_ode():
     model_str_ode = "y'' + y = 0"
     independent_var = ["x"]
@@ -62,6 +79,169 @@ def test_is_ode():
     model_non_ode = VPCModel(model_str_non_ode, independent_var)
     assert model_non_ode.is_ode() == False
 
+def test_parse_ode_lhs():
+    model = VPCModel("dy/dt = -k * y", ["t"])
+    assert model.ode_state_vars == ["y"]
+    assert model.ode_time_var == "t"
+    assert model.constants == ["k"]
+
+    model_non_ode = VPCModel("y = x**2 + 3*x - 5", ["x"])
+    assert not model_non_ode.has_ode_system()
+
+def test_coupled_ode_system():
+    model = VPCModel("x' = -a*x, y' = a*x - b*y", ["t"])
+    assert model.cut_off_lhs() == "-a*x, a*x - b*y"
+    assert model.cut_off_rhs() == "x', y'"
+    assert model.ode_state_vars == ["x", "y"]
+    assert model.constants == ["a", "b"]
+    assert model.ode_function(0, [2.0, 1.0], 0.5, 0.25) == pytest.approx([-1.0, 0.75])
+
+def test_second_order_ode_system():
+    model = VPCModel("y'' = -k*y - c*y'", ["t"])
+    assert model.ode_state_vars == ["y"]
+    assert model.ode_orders == [2]
+    assert model.ode_system_vars == ["y", "y'"]
+    assert model.constants == ["c", "k"]
+    # (y, y') = (2, 1) with c = 0.5, k = 3
+    assert model.ode_function(0, [2.0, 1.0], 0.5, 3.0) == pytest.approx([1.0, -6.5])
+
+    model_leibniz = VPCModel("d^2y/dt^2 = -k*y", ["t"])
+    assert model_leibniz.ode_system_vars == ["y", "y'"]
+    assert model_leibniz.ode_time_var == "t"
+
+def test_sensitivity_function():
+    model = VPCModel("y' = -k * y", ["y"])
+    # augmented state (y, dy/dk) = (2, 0.1) with k = 0.5
+    res = model.sensitivity_function(0, [2.0, 0.1], 0.5)
+    assert res == pytest.approx([-1.0, -0.5 * 0.1 - 2.0])
+
+def test_ode_jacobian():
+    model = VPCModel("y' = -k * y**2", ["y"])
+    assert np.allclose(model.ode_jacobian(0, [3.0], 0.5), [[-3.0]])
+    # d/dz of the augmented system (y' = -k*y**2, s' = -2*k*y*s - y**2) at (y, s) = (3, 0.1)
+    assert np.allclose(model.sensitivity_jacobian(0, [3.0, 0.1], 0.5), [[-3.0, 0.0], [-0.1 - 6.0, -3.0]])
+
+def test_constants_jacobian():
+    model = VPCModel("a*exp(-b*x), c*x + a", ["x"])
+    jac = model.constants_jacobian(2.0, 3.0, 0.5, 4.0)
+    # rows per component, columns for a, b, c
+    assert np.allclose(jac, [[np.exp(-1.0), -6 * np.exp(-1.0), 0], [1, 0, 2.0]])
+
+def test_constants_dependency():
+    model = VPCModel("a*exp(-b*x), c*x + a", ["x"])
+    assert model.constants_dependency.tolist() == [[True, True, False], [True, False, True]]
+
+def test_is_linear_in_constants():
+    assert VPCModel("a * exp(-t) + b * t**2 + 1", ["t"]).is_linear_in_constants()
+    assert VPCModel("a*t, b+t", ["t"]).is_linear_in_constants()
+    assert not VPCModel("a * exp(-b * t)", ["t"]).is_linear_in_constants()
+    assert not VPCModel("a*t, a*b", ["t"]).is_linear_in_constants()
+
+def test_linear_constants():
+    model = VPCModel("a * exp(-k * t) + b", ["t"])
+    assert model.linear_constants == ["a", "b"]
+    assert model.nonlinear_constants == ["k"]
+    assert VPCModel("a*b*t", ["t"]).linear_constants == ["b"]
+
+def test_closed_form_string():
+    model = VPCModel("y' = -k * y", ["t"])
+    assert model.closed_form_string(0, 2.0) == "2.0*exp(-k*t)"
+    logistic = VPCModel("y' = r*y*(1 - y/K)", ["t"])
+    assert logistic.closed_form_string(0, 1.0) is not None
+    assert VPCModel("y' = sin(y)", ["t"]).closed_form_string(0, 1.0) is None
+    assert VPCModel("y'' = -k*y", ["t"]).closed_form_string(0, 1.0) is None
+
+def test_closed_form():
+    expression, initial_time, initial_value = VPCModel("y' = -k * y + a", ["t"]).closed_form
+    assert (initial_time, initial_value) == ("t0", "y0")
+    assert VPCModel(expression, ["t", "t0", "y0"]).constants == ["a", "k"]
+    assert VPCModel("y' = -t0 * y", ["t"]).closed_form[1] == "t00"
+    assert VPCModel("y' = -k*y + a*sin(t)/t", ["t"]).closed_form is None
+    assert VPCModel("y' = -k*y + a*exp(-t**2)", ["t"]).closed_form is None
+
+def test_compiled_model_cache():
+    clear_cache()
+    first = VPCModel("y = a * exp(-k * t)", ["t"])
+    second = VPCModel("a * exp(-k * t)", ["t"])
+    info = cache_info()
+    assert (info["misses"], info["hits"]) == (1, 1)
+    assert second.model_function is first.model_function
+    VPCModel("a * exp(-k * t)", ["k", "t"])
+    assert cache_info()["misses"] == 2
+
+def test_compiled_model_cache_key():
+    clear_cache()
+    first = VPCModel("a*t + b", ["t"])
+    second = VPCModel("b +  t * a", ["t"])
+    assert (cache_info()["misses"], cache_info()["hits"]) == (1, 1)
+    assert second.model_function is first.model_function
+    other = VPCModel("a*t + b", ["t"], "numexpr")
+    assert cache_info()["misses"] == 2
+    assert other._compiled is not first._compiled
+    assert first.backend == "numpy"
+
+def test_compiled_model_disk_cache(tmp_path):
+    model_str = "y'' = -k*y - c*Max(y', 0)"
+    set_cache_directory(tmp_path)
+    try:
+        clear_cache()
+        compiled = VPCModel(model_str, ["t"])
+        assert cache_info()["disk_writes"] == 1
+        clear_cache()
+        loaded = VPCModel(model_str, ["t"])
+        assert cache_info()["disk_hits"] == 1
+    finally:
+        set_cache_directory(None)
+    assert loaded.constants == compiled.constants
+    assert loaded.model_function(2.0, 1.0, 3.0, 0.5) == compiled.model_function(2.0, 1.0, 3.0, 0.5)
+    # the symbolic functions use the expression parsed for the lookup
+    assert loaded.ode_function(0, [2.0, 1.0], 1.0, 3.0) == pytest.approx([1.0, -7.0])
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends(backend):
+    model = VPCModel("a * exp(-k * t), b * exp(-k * t) + t", ["t"], backend)
+    assert model.backend == (backend if backend in available_backends() else "numpy")
+    t = np.linspace(0, 1, 5)
+    expected = VPCModel("a * exp(-k * t), b * exp(-k * t) + t", ["t"]).model_function(t, 2.0, 3.0, 0.5)
+    assert np.allclose(model.model_function(t, 2.0, 3.0, 0.5), expected)
+
+def test_backend_fallback():
+    # gamma is neither supported by numexpr nor numba
+    assert VPCModel("a * gamma(t)", ["t"], "numexpr").backend == "numpy"
+    assert VPCModel("a * gamma(t)", ["t"], "numba").backend == "numpy"
+    with pytest.raises(ValueError):
+        VPCModel("a * t", ["t"], "fortran")
+
+def test_select_backend():
+    model = VPCModel("a * exp(-k * t)", ["t"], "auto")
+    timings = model.select_backend(100)
+    assert "numpy" in timings
+    assert model.backend == min(timings, key=timings.get)
+
+def test_model_spec():
+    model = VPCModel("y = a * exp(-k * t)", ["t"])
+    assert model.spec == ModelSpec("y = a * exp(-k * t)", ("t",), "numpy")
+    spec = pickle.loads(pickle.dumps(model.spec))
+    assert spec.to_model().constants == model.constants
+
+def test_pickle_model():
+    model = VPCModel("a * exp(-k * t)", ["t"])
+    model.set_fit_information({"a": 2.0, "k": 0.5}, covariance=np.eye(2), fit_info={"cost": 0.1})
+    restored = pickle.loads(pickle.dumps(model))
+    assert restored.fitted_consts == model.fitted_consts
+    assert restored.resulting_function == model.resulting_function
+    assert np.array_equal(restored.covariance, model.covariance)
+    assert restored.fit_info == {"cost": 0.1}
+    assert restored.model_function(1.0, 2.0, 0.5) == pytest.approx(model.model_function(1.0, 2.0, 0.5))
+
+def test_pickle_leibniz_ode():
+    model = VPCModel("d^2y/dt^2 = -k*y", ["t"])
+    assert model.spec.model_string == "d^2y/dt^2 = -k*y"
+    restored = pickle.loads(pickle.dumps(model))
+    assert restored.is_ode()
+    assert restored.ode_orders == model.ode_orders
+    assert model.spec.to_model().is_ode()
+
 def test_is_vector():
     model_str_single_component = "y = x**2 + 3*x - 5"
     independent_var = ["x"]
@@ -91,6 +271,12 @@ def test_set_and_get_fitted_consts(valid_model, fitted_consts):
     valid_model._set_fitted_consts(fitted_consts)
     assert valid_model.fitted_consts == fitted_consts
 
+def test_set_fit_information_scales():
+    model = VPCModel("a * exp(-k * t)", ["t"])
+    model.set_fit_information({"a": 2.0, "k": 0.5}, covariance=np.eye(2), scales=[100.0, 0.01])
+    assert model.fitted_consts == pytest.approx({"a": 200.0, "k": 0.005})
+    assert np.allclose(model.covariance, np.diag([1e4, 1e-4]))
+
 def test_set_and_get_resulting_function(valid_model, fitted_function):
     valid_model._set_resulting_function(fitted_function)
     assert valid_model.resulting_function == fitted_function